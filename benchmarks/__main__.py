@@ -0,0 +1,82 @@
+import argparse
+import sys
+
+from benchmarks import harness
+
+# Banc d'essai: python -m benchmarks run [-o résultats.json] [--compare référence.json]
+#               python -m benchmarks compare référence.json résultats.json
+# Sans affichage (Qt hors écran, matplotlib Agg). compare (ou run --compare) termine avec
+# le code 1 si une mesure a ralenti au-delà du seuil.
+DEFAULT_OUTPUT = 'bench_results.json'
+DEFAULT_ORDERS = (200, 2000, 20000)
+DEFAULT_DEGREES = (3, 10)
+QUICK_ORDERS = (200, 2000)
+QUICK_DEGREES = (3,)
+
+
+# Liste « 200,2000 »; les degrés entiers restent entiers (clés de mesure identiques)
+def numbers(text, kind=int):
+    values = (kind(value) for value in text.split(','))
+    return tuple(int(value) if float(value).is_integer() else value for value in values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Banc d'essai du modèle et de la vue")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="exécute les mesures")
+    run_parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT, help=f"fichier de résultats (défaut: {DEFAULT_OUTPUT})")
+    run_parser.add_argument('--orders', type=numbers, help="ordres des graphes, séparés par des virgules")
+    run_parser.add_argument('--degrees', type=lambda text: numbers(text, float), help="degrés moyens, séparés par des virgules")
+    run_parser.add_argument('--quick', action='store_true', help="balayage réduit")
+    run_parser.add_argument('--no-view', action='store_true', help="modèle seulement (sans Qt ni matplotlib ni démarrage)")
+    run_parser.add_argument('--min-time', type=float, default=harness.MIN_TIME, help="durée cumulée par mesure (s)")
+    run_parser.add_argument('--compare', metavar='REFERENCE', help="compare ensuite à une exécution précédente")
+    run_parser.add_argument('--threshold', type=float, default=harness.REGRESSION_THRESHOLD, help="ralentissement signalé (0.2 = +20 %%)")
+
+    compare_parser = commands.add_parser('compare', help="compare deux fichiers de résultats")
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=harness.REGRESSION_THRESHOLD, help="ralentissement signalé (0.2 = +20 %%)")
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        return report(harness.load(args.base), harness.load(args.new), args.threshold)
+
+    harness.headless()
+    from benchmarks import cases
+
+    orders = args.orders or (QUICK_ORDERS if args.quick else DEFAULT_ORDERS)
+    degrees = args.degrees or (QUICK_DEGREES if args.quick else DEFAULT_DEGREES)
+    recorder = harness.Recorder(min_time=args.min_time)
+    if not args.no_view:
+        from benchmarks import startup
+        startup.startup_cases(recorder)
+    window = None if args.no_view else cases.create_window()
+    for order in orders:
+        for degree in degrees:
+            cases.model_cases(recorder, order, degree)
+            if window is not None:
+                cases.view_cases(recorder, window, order, degree)
+
+    config = {'orders': list(orders), 'degrees': list(degrees), 'view': window is not None,
+              'seed': cases.SEED, 'generator': cases.GENERATOR, 'min_time': args.min_time}
+    harness.save(args.output, recorder, config)
+    print(f"Résultats: {args.output}", file=sys.stderr)
+    if args.compare:
+        return report(harness.load(args.compare), harness.load(args.output), args.threshold)
+    return 0
+
+
+def report(base, new, threshold):
+    rows = harness.compare(base, new, threshold)
+    print(harness.format_comparison(rows))
+    slower = [row for row in rows if row[4] == 'lent']
+    if slower:
+        print(f"{len(slower)} mesure(s) ralentie(s) de plus de {threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
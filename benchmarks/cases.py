@@ -0,0 +1,176 @@
+import itertools
+import math
+
+import numpy as np
+
+from model import path_search, traversal
+from model.graphe_model import GrapheModel
+
+# Scénarios mesurés, pour chaque couple (ordre, degré moyen) du balayage, graines fixes:
+# - modèle (sans Qt): generate_graph, find_shortest_path par moteur (cache vidé: requête
+#   à froid), poids d'une arête du chemin suivi (arbre réparé), calcul des parcours
+# - vue (Qt hors écran, MainWindow + GraphCanvas + MainController comme main.py):
+#   _find_node_at_position, _find_edge_at_position, draw_graphe (graphe neuf, changement
+#   de style, vue zoomée), déplacement d'un noeud à la souris et lecture d'un parcours
+SEED = 12345
+GENERATOR = 'gnp'
+QUERIES = 200  # Clics simulés par mesure de sélection
+DRAG_FRAMES = 20
+TRAVERSAL_FRAMES = 30
+ZOOM = 0.2  # Largeur de la vue zoomée, relative à la vue initiale
+
+
+def proba(order, degree):
+    return min(degree / max(order - 1, 1), 1.0)
+
+
+def generate(model, order, degree):
+    model.generator = GENERATOR
+    model.default_graphe_order = order
+    model.proba = proba(order, degree)
+    model.generate_graph(SEED)
+
+
+def model_cases(recorder, order, degree):
+    params = {'order': order, 'degree': degree}
+    model = GrapheModel()
+    recorder.measure('generate_graph', params, lambda: generate(model, order, degree))
+
+    model.start_node, model.end_node = endpoints(model)
+    for engine in path_search.ENGINES:
+        model.path_engine = engine
+        recorder.measure('find_shortest_path', {**params, 'engine': engine}, model.find_shortest_path,
+                         setup=model.path_cache.clear)
+
+    # Chemin affiché: le poids d'une de ses arêtes alterne entre deux valeurs (hausse puis
+    # baisse), l'arbre du départ, construit par la recherche, est réparé à chaque fois
+    model.shortest_path = model.find_shortest_path(follow=True)
+    path = model.shortest_path
+    if len(path) > 1:
+        edge = (path[len(path) // 2], path[len(path) // 2 + 1])
+        weight = model.get_edge_weight(edge)
+        weights = itertools.cycle((weight + 5, weight))
+        model.set_edge_weight(edge, next(weights))
+        recorder.measure('edge_weight_repair', params, lambda: model.set_edge_weight(edge, next(weights)))
+    model.reset_path()
+
+    snapshot = model.snapshot()
+    for kind in traversal.TRAVERSALS:
+        recorder.measure('compute_traversal', {**params, 'kind': kind},
+                         lambda: model.compute_traversal(snapshot, kind, 0))
+
+
+# Racine de la plus grande composante et son sommet le plus éloigné (dernier visité par le
+# parcours en largeur): une requête qui traverse le graphe, pas deux composantes séparées
+def endpoints(model):
+    timeline = model.compute_traversal(model.snapshot(), 'bfs', 0)
+    roots = np.flatnonzero(timeline.parents == timeline.order)
+    sizes = np.diff(np.append(roots, len(timeline)))
+    largest = int(np.argmax(sizes))
+    return timeline.order[roots[largest]].item(), timeline.order[roots[largest] + sizes[largest] - 1].item()
+
+
+# Fenêtre complète comme dans main.py (hors écran); renvoie (app, fenêtre, canvas, modèle)
+def create_window(size=(1200, 900)):
+    from PyQt6.QtWidgets import QApplication
+    from controller.main_controller import MainController
+    from view.GrapheCanvas import GraphCanvas
+    from view.MainWindow import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+    canvas = GraphCanvas()
+    window = MainWindow(app)
+    window.add_canvas(canvas)
+    model = GrapheModel()
+    controller = MainController(window, model, canvas)
+    window.set_controller(controller)
+    canvas.set_controller(controller)
+    controller.post_init()
+    window.resize(*size)
+    window.show()
+    app.processEvents()
+    return app, window, canvas, model
+
+
+def view_cases(recorder, window, order, degree):
+    app, _, canvas, model = window
+    params = {'order': order, 'degree': degree}
+    canvas.reset_view()
+
+    # Premier rendu d'un graphe neuf: la scène est reconstruite
+    recorder.measure('draw_graphe', {**params, 'view': 'new_graph'}, canvas.draw_graphe,
+                     setup=lambda: generate(model, order, degree))
+    app.processEvents()
+
+    # Sélection: le premier appel reconstruit les index (marqués périmés au chargement)
+    points = np.random.default_rng(SEED).uniform(-1, 1, size=(QUERIES, 2))
+    canvas._find_node_at_position(points[0])
+    canvas._find_edge_at_position(points[0])
+    recorder.measure('_find_node_at_position', params,
+                     lambda: [canvas._find_node_at_position(point) for point in points], number=QUERIES)
+    recorder.measure('_find_edge_at_position', params,
+                     lambda: [canvas._find_edge_at_position(point) for point in points], number=QUERIES)
+
+    # Changement de style (sélection d'un autre noeud): mêmes artistes, couleurs refaites
+    selections = iter(range(10 ** 9))
+
+    def select():
+        model.selected_node = next(selections) % order
+    recorder.measure('draw_graphe', {**params, 'view': 'restyle'}, canvas.draw_graphe, setup=select)
+    canvas.zoom(ZOOM, (0.0, 0.0))
+    recorder.measure('draw_graphe', {**params, 'view': 'zoomed'}, canvas.draw_graphe, setup=select)
+    canvas.reset_view()
+    model.selected_node = None
+    canvas.draw_graphe()
+
+    node = endpoints(model)[0]
+    recorder.measure('drag', {**params, 'frames': DRAG_FRAMES}, lambda: drag(canvas, model, node))
+    app.processEvents()
+
+    timeline = model.compute_traversal(model.snapshot(), 'bfs', 0)
+
+    def rewind():
+        model.traversal = timeline
+        model.traversal_position = 0
+    recorder.measure('traversal_playback', {**params, 'frames': TRAVERSAL_FRAMES},
+                     lambda: play(canvas, model, len(timeline)), setup=rewind, number=TRAVERSAL_FRAMES)
+    model.reset_traversal()
+    app.processEvents()
+
+
+# Clic sur le noeud, DRAG_FRAMES déplacements (aller-retour: le noeud revient à sa place),
+# relâchement puis le rendu complet qui suit
+def drag(canvas, model, node):
+    from PyQt6.QtCore import QEvent, Qt
+    from PyQt6.QtGui import QMouseEvent
+
+    left = Qt.MouseButton.LeftButton
+    start = np.asarray(model.pos[node], dtype=float)
+
+    def event(kind, position, button, buttons):
+        point = widget_point(canvas, position)
+        return QMouseEvent(kind, point, canvas.mapToGlobal(point), button, buttons, Qt.KeyboardModifier.NoModifier)
+
+    canvas.mousePressEvent(event(QEvent.Type.MouseButtonPress, start, left, left))
+    for frame in range(1, DRAG_FRAMES + 1):
+        offset = 0.2 * math.sin(math.pi * frame / DRAG_FRAMES)
+        canvas.mouseMoveEvent(event(QEvent.Type.MouseMove, start + offset, Qt.MouseButton.NoButton, left))
+    canvas.mouseReleaseEvent(event(QEvent.Type.MouseButtonRelease, start, left, Qt.MouseButton.NoButton))
+    canvas.draw_graphe()
+
+
+# Position dans le widget (pixels logiques, origine en haut) d'un point en coordonnées de
+# données: inverse de GraphCanvas._convert_pos
+def widget_point(canvas, position):
+    from PyQt6.QtCore import QPointF
+
+    x, y = canvas.ax.transData.transform(position)
+    ratio = canvas.device_pixel_ratio
+    return QPointF(x / ratio, (canvas.figure.bbox.height - y) / ratio)
+
+
+# Une lecture de parcours en TRAVERSAL_FRAMES images, comme TraversalPlayer à vitesse fixe
+def play(canvas, model, length):
+    for frame in range(1, TRAVERSAL_FRAMES + 1):
+        model.traversal_position = length * frame // TRAVERSAL_FRAMES
+        canvas.draw_graphe()
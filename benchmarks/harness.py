@@ -0,0 +1,134 @@
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Outils du banc d'essai: chronométrage répété, environnement sans affichage, fichier de
+# résultats JSON et comparaison de deux exécutions.
+FORMAT_VERSION = 1
+MIN_TIME = 0.2  # Durée cumulée visée par mesure (s)
+MIN_REPEATS = 3
+MAX_REPEATS = 50
+REGRESSION_THRESHOLD = 0.2  # Ralentissement relatif (meilleur temps) signalé: +20 %
+NOISE_FLOOR = 50e-6  # Écarts absolus plus petits ignorés (s): bruit de mesure
+
+
+# Qt hors écran et matplotlib en Agg, avant tout import de PyQt6 ou de pyplot
+def headless():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+
+
+class Recorder:
+    def __init__(self, min_time=MIN_TIME, min_repeats=MIN_REPEATS, max_repeats=MAX_REPEATS, verbose=True):
+        self.min_time = min_time
+        self.min_repeats = min_repeats
+        self.max_repeats = max_repeats
+        self.verbose = verbose
+        self.results = []
+
+    # Chronomètre func() (setup() avant chaque répétition, hors mesure) jusqu'à min_time
+    # cumulé ou max_repeats; le ramasse-miettes est suspendu pendant la mesure (comme timeit).
+    # number: opérations par appel, les temps enregistrés sont par opération.
+    def measure(self, name, params, func, setup=None, number=1):
+        times = []
+        total = 0.0
+        enabled = gc.isenabled()
+        gc.collect()
+        gc.disable()
+        try:
+            while len(times) < self.min_repeats or (total < self.min_time and len(times) < self.max_repeats):
+                if setup is not None:
+                    setup()
+                start = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - start
+                total += elapsed
+                times.append(elapsed / number)
+        finally:
+            if enabled:
+                gc.enable()
+        return self.record(name, params, times)
+
+    # Mesures faites par l'appelant (un temps par répétition)
+    def record(self, name, params, times):
+        result = {'name': name, 'params': params, 'key': key(name, params), 'unit': 's', 'repeats': len(times),
+                  'min': min(times), 'median': statistics.median(times), 'mean': statistics.fmean(times),
+                  'stdev': statistics.stdev(times) if len(times) > 1 else 0.0}
+        self.results.append(result)
+        if self.verbose:
+            print(f"{result['key']:<70} {format_time(result['median']):>10}  (min {format_time(result['min'])}, "
+                  f"n={len(times)})", file=sys.stderr)
+        return result
+
+
+def key(name, params):
+    return f"{name}[{','.join(f'{k}={v}' for k, v in params.items())}]" if params else name
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if abs(seconds) >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def environment():
+    import numpy
+    info = {'python': platform.python_version(), 'numpy': numpy.__version__, 'platform': platform.platform(),
+            'machine': platform.machine(), 'processor': platform.processor(), 'cpus': os.cpu_count()}
+    for module in ('networkx', 'matplotlib', 'PyQt6.QtCore'):
+        if module in sys.modules:
+            version = getattr(sys.modules[module], '__version__', None) or getattr(sys.modules[module], 'PYQT_VERSION_STR', None)
+            info[module.split('.')[0]] = version
+    return info
+
+
+def save(path, recorder, config):
+    data = {'format': FORMAT_VERSION, 'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'environment': environment(), 'config': config, 'results': recorder.results}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+        f.write('\n')
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('format') != FORMAT_VERSION:
+        raise ValueError(f"{path}: format de résultats non pris en charge ({data.get('format')})")
+    return data
+
+
+# Meilleurs temps des mesures communes aux deux exécutions (le minimum est le moins sensible
+# aux interférences de la machine, comme pour timeit): (clé, avant, après, rapport, statut)
+# avec statut 'lent' au-delà du seuil (et d'un écart absolu au-dessus du bruit), 'rapide'
+# pour l'amélioration symétrique, '' sinon
+def compare(base, new, threshold=REGRESSION_THRESHOLD, floor=NOISE_FLOOR):
+    before = {result['key']: result['min'] for result in base['results']}
+    rows = []
+    for result in new['results']:
+        if result['key'] not in before:
+            continue
+        old, now = before[result['key']], result['min']
+        ratio = now / old if old > 0 else float('inf')
+        status = ''
+        if abs(now - old) >= floor:
+            if ratio > 1 + threshold:
+                status = 'lent'
+            elif ratio < 1 / (1 + threshold):
+                status = 'rapide'
+        rows.append((result['key'], old, now, ratio, status))
+    return rows
+
+
+def format_comparison(rows):
+    width = max((len(row[0]) for row in rows), default=10)
+    lines = [f"{'mesure':<{width}} {'avant':>10} {'après':>10} {'rapport':>8}"]
+    for name, old, now, ratio, status in rows:
+        flag = {'lent': '  << RALENTI', 'rapide': '  plus rapide'}.get(status, '')
+        lines.append(f"{name:<{width}} {format_time(old):>10} {format_time(now):>10} {ratio:>7.2f}x{flag}")
+    return '\n'.join(lines)
@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Démarrage à froid de l'interface, chaque lancement dans un nouvel interpréteur (comme
+# python main.py, hors écran): temps écoulé du lancement du processus jusqu'à la fenêtre
+# affichée (startup.window), puis jusqu'à l'interface utilisable, canvas, modèle et
+# contrôleur créés (startup.interactive). Le parent note l'heure avant de lancer l'enfant,
+# l'enfant la donne à chaque étape (horloge murale commune aux deux processus).
+RUNS = 5
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def startup_cases(recorder, runs=RUNS):
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', MPLBACKEND='Agg')
+    env.pop('GRAPHE_PROFILE', None)
+    samples = {'window': [], 'interactive': []}
+    for _ in range(runs):
+        start = time.time()
+        output = subprocess.run([sys.executable, '-m', 'benchmarks.startup'], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        stages = json.loads(output.splitlines()[-1])
+        for stage, times in samples.items():
+            times.append(stages[stage] - start)
+    for stage, times in samples.items():
+        recorder.record(f'startup.{stage}', {}, times)
+
+
+# Enfant: les étapes de main.main, sans la boucle d'événements
+def child():
+    from PyQt6.QtWidgets import QApplication
+    import main
+
+    app = QApplication(sys.argv[:1])
+    fenetre = main.create_window(app)
+    app.processEvents()
+    stages = {'window': time.time()}
+    main.build(fenetre)
+    app.processEvents()
+    stages['interactive'] = time.time()
+    print(json.dumps(stages))
+
+
+if __name__ == '__main__':
+    child()
@@ -0,0 +1,161 @@
+import json
+import sys
+import time
+
+import numpy as np
+
+from instrumentation import instruments
+from model import generators, path_search, traversal
+from model.edge_list import EdgeListError, read_edge_list
+from model.graph_file import GraphFileError
+from model.graphe_model import GrapheModel
+from model.layout import ForceLayout
+
+# Mode batch (python -m graphe batch ...): mêmes calculs que l'interface, sans Qt ni
+# matplotlib. Un graphe est chargé (.graphe), importé (liste d'arêtes) ou généré, puis les
+# travaux demandés sont exécutés dans l'ordre disposition, chemins, parcours. Les résultats
+# sont écrits en JSON (fichier .json, ou sortie standard) ou en binaire (.npz: un tableau par
+# chemin et par parcours, plus le résumé JSON sous la clé 'summary'); --save enregistre le
+# graphe (positions comprises) au format .graphe; --trace la trace de l'instrumentation.
+DEFAULT_LAYOUT_ITERATIONS = 50
+
+
+class BatchError(Exception):
+    pass
+
+
+def add_arguments(parser):
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--load', metavar='FICHIER', help="graphe enregistré (.graphe)")
+    source.add_argument('--import', dest='edge_list', metavar='FICHIER', help="liste d'arêtes « u v [poids] »")
+    source.add_argument('--generate', choices=generators.GENERATORS, help="générateur aléatoire")
+    parser.add_argument('--order', type=int, default=100, help="nombre de sommets généré (défaut: 100)")
+    parser.add_argument('--proba', type=float, default=0.05, help="probabilité d'arête (défaut: 0.05)")
+    parser.add_argument('--seed', type=int, help="graine (génération, positions d'un import)")
+    parser.add_argument('--backend', choices=GrapheModel.BACKENDS, default='compact', help="stockage (défaut: compact)")
+
+    parser.add_argument('--layout', type=int, nargs='?', const=DEFAULT_LAYOUT_ITERATIONS, metavar='ITERATIONS',
+                        help=f"disposition par forces (défaut: {DEFAULT_LAYOUT_ITERATIONS} itérations)")
+    parser.add_argument('--path', type=int, nargs=2, action='append', default=[], metavar=('DEPART', 'ARRIVEE'),
+                        help="plus court chemin (répétable)")
+    parser.add_argument('--engine', choices=path_search.ENGINES, default='dijkstra', help="moteur de chemin")
+    parser.add_argument('--traversal', nargs=2, action='append', default=[], metavar=('PARCOURS', 'DEPART'),
+                        help=f"parcours ({', '.join(traversal.TRAVERSALS)}) depuis un sommet (répétable)")
+
+    parser.add_argument('--output', '-o', default='-', metavar='FICHIER',
+                        help="résultats: .json, .npz, ou - pour la sortie standard (défaut)")
+    parser.add_argument('--save', metavar='FICHIER', help="enregistre le graphe final (.graphe)")
+    parser.add_argument('--trace', metavar='FICHIER', help="active l'instrumentation et enregistre la trace (.json)")
+
+
+def run(args):
+    if args.trace:
+        instruments.reset()
+        instruments.enable()
+    try:
+        model = GrapheModel(args.backend)
+        results = {'graph': load(model, args)}
+        if args.layout is not None:
+            results['layout'] = run_layout(model, args.layout)
+        results['paths'] = [run_path(model, source, target, args.engine) for source, target in args.path]
+        results['traversals'] = [run_traversal(model, kind, source) for kind, source in args.traversal]
+        if args.save:
+            model.save_graph(args.save)
+        write_results(results, args.output)
+        if args.trace:
+            instruments.dump(args.trace)
+    except (BatchError, GraphFileError, EdgeListError, OSError) as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+# Installe le graphe source dans le modèle; renvoie sa description
+def load(model, args):
+    start = time.perf_counter()
+    if args.load:
+        model.load_graph(args.load)
+        source = {'load': args.load}
+    elif args.edge_list:
+        graphe = read_edge_list(args.edge_list, args.seed)
+        model.set_graph(graphe, graphe.positions, args.seed)
+        source = {'import': args.edge_list}
+    else:
+        seed = args.seed if args.seed is not None else generators.new_seed()
+        model.generator = args.generate
+        model.proba = args.proba
+        model.default_graphe_order = args.order
+        model.generate_graph(seed)
+        source = {'generate': args.generate, 'order': args.order, 'proba': args.proba}
+    return {**source, 'seed': model.seed, 'backend': model.storage,
+            'nodes': model.graphe.number_of_nodes(), 'edges': model.graphe.number_of_edges(),
+            'seconds': time.perf_counter() - start}
+
+
+# Disposition complète en une fois (le LayoutWorker de l'interface publie les images
+# intermédiaires; ici seule la dernière compte)
+def run_layout(model, iterations):
+    start = time.perf_counter()
+    ids, xy, u, v = model.layout_arrays()
+    model.apply_positions(ids, ForceLayout(xy, u, v, iterations).run())
+    return {'iterations': iterations, 'seconds': time.perf_counter() - start}
+
+
+def run_path(model, source, target, engine):
+    model.path_engine = engine
+    start = time.perf_counter()
+    path = model.search_path(model.snapshot(), source, target)
+    seconds = time.perf_counter() - start
+    return {'source': source, 'target': target, 'engine': engine, 'path': [int(node) for node in path],
+            'distance': model.path_distance(source, target) if path else None,
+            'expanded': model.last_search_expanded, 'heuristic': model.last_search_heuristic,
+            'seconds': seconds}
+
+
+def run_traversal(model, kind, source):
+    if kind not in traversal.TRAVERSALS:
+        raise BatchError(f"parcours inconnu: {kind} (choix: {', '.join(traversal.TRAVERSALS)})")
+    try:
+        source = int(source)
+    except ValueError:
+        raise BatchError(f"sommet de départ invalide: {source}") from None
+    snapshot = model.snapshot()
+    if not snapshot.has_node(source):
+        raise BatchError(f"sommet inconnu: {source}")
+    start = time.perf_counter()
+    timeline = model.compute_traversal(snapshot, kind, source)
+    return {'kind': kind, 'source': source, 'order': timeline.order, 'parents': timeline.parents,
+            'levels': timeline.levels, 'seconds': time.perf_counter() - start}
+
+
+# JSON: tableaux convertis en listes. npz: tableaux gardés tels quels sous
+# 'paths/<i>' et 'traversals/<i>/<champ>', le reste dans le résumé JSON
+def write_results(results, output):
+    if output.endswith('.npz'):
+        arrays = {}
+        summary = dict(results, paths=[], traversals=[])
+        for i, result in enumerate(results['paths']):
+            arrays[f'paths/{i}'] = np.asarray(result['path'], dtype=np.int64)
+            summary['paths'].append({key: value for key, value in result.items() if key != 'path'})
+        for i, result in enumerate(results['traversals']):
+            for key in ('order', 'parents', 'levels'):
+                arrays[f'traversals/{i}/{key}'] = np.asarray(result[key])
+            summary['traversals'].append({key: value for key, value in result.items()
+                                          if key not in ('order', 'parents', 'levels')})
+        np.savez(output, summary=np.array(json.dumps(summary, default=_to_json)), **arrays)
+        return
+
+    text = json.dumps(results, default=_to_json)
+    if output == '-':
+        print(text)
+    else:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+
+def _to_json(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} non sérialisable")
@@ -1,7 +1,13 @@
+from model.generators import GENERATORS, INLINE_LAYOUT_MAX_ORDER, needs_layout, new_seed
+from model.graph_file import EXTENSION, GraphFileError
+from model.path_search import ENGINES
+from model.traversal import TRAVERSALS
 from model.graphe_model import GrapheModel
 from view.GrapheCanvas import GraphCanvas
 from view.MainWindow import MainWindow
-from workers import ShortestPathWorker, TraversalWorker
+from controller.traversal_player import TraversalPlayer
+from workers import LayoutWorker, TaskExecutor, generation_task, import_task, shortest_path_task, traversal_task
+from instrumentation import instruments
 
 #Je suis pas certain si mon implémentation des workers est bonne..
 
@@ -10,27 +16,53 @@ class MainController:
     __view: MainWindow
     __model: GrapheModel
     __canvas: GraphCanvas
-    __shortest_path_worker = None
-    __traversal_worker = None
+    __executor: TaskExecutor  # Pool partagé: génération, recherches de chemin, parcours et imports
+    __player: TraversalPlayer  # Lecture de la chronologie du parcours
+    __layout_worker = None
+    __stopped_workers = None  # Workers annulés gardés en vie jusqu'à la fin de leur run()
     __path_mode = False  # Mode sélection de départ/arrivée
 
     def __init__(self, view, model, canvas):
         self.__view = view
         self.__model = model
         self.__canvas = canvas
+        self.__stopped_workers = set()
+        self.__executor = TaskExecutor()
+        self.__player = TraversalPlayer(model, self.__view.traversalSpeedSpinBox.value())
 
         # Connexions existantes
         self.__view.createButton.clicked.connect(self.generate_graph)
         self.__view.deleteButton.clicked.connect(self.delete_graph)
+        self.__view.openAction.triggered.connect(lambda: self.open_graph())
+        self.__view.saveAction.triggered.connect(lambda: self.save_graph())
+        self.__view.importAction.triggered.connect(lambda: self.import_edge_list())
+        self.__view.cancelImportButton.clicked.connect(self.cancel_import)
+        self.__view.instrumentationAction.toggled.connect(self.set_instrumentation)
+        self.__view.traceAction.triggered.connect(lambda: self.save_trace())
+        self.__view.componentColorsAction.toggled.connect(self.show_components)
+        self.__view.isolateComponentAction.toggled.connect(self.__canvas.isolate_component)
         self.__view.weightSpinBox.valueChanged.connect(self.apply_edge_weight)
 
         # Nouvelles connexions
         self.__view.findPathButton.clicked.connect(self.toggle_path_mode)
         self.__view.resetPathButton.clicked.connect(self.reset_path)
 
+        # Lecture du parcours
+        self.__view.traversalPlayButton.clicked.connect(self.__player.toggle)
+        self.__view.traversalEndButton.clicked.connect(self.__player.jump_to_end)
+        self.__view.traversalSlider.valueChanged.connect(self.__player.seek)
+        self.__view.traversalSpeedSpinBox.valueChanged.connect(self.set_traversal_speed)
+        self.__player.positionChanged.connect(self.on_traversal_position)
+        self.__player.stateChanged.connect(self.on_traversal_state)
+        self.__player.finished.connect(self.on_traversal_finished)
+
     def post_init(self):
         self.__model.grapheChanged.connect(self.__canvas.on_graph_changed)
+        self.__model.pathFound.connect(self.on_path_updated)
         self.__model.grapheChanged.emit(self.__model.pos)
+        # Instrumentation activée au lancement (GRAPHE_PROFILE=1)
+        self.__view.instrumentationAction.setChecked(instruments.enabled)
+        self.__canvas.show_instrumentation(instruments.enabled)
 
     def graphe(self):
         return self.__model.graphe
@@ -44,13 +76,198 @@ class MainController:
         return self.__path_mode
 
     def generate_graph(self):
-        self.__model.generate_graph()
-        self.reset_path()
-        self.__model.reset_traversal()
+        # Une seule génération à la fois
+        if self.__executor.is_running('generate'):
+            return
+
+        # Une nouvelle génération annule la disposition en cours
+        self.stop_layout()
+
+        self.__view.createButton.setEnabled(False)
+        self.__view.generateProgressBar.setVisible(True)
+        self.__view.generateProgressBar.setRange(0, 100)
+        self.__view.generateProgressBar.setValue(0)
+
+        self.__model.default_graphe_order = self.__view.nbrNodes.value()
+        self.__model.generator = GENERATORS[self.__view.generatorComboBox.currentIndex()]
+        self.__model.proba = self.__view.densitySpinBox.value()
+
+        self.__executor.submit('generate', generation_task(self.__model, self.__model.default_graphe_order,
+                                                           self.__model.generator, self.__model.proba, new_seed()),
+                               on_result=self.on_graph_generated,
+                               on_progress=self.__view.generateProgressBar.setValue,
+                               on_error=self.on_generation_failed,
+                               on_finished=self.on_generation_finished)
+
+    def on_graph_generated(self, result):
+        graphe, seed = result
+        with self.__model.batch():
+            self.__model.set_graph(graphe, graphe.positions, seed)
+            self.reset_path()
+            self.reset_traversal()
+        self.__view.statusbar.showMessage(
+            f"Graphe généré: {graphe.number_of_nodes()} sommets, {graphe.number_of_edges()} arêtes (graine {seed})"
+        )
+        order = graphe.number_of_nodes()
+        if needs_layout(self.__model.generator, order) and order > INLINE_LAYOUT_MAX_ORDER:
+            self.start_layout()
+
+    def on_generation_failed(self, error):
+        self.__view.statusbar.showMessage(f"Erreur de génération: {error}")
+
+    def on_generation_finished(self):
+        if self.__layout_worker is None:
+            self.__view.generateProgressBar.setVisible(False)
+        self.__view.createButton.setEnabled(True)
 
     def delete_graph(self):
-        self.__model.delete_graph()
-        self.reset_path()
+        self.stop_layout()
+        with self.__model.batch():
+            self.reset_traversal()
+            self.__model.delete_graph()
+            self.reset_path()
+
+    # Ouvre un graphe enregistré (positions comprises: pas de disposition à recalculer)
+    def open_graph(self, path=None):
+        path = path or self.__view.ask_open_path()
+        if path is None:
+            return
+        self.stop_layout()
+        try:
+            with self.__model.batch():
+                self.__model.load_graph(path)
+                self.reset_path()
+                self.reset_traversal()
+        except (OSError, GraphFileError) as e:
+            self.__view.statusbar.showMessage(f"Erreur d'ouverture: {e}")
+            return
+        graphe = self.__model.graphe
+        self.__view.statusbar.showMessage(
+            f"Graphe ouvert: {graphe.number_of_nodes()} sommets, {graphe.number_of_edges()} arêtes"
+        )
+
+    def save_graph(self, path=None):
+        path = path or self.__view.ask_save_path(EXTENSION)
+        if path is None:
+            return
+        try:
+            self.__model.save_graph(path)
+        except OSError as e:
+            self.__view.statusbar.showMessage(f"Erreur d'enregistrement: {e}")
+            return
+        self.__view.statusbar.showMessage(f"Graphe enregistré: {path}")
+
+    # Couleurs par composante connexe (index des composantes du modèle)
+    def show_components(self, enabled):
+        self.__canvas.show_components(enabled)
+        if enabled:
+            self.__view.statusbar.showMessage(f"{self.__model.component_count()} composantes connexes")
+
+    # Instrumentation: mesures remises à zéro à l'activation, surimpression sur le canvas
+    def set_instrumentation(self, enabled):
+        if enabled and not instruments.enabled:
+            instruments.reset()
+        instruments.enable(enabled)
+        self.__canvas.show_instrumentation(enabled)
+
+    def save_trace(self, path=None):
+        path = path or self.__view.ask_trace_path()
+        if path is None:
+            return
+        try:
+            instruments.dump(path)
+        except OSError as e:
+            self.__view.statusbar.showMessage(f"Erreur d'enregistrement de la trace: {e}")
+            return
+        self.__view.statusbar.showMessage(f"Trace enregistrée: {path}")
+
+    # Import d'une liste d'arêtes dans le pool (progression, annulation); le graphe courant
+    # reste affiché et éditable jusqu'à la fin de la lecture
+    def import_edge_list(self, path=None):
+        path = path or self.__view.ask_import_path()
+        if path is None:
+            return
+        self.__view.generateProgressBar.setVisible(True)
+        self.__view.generateProgressBar.setRange(0, 100)
+        self.__view.generateProgressBar.setValue(0)
+        self.__view.cancelImportButton.setVisible(True)
+        self.__view.statusbar.showMessage(f"Import de {path}...")
+        self.__executor.submit('import', import_task(path, new_seed()),
+                               on_result=self.on_graph_imported,
+                               on_progress=self.__view.generateProgressBar.setValue,
+                               on_error=self.on_import_failed,
+                               on_finished=self.on_import_finished)
+
+    def cancel_import(self):
+        if not self.__executor.is_running('import'):
+            return
+        self.__executor.cancel('import')
+        self.on_import_finished()
+        self.__view.statusbar.showMessage("Import annulé")
+
+    def on_graph_imported(self, graphe):
+        self.stop_layout()
+        with self.__model.batch():
+            self.__model.set_graph(graphe, graphe.positions)
+            self.reset_path()
+            self.reset_traversal()
+        self.__view.statusbar.showMessage(
+            f"Graphe importé: {graphe.number_of_nodes()} sommets, {graphe.number_of_edges()} arêtes"
+        )
+        # Positions initiales aléatoires: disposition en arrière-plan pour un grand graphe
+        if graphe.number_of_nodes() > INLINE_LAYOUT_MAX_ORDER:
+            self.start_layout()
+
+    def on_import_failed(self, error):
+        self.__view.statusbar.showMessage(f"Erreur d'import: {error}")
+
+    def on_import_finished(self):
+        self.__view.cancelImportButton.setVisible(False)
+        if self.__layout_worker is None:
+            self.__view.generateProgressBar.setVisible(False)
+
+    # Disposition par forces en arrière-plan; les positions intermédiaires sont appliquées
+    # au modèle au fil du calcul
+    def start_layout(self):
+        self.stop_layout()
+        ids, xy, u, v = self.__model.layout_arrays()
+
+        self.__view.generateProgressBar.setVisible(True)
+        self.__view.generateProgressBar.setRange(0, 100)
+        self.__view.generateProgressBar.setValue(0)
+
+        worker = LayoutWorker(ids, xy, u, v)
+        worker.positionsReady.connect(lambda: self.on_layout_positions(worker))
+        worker.progressUpdated.connect(self.__view.generateProgressBar.setValue)
+        worker.finished.connect(lambda: self.on_layout_finished(worker))
+        self.__layout_worker = worker
+        worker.start()
+
+    def stop_layout(self):
+        worker = self.__layout_worker
+        if worker is None:
+            return
+        self.__layout_worker = None
+        worker.stop()
+        if worker.isRunning():
+            self.__stopped_workers.add(worker)
+        self.__view.generateProgressBar.setVisible(False)
+
+    def on_layout_positions(self, worker):
+        # Image d'une disposition annulée: ignorée
+        if worker is not self.__layout_worker:
+            return
+        ids, xy = worker.take_positions()
+        if xy is not None:
+            self.__model.apply_positions(ids, xy)
+
+    def on_layout_finished(self, worker):
+        # finished est émis depuis run(): attendre la fin du thread avant de le libérer
+        worker.wait()
+        self.__stopped_workers.discard(worker)
+        if worker is self.__layout_worker:
+            self.__layout_worker = None
+            self.__view.generateProgressBar.setVisible(False)
 
     def update_edge_ui(self, selected_edge=None):
         edge = selected_edge if selected_edge is not None else self.__canvas._selected_edge
@@ -81,7 +298,6 @@ class MainController:
 
         new_weight = self.__view.weightSpinBox.value()
         self.__model.set_edge_weight(self.__canvas._selected_edge, new_weight)
-        self.__canvas.draw_graphe()
 
     def toggle_path_mode(self):
         self.__path_mode = not self.__path_mode
@@ -90,17 +306,15 @@ class MainController:
             self.__view.findPathButton.setText("Annuler sélection")
             self.__view.pathStatusLabel.setText("Sélectionnez le sommet de départ")
             self.__view.pathStatusLabel.setStyleSheet("color: #FF9800; font-weight: bold;")
-            # Réinitialiser les sélections
-            self.__model.start_node = None
-            self.__model.end_node = None
-            self.__model.shortest_path = []
         else:
             self.__view.findPathButton.setText("Trouver chemin")
             self.__view.pathStatusLabel.setText("")
+
+        # Réinitialiser les sélections (un seul rafraîchissement)
+        with self.__model.batch():
             self.__model.start_node = None
             self.__model.end_node = None
             self.__model.shortest_path = []
-            self.__canvas.draw_graphe()
 
     def select_path_node(self, node):
         if not self.__path_mode:
@@ -111,7 +325,6 @@ class MainController:
             self.__model.start_node = node
             self.__view.pathStatusLabel.setText(f"Départ: {node} | Sélectionnez l'arrivée")
             self.__view.pathStatusLabel.setStyleSheet("color: #4CAF50; font-weight: bold;")
-            self.__canvas.draw_graphe()
         elif self.__model.end_node is None:
             # Sélection du nœud d'arrivée
             if node == self.__model.start_node:
@@ -131,86 +344,133 @@ class MainController:
         self.__view.pathProgressBar.setVisible(True)
         self.__view.pathProgressBar.setRange(0, 0)  # Mode indéterminé
 
-        # Créer et lancer le worker
-        self.__shortest_path_worker = ShortestPathWorker(self.__model)
-        self.__shortest_path_worker.pathFound.connect(self.on_path_found)
-        self.__shortest_path_worker.finished.connect(self.on_path_search_finished)
-        self.__shortest_path_worker.start()
+        self.__model.path_engine = ENGINES[self.__view.pathEngineComboBox.currentIndex()]
+
+        # Lancer la recherche dans le pool (annule une recherche précédente encore en cours)
+        self.__executor.submit('path', shortest_path_task(self.__model),
+                               on_result=self.on_path_found, on_finished=self.on_path_search_finished)
 
-    def on_path_found(self, path):
+    def on_path_found(self, result):
+        version, path = result
+        if version != self.__model.version:
+            # Graphe modifié pendant la recherche: résultat périmé, on relance sur l'état courant
+            self.start_shortest_path_search()
+            return
         self.__model.shortest_path = path
+        self.show_path_status(path, f"{self.__model.last_search_expanded} sommets développés")
 
+    # Chemin suivi réparé par le modèle après une modification (poids, arête, sommet)
+    def on_path_updated(self, path):
+        self.show_path_status(path, f"{self.__model.last_search_expanded} sommets mis à jour")
+
+    def show_path_status(self, path, detail):
         if len(path) > 0:
             distance = self.calculate_path_distance(path)
             self.__view.pathStatusLabel.setText(
-                f"Chemin trouvé: {' → '.join(map(str, path))} | Distance: {distance:.2f}"
+                f"Chemin trouvé: {' → '.join(map(str, path))} | Distance: {distance:.2f} | {detail}"
             )
             self.__view.pathStatusLabel.setStyleSheet("color: #4CAF50; font-weight: bold;")
         else:
             self.__view.pathStatusLabel.setText("Aucun chemin trouvé entre ces sommets")
             self.__view.pathStatusLabel.setStyleSheet("color: #F44336; font-weight: bold;")
 
-        self.__canvas.draw_graphe()
-
     def on_path_search_finished(self):
         self.__view.pathProgressBar.setVisible(False)
         self.__path_mode = False
         self.__view.findPathButton.setText("Trouver chemin")
 
+    # Distance lue dans l'arbre de plus courts chemins mis en cache par la recherche
     def calculate_path_distance(self, path):
-        total = 0
-        for i in range(len(path) - 1):
-            weight = self.__model.get_edge_weight((path[i], path[i + 1]))
-            if weight:
-                total += weight
-        return total
+        if len(path) < 2:
+            return 0
+        distance = self.__model.path_distance(path[0], path[-1])
+        return distance if distance is not None else 0
 
     def reset_path(self):
+        self.__executor.cancel('path')
         self.__model.reset_path()
         self.__path_mode = False
         self.__view.findPathButton.setText("Trouver chemin")
         self.__view.pathStatusLabel.setText("")
         self.__view.pathProgressBar.setVisible(False)
-        self.__canvas.draw_graphe()
 
+    # Calcule la chronologie du parcours en une passe dans le pool, puis la lit. Départ: le
+    # sommet sélectionné, sinon le sommet de départ du chemin, sinon le premier sommet.
     def start_traversal(self):
-        if self.__model.graphe.number_of_nodes() == 0:
+        graphe = self.__model.graphe
+        if graphe.number_of_nodes() == 0:
             return
 
-        # Réinitialiser le parcours précédent
-        self.__model.reset_traversal()
+        source = self.__model.selected_node
+        if source is None:
+            source = self.__model.start_node
+        if source is None or source not in graphe:
+            source = next(iter(graphe.nodes()))
+        kind = TRAVERSALS[self.__view.traversalComboBox.currentIndex()]
 
-        # Afficher la progress bar déterminée
+        self.reset_traversal()
         self.__view.traversalProgressBar.setVisible(True)
-        self.__view.traversalProgressBar.setRange(0, 100)
-        self.__view.traversalProgressBar.setValue(0)
-        self.__view.traversalStatusLabel.setText("Parcours en cours...")
+        self.__view.traversalProgressBar.setRange(0, 0)  # Mode indéterminé
+        self.__view.traversalStatusLabel.setText("Calcul du parcours...")
         self.__view.traversalStatusLabel.setStyleSheet("color: #2196F3; font-weight: bold;")
 
-        # Créer et lancer le worker
-        self.__traversal_worker = TraversalWorker(self.__model)
-        self.__traversal_worker.nodeVisited.connect(self.on_node_visited)
-        self.__traversal_worker.progressUpdated.connect(self.on_traversal_progress)
-        self.__traversal_worker.finished.connect(self.on_traversal_finished)
-        self.__traversal_worker.start()
+        # Lancer le calcul dans le pool (remplace un parcours précédent)
+        self.__executor.submit('traversal', traversal_task(self.__model, kind, source),
+                               on_result=self.on_traversal_computed,
+                               on_finished=lambda: self.__view.traversalProgressBar.setVisible(False))
+
+    def on_traversal_computed(self, result):
+        version, timeline = result
+        if version != self.__model.version:
+            # Graphe modifié pendant le calcul: on recalcule sur l'état courant
+            self.start_traversal()
+            return
 
-    def on_node_visited(self, node):
-        visited = self.__model.visited_nodes.copy()
-        visited.append(node)
-        self.__model.visited_nodes = visited
+        self.__model.traversal = timeline
+        slider = self.__view.traversalSlider
+        slider.blockSignals(True)
+        slider.setRange(0, len(timeline))
+        slider.setValue(0)
+        slider.blockSignals(False)
+        for widget in (slider, self.__view.traversalPlayButton, self.__view.traversalEndButton):
+            widget.setEnabled(True)
+        self.__player.play()
+
+    def set_traversal_speed(self, speed):
+        self.__player.speed = speed
+
+    def on_traversal_position(self, position):
+        slider = self.__view.traversalSlider
+        slider.blockSignals(True)
+        slider.setValue(position)
+        slider.blockSignals(False)
+
+        timeline = self.__model.traversal
+        if timeline is None:
+            return
+        text = f"{position} / {len(timeline)} sommets"
+        if position > 0:
+            level = timeline.levels[position - 1]
+            label = "distance" if timeline.kind == 'dijkstra' else "profondeur"
+            text += f" | dernier: {timeline.order[position - 1]} ({label} {level:g})"
+        self.__view.traversalStatusLabel.setText(text)
+        self.__view.traversalStatusLabel.setStyleSheet("color: #2196F3; font-weight: bold;")
 
-    def on_traversal_progress(self, progress):
-        self.__view.traversalProgressBar.setValue(progress)
+    def on_traversal_state(self, playing):
+        self.__view.traversalPlayButton.setText("Pause" if playing else "Lecture")
 
     def on_traversal_finished(self):
-        self.__view.traversalStatusLabel.setText("Parcours terminé!")
+        timeline = self.__model.traversal
+        if timeline is None:
+            return
+        self.__view.traversalStatusLabel.setText(f"Parcours terminé! {len(timeline)} sommets visités")
         self.__view.traversalStatusLabel.setStyleSheet("color: #4CAF50; font-weight: bold;")
 
-        # Cacher la progress bar après 2 secondes
-        from PyQt6.QtCore import QTimer
-        QTimer.singleShot(2000, self.hide_traversal_ui)
-
-    def hide_traversal_ui(self):
+    def reset_traversal(self):
+        self.__executor.cancel('traversal')
+        self.__player.stop()
+        self.__model.reset_traversal()
         self.__view.traversalProgressBar.setVisible(False)
         self.__view.traversalStatusLabel.setText("")
-        self.__model.reset_traversal()
\ No newline at end of file
+        for widget in (self.__view.traversalSlider, self.__view.traversalPlayButton, self.__view.traversalEndButton):
+            widget.setEnabled(False)
@@ -0,0 +1,89 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+# Lecture d'une chronologie de parcours: un timer à cadence d'image avance le curseur du
+# modèle de speed sommets par seconde. Tous les sommets d'une image sont appliqués en une
+# seule mise à jour (un seul grapheChanged par image, quelle que soit la vitesse).
+class TraversalPlayer(QObject):
+    positionChanged = pyqtSignal(int)
+    stateChanged = pyqtSignal(bool)  # True en lecture, False en pause
+    finished = pyqtSignal()
+
+    FRAME_INTERVAL = 33  # ms, environ 30 images par seconde
+
+    def __init__(self, model, speed=10.0):
+        super().__init__()
+        self.__model = model
+        self.__speed = speed
+        self.__cursor = 0.0  # Position fractionnaire: les vitesses lentes avancent d'un sommet toutes les n images
+        self.__last_tick = None
+        self.__timer = QTimer(self)
+        self.__timer.setInterval(self.FRAME_INTERVAL)
+        self.__timer.timeout.connect(self.__tick)
+
+    @property
+    def speed(self):
+        return self.__speed
+
+    @speed.setter
+    def speed(self, speed):
+        self.__speed = max(float(speed), 0.0)
+
+    @property
+    def playing(self):
+        return self.__timer.isActive()
+
+    @property
+    def length(self):
+        timeline = self.__model.traversal
+        return 0 if timeline is None else len(timeline)
+
+    def play(self):
+        if self.length == 0 or self.playing:
+            return
+        # Relancer depuis le début si la lecture précédente est allée au bout
+        if self.__model.traversal_position >= self.length:
+            self.seek(0)
+        self.__cursor = float(self.__model.traversal_position)
+        self.__last_tick = time.perf_counter()
+        self.__timer.start()
+        self.stateChanged.emit(True)
+
+    def pause(self):
+        if self.playing:
+            self.__timer.stop()
+            self.stateChanged.emit(False)
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def stop(self):
+        self.pause()
+        self.__cursor = 0.0
+
+    def seek(self, position):
+        self.__model.traversal_position = position
+        self.__cursor = float(self.__model.traversal_position)
+        self.positionChanged.emit(self.__model.traversal_position)
+
+    def jump_to_end(self):
+        self.pause()
+        self.seek(self.length)
+        self.finished.emit()
+
+    def __tick(self):
+        now = time.perf_counter()
+        self.__cursor += self.__speed * (now - self.__last_tick)
+        self.__last_tick = now
+        position = min(int(self.__cursor), self.length)
+        if position != self.__model.traversal_position:
+            self.__model.traversal_position = position
+            self.positionChanged.emit(position)
+        if position >= self.length:
+            self.pause()
+            self.finished.emit()
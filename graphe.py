@@ -0,0 +1,28 @@
+import argparse
+import sys
+
+# Point d'entrée: python -m graphe [gui|batch ...]. Les modules de l'interface (PyQt6,
+# matplotlib) ne sont importés que pour la sous-commande gui: batch tourne sans affichage.
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m graphe', description="Graphes: interface ou calculs en batch")
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('gui', help="interface graphique (défaut)")
+    batch_parser = commands.add_parser('batch', help="calculs sans interface (chemins, parcours, disposition)",
+                                       description="Charge, importe ou génère un graphe puis exécute les travaux "
+                                                   "demandés; résultats en JSON ou .npz.")
+    # Le module batch n'importe que le modèle
+    from controller import batch
+    batch.add_arguments(batch_parser)
+
+    args = parser.parse_args(argv)
+    if args.command == 'batch':
+        return batch.run(args)
+
+    import main as gui
+    return gui.main(sys.argv[:1])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
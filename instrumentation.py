@@ -0,0 +1,159 @@
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+# Instrumentation optionnelle: compteurs, chronomètres et trace des événements, pour voir où
+# passe le temps (modifications du modèle, émissions de grapheChanged, phases du rendu,
+# sélection au clic, tâches des workers) sans profileur. Désactivée par défaut; activée par
+# la variable d'environnement GRAPHE_PROFILE=1, le menu Affichage ou batch --trace.
+# Désactivée, un chronomètre ne coûte qu'un test (un objet partagé qui ne fait rien).
+# La trace s'enregistre au format Chrome Trace Event (chrome://tracing, ui.perfetto.dev).
+TRACE_CAPACITY = 200_000  # Événements gardés (les plus anciens sont oubliés)
+FPS_WINDOW = 1.0  # Fenêtre (s) du calcul des images par seconde
+
+
+class TimerStats:
+    __slots__ = ('count', 'total', 'last', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        self.max = max(self.max, duration)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class Instrumentation:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.__lock:
+            self.counters = collections.Counter()
+            self.timers = collections.defaultdict(TimerStats)
+            self.__events = collections.deque(maxlen=TRACE_CAPACITY)  # (nom, thread, début, durée)
+            self.__threads = {}  # identifiant -> nom du thread
+            self.__frames = collections.deque()  # Fins des dernières images (fenêtre FPS_WINDOW)
+            self.frame_count = 0
+            self.last_frame = 0.0
+            self.__origin = time.perf_counter()
+
+    def enable(self, enabled=True):
+        self.enabled = bool(enabled)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self.__lock:
+                self.counters[name] += n
+
+    # Chronomètre: with instruments.timer('draw.canvas'): ...
+    def timer(self, name):
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    # Chronomètre d'une image affichée (compte aussi pour les images par seconde)
+    def frame(self, name):
+        return _Timer(self, name, frame=True) if self.enabled else _NULL_TIMER
+
+    # Décorateur: chronomètre chaque appel (l'activation est lue à l'appel)
+    def timed(self, name):
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with _Timer(self, name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def record(self, name, start, duration, frame=False):
+        thread = threading.current_thread()
+        with self.__lock:
+            self.timers[name].add(duration)
+            self.__events.append((name, thread.ident, start, duration))
+            self.__threads.setdefault(thread.ident, thread.name)
+            if frame:
+                end = start + duration
+                self.frame_count += 1
+                self.last_frame = duration
+                self.__frames.append(end)
+                while self.__frames and self.__frames[0] < end - FPS_WINDOW:
+                    self.__frames.popleft()
+
+    # Images par seconde sur la dernière fenêtre (0 si rien n'a été affiché depuis)
+    def frame_rate(self):
+        with self.__lock:
+            if not self.__frames or time.perf_counter() - self.__frames[-1] > FPS_WINDOW:
+                return 0.0
+            return len(self.__frames) / FPS_WINDOW
+
+    def summary(self):
+        with self.__lock:
+            timers = {name: {'count': stats.count, 'total_ms': stats.total * 1e3, 'mean_ms': stats.mean * 1e3,
+                             'last_ms': stats.last * 1e3, 'max_ms': stats.max * 1e3}
+                      for name, stats in sorted(self.timers.items())}
+            counters = dict(sorted(self.counters.items()))
+            frames, last_frame = self.frame_count, self.last_frame
+        return {'frames': frames, 'fps': self.frame_rate(), 'last_frame_ms': last_frame * 1e3,
+                'counters': counters, 'timers': timers}
+
+    # Trace au format Chrome Trace Event: un événement complet (ph 'X') par mesure, temps en
+    # microsecondes depuis l'activation (ou le dernier reset), le résumé dans otherData
+    def dump(self, path):
+        summary = self.summary()
+        with self.__lock:
+            events, threads, origin = list(self.__events), dict(self.__threads), self.__origin
+        pid = os.getpid()
+        trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in threads.items()]
+        trace += [{'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+                   'ts': (start - origin) * 1e6, 'dur': duration * 1e6}
+                  for name, tid, start, duration in events]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms', 'otherData': summary}, f)
+
+
+class _Timer:
+    __slots__ = ('instruments', 'name', 'is_frame', 'start')
+
+    def __init__(self, instruments, name, frame=False):
+        self.instruments = instruments
+        self.name = name
+        self.is_frame = frame
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.instruments.record(self.name, self.start, time.perf_counter() - self.start, self.is_frame)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+instruments = Instrumentation(enabled=os.environ.get('GRAPHE_PROFILE', '') not in ('', '0'))
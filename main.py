@@ -1,22 +1,45 @@
 import sys
-from controller.main_controller import MainController
-from model.graphe_model import GrapheModel
-from view.GrapheCanvas import GraphCanvas
-from view.MainWindow import MainWindow
-from PyQt6.QtWidgets import QApplication
 import traceback
-import matplotlib
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+from view.MainWindow import MainWindow
 
 
 #LE CHANGEMENT DE THÈME EST COPIÉ DU TP2, j'ai adapté les thèmes avec ClaudeAI et pour l'implémentation aussi !!
 #Le UI a aussi été "modernisé" avec ClaudeAI, gros remerciment à mon beau gosse Claude pour vrai
-if __name__ == "__main__":
+# Interface graphique (python main.py, ou python -m graphe sans sous-commande)
+# Démarrage en deux temps: la fenêtre (Qt et formulaire précompilé seulement) est affichée
+# tout de suite, puis matplotlib, le canvas, le modèle et le contrôleur sont importés et créés
+# au premier tour de la boucle d'événements. networkx attend le premier graphe.
+def main(argv=None):
     def qt_exception_hook(exctype, value, tb):
         traceback.print_exception(exctype, value, tb)
 
     sys.excepthook = qt_exception_hook
 
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv if argv is None else argv)
+    fenetre = create_window(app)
+    QTimer.singleShot(0, lambda: build(fenetre))
+
+    return app.exec()
+
+
+# Fenêtre affichée, inactive jusqu'à la fin de build
+def create_window(app):
+    fenetre = MainWindow(app)  # Passer l'app pour le toggle theme
+    fenetre.centralWidget().setEnabled(False)
+    fenetre.statusbar.showMessage("Chargement...")
+    fenetre.show()
+    return fenetre
+
+
+def build(fenetre):
+    import matplotlib
+    from controller.main_controller import MainController
+    from model.graphe_model import GrapheModel
+    from view.GrapheCanvas import GraphCanvas
 
     # Configurer matplotlib pour le thème dark par défaut
     matplotlib.rcParams['figure.facecolor'] = '#2b2b2b'
@@ -33,13 +56,17 @@ if __name__ == "__main__":
 
     # Créer les composants
     canvas = GraphCanvas()
-    fenetre = MainWindow(app)  # Passer l'app pour le toggle theme
     fenetre.add_canvas(canvas)
     model = GrapheModel()
     controller = MainController(fenetre, model, canvas)
     fenetre.set_controller(controller)
     canvas.set_controller(controller)
     controller.post_init()
-    fenetre.show()
 
-    sys.exit(app.exec())
\ No newline at end of file
+    fenetre.centralWidget().setEnabled(True)
+    fenetre.statusbar.clearMessage()
+    return controller
+
+
+if __name__ == "__main__":
+    sys.exit(main())
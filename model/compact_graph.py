@@ -0,0 +1,553 @@
+import copy
+import os
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+
+
+# Fichier dont le tableau est une projection mémoire (None s'il est en mémoire)
+def _mapped_file(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return array.filename
+        array = getattr(array, 'base', None)
+    return None
+
+
+# Conversion d'un poids stocké en float64 vers le nombre Python affiché (5 et non 5.0)
+def _as_number(weight):
+    weight = float(weight)
+    return int(weight) if weight.is_integer() else weight
+
+
+# Attributs d'une arête, accessibles comme avec networkx: graphe[u][v]['weight']
+class EdgeData(Mapping):
+    __slots__ = ('_graph', '_u', '_v')
+
+    def __init__(self, graph, u, v):
+        self._graph = graph
+        self._u = u
+        self._v = v
+
+    def __getitem__(self, key):
+        if key != 'weight':
+            raise KeyError(key)
+        return self._graph.weight(self._u, self._v)
+
+    def __setitem__(self, key, value):
+        if key != 'weight':
+            raise KeyError(key)
+        self._graph.set_weight(self._u, self._v, value)
+
+    def __iter__(self):
+        return iter(('weight',))
+
+    def __len__(self):
+        return 1
+
+
+# Voisins d'un noeud: graphe[u] -> {v: EdgeData}
+class AdjacencyView(Mapping):
+    __slots__ = ('_graph', '_u')
+
+    def __init__(self, graph, u):
+        self._graph = graph
+        self._u = u
+
+    def __getitem__(self, v):
+        if not self._graph.has_edge(self._u, v):
+            raise KeyError(v)
+        return EdgeData(self._graph, self._u, v)
+
+    def __iter__(self):
+        return self._graph.neighbors(self._u)
+
+    def __len__(self):
+        return self._graph.degree(self._u)
+
+
+class NodeView:
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __iter__(self):
+        return self._graph.iter_nodes()
+
+    def __len__(self):
+        return self._graph.number_of_nodes()
+
+    def __contains__(self, node):
+        return node in self._graph
+
+
+class EdgeView:
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __iter__(self):
+        return self._graph.iter_edges()
+
+    def __len__(self):
+        return self._graph.number_of_edges()
+
+    def __contains__(self, edge):
+        return self._graph.has_edge(*edge)
+
+
+# Positions des noeuds d'un CompactGraph, vues comme un dictionnaire {noeud: [x, y]}
+class PositionMap(MutableMapping):
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, node):
+        return self._graph._xy[self._graph._index[node]]
+
+    def __setitem__(self, node, position):
+        self._graph.set_position(node, position)
+
+    # Positions et noeuds partagent le même stockage: retirer la position retire le noeud
+    def __delitem__(self, node):
+        self._graph.remove_node(node)
+
+    def __iter__(self):
+        return self._graph.iter_nodes()
+
+    def __len__(self):
+        return self._graph.number_of_nodes()
+
+    def __contains__(self, node):
+        return node in self._graph
+
+    # Tableau N×2 des positions, dans l'ordre de graphe.nodes()
+    def array(self):
+        return self._graph._xy[self._graph.alive_slots()]
+
+
+# Graphe non orienté pondéré stocké dans des tableaux contigus.
+# - positions: tableau N×2 de float, identifiant -> indice (case) par dictionnaire
+# - adjacence: CSR symétrique (indptr, indices triés par ligne) et poids parallèles
+# Les modifications après construction vont dans une petite table d'ajouts et des
+# masques de suppression; le CSR est recompacté quand ces ajouts deviennent trop gros.
+# Offre le sous-ensemble de l'API networkx utilisé par le modèle, le canvas et les workers.
+class CompactGraph:
+    __min_capacity = 16
+    __compact_ratio = 0.25
+    _shared = False  # Tableaux partagés avec un instantané: recopiés avant toute écriture
+
+    def __init__(self):
+        self._ids = np.empty(self.__min_capacity, dtype=np.int64)
+        self._xy = np.zeros((self.__min_capacity, 2))
+        self._node_alive = np.zeros(self.__min_capacity, dtype=bool)
+        self._slots = 0
+        self._index = {}
+
+        self._base_n = 0
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int32)
+        self._weights = np.empty(0)
+        self._edge_alive = np.empty(0, dtype=bool)
+
+        self._extra = {}
+        self._extra_edges = 0
+        self._dead_edges = 0
+        self._m = 0
+
+    # Construit le graphe à partir de tableaux: u, v sont des indices dans ids (0..n-1)
+    @classmethod
+    def from_arrays(cls, ids, xy, u, v, weights):
+        graph = cls()
+        ids = np.asarray(ids, dtype=np.int64)
+        n = len(ids)
+        graph.__reserve(n)
+        graph._ids[:n] = ids
+        graph._xy[:n] = np.asarray(xy, dtype=float).reshape(-1, 2)
+        graph._node_alive[:n] = True
+        graph._slots = n
+        graph._index = dict(zip(ids.tolist(), range(n)))
+
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        weights = np.broadcast_to(np.asarray(weights, dtype=float), u.shape)
+        graph.__build_csr(n, u, v, weights)
+        return graph
+
+    # Construit le graphe sur un CSR symétrique déjà trié (fichier projeté en mémoire): les
+    # tableaux sont repris tels quels, sans tri ni copie
+    @classmethod
+    def from_csr(cls, ids, xy, indptr, indices, weights):
+        graph = cls()
+        n = len(ids)
+        graph._ids, graph._xy = ids, xy
+        graph._node_alive = np.ones(n, dtype=bool)
+        graph._slots = n
+        graph._index = dict(zip(ids.tolist(), range(n)))
+        graph._indptr, graph._indices, graph._weights = indptr, indices, weights
+        graph._edge_alive = np.ones(len(indices), dtype=bool)
+        graph._base_n = n
+        graph._m = len(indices) // 2
+        return graph
+
+    @classmethod
+    def from_networkx(cls, graphe, pos):
+        ids = np.fromiter(graphe.nodes(), dtype=np.int64, count=graphe.number_of_nodes())
+        index = dict(zip(ids.tolist(), range(len(ids))))
+        xy = np.array([pos[n] for n in ids.tolist()], dtype=float).reshape(-1, 2)
+        m = graphe.number_of_edges()
+        u = np.empty(m, dtype=np.int64)
+        v = np.empty(m, dtype=np.int64)
+        w = np.empty(m)
+        for k, (a, b, weight) in enumerate(graphe.edges(data='weight', default=1)):
+            u[k], v[k], w[k] = index[a], index[b], weight
+        return cls.from_arrays(ids, xy, u, v, w)
+
+    def to_networkx(self):
+        import networkx as nx
+        graphe = nx.Graph()
+        graphe.add_nodes_from(self.iter_nodes())
+        for u, v in self.iter_edges():
+            graphe.add_edge(u, v, weight=self.weight(u, v))
+        return graphe, {node: self._xy[self._index[node]].copy() for node in graphe.nodes()}
+
+    # --- API de type networkx -------------------------------------------------------
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, node):
+        return node in self._index
+
+    def __iter__(self):
+        return self.iter_nodes()
+
+    def __getitem__(self, node):
+        if node not in self._index:
+            raise KeyError(node)
+        return AdjacencyView(self, node)
+
+    @property
+    def positions(self):
+        return PositionMap(self)
+
+    def nodes(self):
+        return NodeView(self)
+
+    def edges(self):
+        return EdgeView(self)
+
+    def number_of_nodes(self):
+        return len(self._index)
+
+    def number_of_edges(self):
+        return self._m
+
+    def has_node(self, node):
+        return node in self._index
+
+    def has_edge(self, u, v):
+        i = self._index.get(u)
+        j = self._index.get(v)
+        if i is None or j is None:
+            return False
+        return self.__find(i, j) >= 0 or j in self._extra.get(i, ())
+
+    def degree(self, node):
+        return len(self.neighbor_slots(self._index[node])[0])
+
+    def neighbors(self, node):
+        slots, _ = self.neighbor_slots(self._index[node])
+        return iter(self._ids[slots].tolist())
+
+    def iter_nodes(self):
+        return iter(self._ids[self.alive_slots()].tolist())
+
+    # Arêtes (u, v) avec u avant v dans l'ordre des noeuds, comme networkx
+    def iter_edges(self):
+        ids = self._ids
+        for i in self.alive_slots().tolist():
+            slots, _ = self.neighbor_slots(i)
+            u = int(ids[i])
+            for j in slots[slots > i].tolist():
+                yield u, int(ids[j])
+
+    def add_node(self, node):
+        if node in self._index:
+            return
+        self.__unshare()
+        self.__reserve(self._slots + 1)
+        i = self._slots
+        self._slots += 1
+        self._ids[i] = node
+        self._xy[i] = 0.0
+        self._node_alive[i] = True
+        self._index[node] = i
+
+    def remove_node(self, node):
+        self.__unshare()
+        i = self._index.pop(node)
+        slots, _ = self.neighbor_slots(i)
+        for j in slots.tolist():
+            self.__remove_slots(i, j)
+        self._extra.pop(i, None)
+        self._node_alive[i] = False
+
+        if self._slots - len(self._index) > max(self.__min_capacity, len(self._index)):
+            self.compact()
+
+    def add_edge(self, u, v, weight=1):
+        self.__unshare()
+        self.add_node(u)
+        self.add_node(v)
+        i, j = self._index[u], self._index[v]
+        k = self.__find(i, j)
+        if k >= 0:
+            self.__set_csr_weight(i, j, k, weight)
+            return
+        if j in self._extra.get(i, ()):
+            self._extra[i][j] = weight
+            self._extra[j][i] = weight
+            return
+
+        # Une arête supprimée du CSR est réactivée sur place
+        k = self.__find(i, j, alive_only=False)
+        if k >= 0:
+            self._edge_alive[k] = True
+            self._edge_alive[self.__find(j, i, alive_only=False)] = True
+            self._dead_edges -= 1
+            self.__set_csr_weight(i, j, k, weight)
+        else:
+            self._extra.setdefault(i, {})[j] = weight
+            self._extra.setdefault(j, {})[i] = weight
+            self._extra_edges += 1
+        self._m += 1
+
+        if self._extra_edges > max(1024, self.__compact_ratio * len(self._indices) / 2):
+            self.compact()
+
+    def remove_edge(self, u, v):
+        if not self.has_edge(u, v):
+            raise KeyError((u, v))
+        self.__unshare()
+        self.__remove_slots(self._index[u], self._index[v])
+
+    def weight(self, u, v):
+        i, j = self._index[u], self._index[v]
+        k = self.__find(i, j)
+        if k >= 0:
+            return _as_number(self._weights[k])
+        return self._extra[i][j]
+
+    def set_weight(self, u, v, weight):
+        self.__unshare()
+        i, j = self._index[u], self._index[v]
+        k = self.__find(i, j)
+        if k >= 0:
+            self.__set_csr_weight(i, j, k, weight)
+        elif j in self._extra.get(i, ()):
+            self._extra[i][j] = weight
+            self._extra[j][i] = weight
+        else:
+            raise KeyError((u, v))
+
+    # --- Accès par indices (algorithmes) ---------------------------------------------
+
+    def alive_slots(self):
+        return np.flatnonzero(self._node_alive[:self._slots])
+
+    def slot_of(self, node):
+        return self._index[node]
+
+    def node_at(self, slot):
+        return int(self._ids[slot])
+
+    # Voisins d'une case: (indices des voisins, poids) en tenant compte des ajouts
+    def neighbor_slots(self, i):
+        if i < self._base_n:
+            lo, hi = self._indptr[i], self._indptr[i + 1]
+            slots = self._indices[lo:hi]
+            weights = self._weights[lo:hi]
+            if self._dead_edges:
+                alive = self._edge_alive[lo:hi]
+                slots, weights = slots[alive], weights[alive]
+        else:
+            slots = np.empty(0, dtype=np.int32)
+            weights = np.empty(0)
+        extra = self._extra.get(i)
+        if extra:
+            slots = np.concatenate([slots, np.fromiter(extra.keys(), dtype=np.int32, count=len(extra))])
+            weights = np.concatenate([weights, np.fromiter(extra.values(), dtype=float, count=len(extra))])
+        return slots, weights
+
+    # Arêtes vivantes sous forme de tableaux (u < v en indices de cases) et leurs poids
+    def edge_arrays(self):
+        rows = np.repeat(np.arange(self._base_n, dtype=np.int64), np.diff(self._indptr))
+        keep = self._edge_alive & (rows < self._indices)
+        u, v, w = rows[keep], self._indices[keep].astype(np.int64), self._weights[keep]
+        if self._extra:
+            pairs = [(i, j, weight) for i, nbrs in self._extra.items() for j, weight in nbrs.items() if i < j]
+            if pairs:
+                extra = np.array(pairs, dtype=float)
+                u = np.concatenate([u, extra[:, 0].astype(np.int64)])
+                v = np.concatenate([v, extra[:, 1].astype(np.int64)])
+                w = np.concatenate([w, extra[:, 2]])
+        return u, v, w
+
+    # Arêtes vivantes en identifiants de noeuds (u, v) et positions de leurs extrémités
+    def edge_endpoints(self):
+        u, v, _ = self.edge_arrays()
+        return self._ids[u], self._ids[v], self._xy[u], self._xy[v]
+
+    # Noeuds vivants (identifiants, positions N×2) et arêtes en rangs 0..N-1 dans cet ordre
+    def layout_arrays(self):
+        alive = self.alive_slots()
+        rank = np.full(max(self._slots, 1), -1, dtype=np.int64)
+        rank[alive] = np.arange(len(alive))
+        u, v, _ = self.edge_arrays()
+        return self._ids[alive].copy(), self._xy[alive].copy(), rank[u], rank[v]
+
+    def set_position(self, node, position):
+        if node not in self._index:
+            self.add_node(node)
+        self.__unshare()
+        self._xy[self._index[node]] = position
+
+    # Remplace les positions des noeuds donnés (ignore ceux qui ont disparu entre-temps)
+    def set_positions(self, ids, xy):
+        self.__unshare()
+        alive = self.alive_slots()
+        if len(ids) == len(alive) and np.array_equal(self._ids[alive], ids):
+            self._xy[alive] = xy
+            return
+        slots = np.fromiter((self._index.get(node, -1) for node in ids.tolist()), dtype=np.int64, count=len(ids))
+        keep = slots >= 0
+        self._xy[slots[keep]] = np.asarray(xy)[keep]
+
+    # Tableaux (ids, xy, indptr, indices, weights) d'un CSR sans trous (cases libres, arêtes
+    # supprimées, table d'ajouts); recompacté sur une copie au besoin, le graphe est inchangé
+    def csr_arrays(self):
+        if self._extra or self._dead_edges or len(self._index) != self._slots or self._base_n != self._slots:
+            ids, xy, u, v = self.layout_arrays()
+            return CompactGraph.from_arrays(ids, xy, u, v, self.edge_arrays()[2]).csr_arrays()
+        n = self._slots
+        return self._ids[:n], self._xy[:n], self._indptr, self._indices, self._weights
+
+    # Recopie en mémoire les tableaux projetés depuis le fichier path (tous si None), par
+    # exemple avant de réécrire ce fichier
+    def detach(self, path=None):
+        for name in ('_ids', '_xy', '_indptr', '_indices', '_weights'):
+            array = getattr(self, name)
+            filename = _mapped_file(array)
+            if filename is not None and (path is None or (
+                    os.path.exists(path) and os.path.samefile(filename, path))):
+                setattr(self, name, np.array(array))
+
+    # Instantané figé en O(1): il partage les tableaux du graphe, et c'est le graphe qui les
+    # recopie (une fois) à sa prochaine modification. L'instantané ne doit pas être modifié.
+    def snapshot(self):
+        frozen = copy.copy(self)
+        frozen._shared = True
+        self._shared = True
+        return frozen
+
+    # Reconstruit le CSR sans les cases supprimées ni la table d'ajouts
+    def compact(self):
+        alive = self.alive_slots()
+        remap = np.full(max(self._slots, 1), -1, dtype=np.int64)
+        remap[alive] = np.arange(len(alive))
+        u, v, w = self.edge_arrays()
+
+        ids = self._ids[alive].copy()
+        xy = self._xy[alive].copy()
+        n = len(alive)
+        self._ids = np.empty(max(n, self.__min_capacity), dtype=np.int64)
+        self._xy = np.zeros((len(self._ids), 2))
+        self._node_alive = np.zeros(len(self._ids), dtype=bool)
+        self._ids[:n] = ids
+        self._xy[:n] = xy
+        self._node_alive[:n] = True
+        self._slots = n
+        self._index = dict(zip(ids.tolist(), range(n)))
+        self._extra = {}
+        self._extra_edges = 0
+        self.__build_csr(n, remap[u], remap[v], w)
+
+    # Voisins d'un noeud avec le poids de l'arête, en identifiants (algorithmes de chemins)
+    def weighted_neighbors(self, node):
+        slots, weights = self.neighbor_slots(self._index[node])
+        return zip(self._ids[slots].tolist(), weights.tolist())
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self._ids, self._xy, self._node_alive, self._indptr,
+                                      self._indices, self._weights, self._edge_alive))
+
+    # --- Interne ----------------------------------------------------------------------
+
+    # Copie à l'écriture: le CSR (indptr, indices) n'est jamais modifié sur place
+    def __unshare(self):
+        if not self._shared:
+            return
+        self._ids = self._ids.copy()
+        self._xy = self._xy.copy()
+        self._node_alive = self._node_alive.copy()
+        self._weights = self._weights.copy()
+        self._edge_alive = self._edge_alive.copy()
+        self._index = dict(self._index)
+        self._extra = {i: dict(neighbors) for i, neighbors in self._extra.items()}
+        self._shared = False
+
+    def __reserve(self, capacity):
+        if capacity <= len(self._ids):
+            return
+        capacity = max(capacity, 2 * len(self._ids))
+        grow = capacity - len(self._ids)
+        self._ids = np.concatenate([self._ids, np.empty(grow, dtype=np.int64)])
+        self._xy = np.concatenate([self._xy, np.zeros((grow, 2))])
+        self._node_alive = np.concatenate([self._node_alive, np.zeros(grow, dtype=bool)])
+
+    # Temporaires libérés au plus tôt: la construction reste proche de la taille du CSR final
+    def __build_csr(self, n, u, v, weights):
+        src = np.concatenate([u, v])
+        dst = np.concatenate([v, u]).astype(np.int32)
+        order = np.lexsort((dst, src))
+        self._indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self._indptr[1:])
+        del src
+        self._indices = dst[order]
+        del dst
+        self._weights = np.concatenate([weights, weights]).astype(float, copy=False)[order]
+        self._edge_alive = np.ones(len(self._indices), dtype=bool)
+        self._dead_edges = 0
+        self._base_n = n
+        self._m = len(u)
+
+    # Position k de l'arête (i, j) dans le CSR, -1 si absente
+    def __find(self, i, j, alive_only=True):
+        if i >= self._base_n or j >= self._base_n:
+            return -1
+        lo, hi = self._indptr[i], self._indptr[i + 1]
+        k = lo + int(np.searchsorted(self._indices[lo:hi], j))
+        if k < hi and self._indices[k] == j and (self._edge_alive[k] or not alive_only):
+            return k
+        return -1
+
+    def __set_csr_weight(self, i, j, k, weight):
+        self._weights[k] = weight
+        self._weights[self.__find(j, i)] = weight
+
+    def __remove_slots(self, i, j):
+        k = self.__find(i, j)
+        if k >= 0:
+            self._edge_alive[k] = False
+            self._edge_alive[self.__find(j, i)] = False
+            self._dead_edges += 1
+        else:
+            del self._extra[i][j]
+            del self._extra[j][i]
+            self._extra_edges -= 1
+        self._m -= 1
@@ -0,0 +1,114 @@
+import numpy as np
+
+
+# Composantes connexes du graphe, pour répondre « pas de chemin » sans recherche et colorer
+# la vue par composante. Calculées en bloc (tableaux) puis tenues à jour par union-find sur
+# les étiquettes de composantes: un ajout de sommet ou d'arête coûte O(α(n)). Une
+# suppression peut couper une composante: l'index est alors recalculé à la demande (le
+# modèle le signale par la version, voir GrapheModel.__update_components).
+class ConnectivityIndex:
+    version = None  # Version du graphe pour laquelle l'index est exact (tenue par le modèle)
+
+    def __init__(self):
+        self.rebuild(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+
+    # Sommets ids et arêtes en rangs (u, v) dans cet ordre. Étiquettes par accrochage des
+    # racines puis saut de pointeurs (chaque sommet désigne un sommet de rang inférieur ou
+    # lui-même), répétés tant qu'une arête relie deux racines différentes.
+    def rebuild(self, ids, u, v):
+        ids = np.asarray(ids, dtype=np.int64)
+        labels = np.arange(len(ids))
+        u, v = np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64)
+        while len(u):
+            lu, lv = labels[u], labels[v]
+            crossing = lu != lv
+            if not crossing.any():
+                break
+            lu, lv = lu[crossing], lv[crossing]
+            np.minimum.at(labels, np.maximum(lu, lv), np.minimum(lu, lv))
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+            u, v = u[crossing], v[crossing]
+
+        # Composantes numérotées 0..k-1 dans l'ordre de leur premier sommet
+        _, labels = np.unique(labels, return_inverse=True)
+        sizes = np.bincount(labels)
+        sorter = np.argsort(ids, kind='stable')
+        self.__ids = ids[sorter]
+        self.__labels = labels[sorter]
+        self.__added = {}  # Sommets ajoutés depuis le calcul -> étiquette
+        self.__parent = list(range(len(sizes)))  # Union-find sur les étiquettes
+        self.__size = sizes.tolist()
+        self.count = len(sizes)
+
+    def __contains__(self, node):
+        return self.__label(node) is not None
+
+    def add_node(self, node):
+        if node not in self:
+            self.__added[node] = len(self.__parent)
+            self.__parent.append(len(self.__parent))
+            self.__size.append(1)
+            self.count += 1
+
+    def add_edge(self, u, v):
+        self.add_node(u)
+        self.add_node(v)
+        a, b = self.__find(self.__label(u)), self.__find(self.__label(v))
+        if a == b:
+            return
+        if self.__size[a] < self.__size[b]:
+            a, b = b, a
+        self.__parent[b] = a
+        self.__size[a] += self.__size[b]
+        self.count -= 1
+
+    # Étiquette de la composante de node (None s'il est inconnu)
+    def component(self, node):
+        label = self.__label(node)
+        return None if label is None else self.__find(label)
+
+    def connected(self, u, v):
+        a = self.component(u)
+        return a is not None and a == self.component(v)
+
+    def size(self, node):
+        label = self.component(node)
+        return 0 if label is None else self.__size[label]
+
+    # Étiquettes des composantes d'un tableau de sommets (-1 pour un sommet inconnu), par
+    # recherche dichotomique dans les identifiants triés
+    def components(self, nodes):
+        nodes = np.asarray(nodes, dtype=np.int64).reshape(-1)
+        found = np.full(len(nodes), -1, dtype=np.int64)
+        if len(self.__ids):
+            at = np.minimum(np.searchsorted(self.__ids, nodes), len(self.__ids) - 1)
+            known = self.__ids[at] == nodes
+            found[known] = self.__labels[at[known]]
+        if self.__added:
+            for i in np.flatnonzero(found < 0).tolist():
+                found[i] = self.__added.get(int(nodes[i]), -1)
+        # Racines: une recherche par étiquette distincte, pas par sommet
+        labels, inverse = np.unique(found, return_inverse=True)
+        roots = np.array([self.__find(label) if label >= 0 else -1 for label in labels.tolist()], dtype=np.int64)
+        return roots[inverse.reshape(-1)]
+
+    def __label(self, node):
+        label = self.__added.get(node)
+        if label is not None:
+            return label
+        i = np.searchsorted(self.__ids, node)
+        if i < len(self.__ids) and self.__ids[i] == node:
+            return int(self.__labels[i])
+        return None
+
+    # Racine avec compression par moitié du chemin
+    def __find(self, label):
+        parent = self.__parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
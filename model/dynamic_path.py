@@ -0,0 +1,144 @@
+import heapq
+import itertools
+import math
+
+
+# Arbre complet de plus courts chemins depuis une source, réparé après chaque modification
+# du graphe au lieu d'être recalculé (Ramalingam–Reps, poids positifs ou nuls):
+# - poids diminué ou arête ajoutée: Dijkstra repart de l'extrémité améliorée et ne
+#   propage que les distances qui baissent
+# - poids augmenté, arête ou sommet supprimé: seul le sous-arbre sous l'arête (ou le
+#   sommet) de l'arbre est touché; ses sommets repartent des distances de leurs voisins
+#   hors du sous-arbre, puis Dijkstra restreint au sous-arbre
+# Le travail est proportionnel aux sommets dont la distance change (et à leurs arêtes).
+# neighbors(noeud) renvoie des couples (voisin, poids) du graphe déjà modifié; l'attribut
+# peut être remplacé (arbre construit sur un instantané, réparé ensuite sur le graphe courant).
+class DynamicShortestPathTree:
+    version = None  # Version du graphe pour laquelle l'arbre est exact (tenue par le modèle)
+
+    def __init__(self, source, neighbors):
+        self.source = source
+        self.dist = {source: 0}
+        self.pred = {source: None}
+        self.children = {}  # noeud -> ensemble de ses fils dans l'arbre
+        self.last_affected = 0  # Sommets revus par la dernière réparation
+        self.neighbors = neighbors
+        self.__counter = itertools.count()  # Départage sans comparer les noeuds
+        self.__propagate([(0, next(self.__counter), source)])
+        self.last_affected = len(self.dist)
+
+    def distance(self, target):
+        return self.dist.get(target)
+
+    # Chemin source -> target, [] si target est inaccessible
+    def path(self, target):
+        if target not in self.dist:
+            return []
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = self.pred[node]
+        return path[::-1]
+
+    # Arête (u, v) modifiée: old / new valent None pour une arête absente avant / après
+    def update_edge(self, u, v, old, new):
+        if new is not None and (old is None or new < old):
+            self.decrease(u, v, new)
+        elif new != old:
+            self.increase(u, v)
+        else:
+            self.last_affected = 0
+
+    # Poids de (u, v) diminué à weight, ou arête ajoutée
+    def decrease(self, u, v, weight):
+        du, dv = self.dist.get(u, math.inf), self.dist.get(v, math.inf)
+        if du + weight < dv:
+            node, parent, d = v, u, du + weight
+        elif dv + weight < du:
+            node, parent, d = u, v, dv + weight
+        else:
+            self.last_affected = 0
+            return
+        self.__attach(node, parent, d)
+        self.last_affected = self.__propagate([(d, next(self.__counter), node)])
+
+    # Poids de (u, v) augmenté, ou arête supprimée: rien à faire hors de l'arbre
+    def increase(self, u, v):
+        if self.pred.get(v) == u:
+            self.__repair(v)
+        elif self.pred.get(u) == v:
+            self.__repair(u)
+        else:
+            self.last_affected = 0
+
+    # Sommet supprimé du graphe (avec ses arêtes)
+    def remove_node(self, node):
+        if node not in self.dist:
+            self.last_affected = 0
+            return
+        if node == self.source:
+            raise ValueError("La source de l'arbre ne peut pas être supprimée")
+        self.__repair(node, removed=True)
+
+    # --- Interne ----------------------------------------------------------------------
+
+    def __attach(self, node, parent, d):
+        old_parent = self.pred.get(node)
+        if old_parent is not None:
+            self.children[old_parent].discard(node)
+        self.dist[node] = d
+        self.pred[node] = parent
+        self.children.setdefault(parent, set()).add(node)
+
+    def __detach(self, node):
+        parent = self.pred.pop(node)
+        del self.dist[node]
+        if parent is not None and parent in self.children:
+            self.children[parent].discard(node)
+
+    # Dijkstra depuis les entrées du tas, en ne gardant que les distances qui baissent;
+    # allowed borne les sommets qui peuvent changer. Renvoie le nombre de sommets fixés.
+    def __propagate(self, heap, allowed=None):
+        heapq.heapify(heap)
+        dist, counter = self.dist, self.__counter
+        settled = 0
+        while heap:
+            d, _, node = heapq.heappop(heap)
+            if d > dist.get(node, math.inf):
+                continue  # Entrée périmée
+            settled += 1
+            for neighbor, weight in self.neighbors(node):
+                nd = d + weight
+                if nd < dist.get(neighbor, math.inf) and (allowed is None or neighbor in allowed):
+                    self.__attach(neighbor, node, nd)
+                    heapq.heappush(heap, (nd, next(counter), neighbor))
+        return settled
+
+    # Sous-arbre de root à recalculer (root compris, sauf s'il a disparu du graphe)
+    def __repair(self, root, removed=False):
+        affected = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            affected.append(node)
+            stack.extend(self.children.pop(node, ()))
+        for node in affected:
+            self.__detach(node)
+        if removed:
+            affected.remove(root)
+        allowed = set(affected)
+
+        # Meilleur raccord de chaque sommet touché au reste de l'arbre (distances inchangées)
+        heap = []
+        for node in affected:
+            best, parent = math.inf, None
+            for neighbor, weight in self.neighbors(node):
+                d = self.dist.get(neighbor, math.inf) + weight
+                if d < best and neighbor not in allowed:
+                    best, parent = d, neighbor
+            if parent is not None:
+                self.__attach(node, parent, best)
+                heap.append((best, next(self.__counter), node))
+        self.__propagate(heap, allowed)
+        self.last_affected = len(affected)
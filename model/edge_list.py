@@ -0,0 +1,167 @@
+import io
+import os
+
+import numpy as np
+
+from model.compact_graph import CompactGraph
+from model.generators import INLINE_LAYOUT_MAX_ORDER
+from model.layout import ForceLayout
+
+# Import de listes d'arêtes externes: une arête par ligne, « u v [poids] » séparés par des
+# espaces, tabulations, virgules ou points-virgules (colonnes suivantes ignorées). Lignes
+# vides et commentaires (# ou %) ignorés, ligne d'en-tête (CSV) sautée.
+# Le fichier est lu par blocs de CHUNK_BYTES coupés en fin de ligne; chaque bloc est
+# analysé d'un coup par l'analyseur C de np.loadtxt directement dans des tableaux typés,
+# sans objet Python par ligne (un seul marqueur de commentaire par bloc: avec plusieurs,
+# np.loadtxt repasse par un prétraitement Python ligne à ligne). Les tableaux d'arêtes sont
+# dimensionnés d'après la taille du fichier et agrandis au besoin, ce qui évite une liste
+# de blocs à concaténer.
+CHUNK_BYTES = 8 * 2 ** 20
+COMMENTS = ('#', '%')
+DEFAULT_WEIGHT = 1
+
+_DELIMITERS = (',', '\t', ';')
+
+
+class EdgeListError(ValueError):
+    pass
+
+
+# Construit un CompactGraph à partir du fichier. progress(pourcentage) suit la lecture;
+# checkpoint() est appelé entre les blocs (annulation). Identifiants de noeuds entiers
+# quelconques; boucles retirées et, pour une arête répétée, le dernier poids retenu.
+def read_edge_list(path, seed=None, progress=None, checkpoint=None):
+    # Tampons de lecture passés sans rester référencés ici: _build peut les libérer au fil du calcul
+    return _build(*_read(path, progress, checkpoint), seed, progress)
+
+
+# Tableaux u, v (identifiants) et poids (None sans colonne de poids) lus par blocs
+def _read(path, progress, checkpoint):
+    size = max(os.path.getsize(path), 1)
+    with open(path, 'rb') as f:
+        delimiter, columns, start, line = _sniff(f, path)
+        f.seek(start)
+        dtype = [('u', '<i8'), ('v', '<i8')] + ([('w', '<f8')] if columns > 2 else [])
+        usecols = tuple(range(len(dtype)))
+
+        u = np.empty(0, dtype=np.int64)
+        v = np.empty(0, dtype=np.int64)
+        weights = np.empty(0) if columns > 2 else None
+        count = 0
+        remainder = b''
+        while True:
+            if checkpoint is not None:
+                checkpoint()
+            block = f.read(CHUNK_BYTES)
+            data = remainder + block
+            if block:
+                cut = data.rfind(b'\n') + 1
+                data, remainder = data[:cut], data[cut:]
+            if data:
+                markers = [marker for marker in COMMENTS if marker.encode() in data]
+                try:
+                    parsed = np.loadtxt(io.StringIO(data.decode('utf-8')), dtype=dtype, delimiter=delimiter,
+                                        comments=markers[0] if len(markers) == 1 else markers or None,
+                                        usecols=usecols, ndmin=1)
+                except (ValueError, UnicodeDecodeError) as e:
+                    raise EdgeListError(f"{path}: bloc commençant à la ligne {line}: {e}") from e
+                end = count + len(parsed)
+                if end > len(u):
+                    # Capacité estimée d'après les octets par arête déjà lus
+                    estimate = int(len(parsed) * size / max(f.tell() - start, 1) * 1.05) + 1
+                    capacity = max(end, estimate, 2 * len(u))
+                    u, v = _grow(u, capacity, count), _grow(v, capacity, count)
+                    if weights is not None:
+                        weights = _grow(weights, capacity, count)
+                u[count:end], v[count:end] = parsed['u'], parsed['v']
+                if weights is not None:
+                    weights[count:end] = parsed['w']
+                count = end
+                line += data.count(b'\n')
+            if progress is not None:
+                progress(int(80 * f.tell() / size))
+            if not block:
+                break
+
+    return u[:count], v[:count], weights[:count] if weights is not None else None
+
+
+# Séparateur, nombre de colonnes retenues (2 ou 3), position et numéro de la première ligne
+# de données, d'après la première ligne non vide qui n'est pas un commentaire
+def _sniff(f, path):
+    position = f.tell()
+    for line, raw in enumerate(f, start=1):
+        text = raw.decode('utf-8', errors='replace').strip()
+        if not text or text.startswith(COMMENTS):
+            position += len(raw)
+            continue
+        delimiter = next((d for d in _DELIMITERS if d in text), None)
+        fields = [field.strip() for field in text.split(delimiter)]
+        if len(fields) < 2:
+            raise EdgeListError(f"{path}: au moins deux colonnes attendues (u v [poids])")
+        try:
+            int(fields[0]), int(fields[1])
+        except ValueError:
+            # En-tête: les données commencent à la ligne suivante
+            return delimiter, min(len(fields), 3), position + len(raw), line + 1
+        return delimiter, min(len(fields), 3), position, line
+    raise EdgeListError(f"{path}: aucune arête")
+
+
+def _grow(array, capacity, count):
+    grown = np.empty(capacity, dtype=array.dtype)
+    grown[:count] = array[:count]
+    return grown
+
+
+# Identifiants triés et rangs de u et v (remplacés sur place). Identifiants positifs assez
+# denses (cas courant: 0..n-1): table de correspondance au lieu d'un tri de 2m valeurs.
+def _relabel(u, v):
+    if len(u) == 0:
+        return np.empty(0, dtype=np.int64)
+    low = min(int(u.min()), int(v.min()))
+    high = max(int(u.max()), int(v.max()))
+    if low >= 0 and high < 4 * len(u):
+        present = np.zeros(high + 1, dtype=bool)
+        present[u] = True
+        present[v] = True
+        rank = np.cumsum(present, dtype=np.int64) - 1
+        np.take(rank, u, out=u)
+        np.take(rank, v, out=v)
+        return np.flatnonzero(present)
+    ids, ranks = np.unique(np.concatenate([u, v]), return_inverse=True)
+    u[:], v[:] = ranks[:len(u)], ranks[len(u):]
+    return ids
+
+
+def _build(u, v, weights, seed, progress):
+    if weights is None:
+        weights = np.full(len(u), DEFAULT_WEIGHT, dtype=float)
+
+    keep = u != v
+    if not keep.all():
+        u, v, weights = u[keep], v[keep], weights[keep]
+    # Identifiants -> rangs 0..n-1 (identifiants triés)
+    ids = _relabel(u, v)
+    m = len(u)
+
+    # Arête répétée (dans un sens ou dans l'autre): la dernière occurrence l'emporte
+    n = len(ids)
+    keys = np.minimum(u, v) * n + np.maximum(u, v)
+    _, last = np.unique(keys[::-1], return_index=True)
+    if len(last) < m:
+        keep = np.sort(m - 1 - last)
+        u, v, weights = u[keep], v[keep], weights[keep]
+    del keys, last
+    if progress is not None:
+        progress(90)
+
+    # Pas de positions dans le fichier: points aléatoires, disposition calculée ensuite
+    # (sur place pour un petit graphe, par le LayoutWorker sinon), comme pour les générateurs
+    xy = np.random.default_rng(seed).uniform(-1, 1, size=(n, 2))
+    if 1 < n <= INLINE_LAYOUT_MAX_ORDER:
+        xy = ForceLayout(xy, u, v).run()
+    graphe = CompactGraph.from_arrays(ids, xy, u, v, weights)
+    if progress is not None:
+        progress(100)
+    return graphe
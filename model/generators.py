@@ -0,0 +1,151 @@
+import math
+import random
+
+import numpy as np
+
+from model.compact_graph import CompactGraph
+from model.layout import ForceLayout
+
+# Modèles disponibles, dans l'ordre du generatorComboBox
+GENERATORS = ('gnp', 'geometric', 'barabasi_albert')
+
+# Au-delà, la disposition initiale est aléatoire et le LayoutWorker la calcule en arrière-plan
+INLINE_LAYOUT_MAX_ORDER = 500
+
+
+def new_seed():
+    return int(np.random.SeedSequence().entropy % (2 ** 31))
+
+
+# G(n, p) par sauts géométriques (Batagelj–Brandes): on tire directement l'écart entre
+# deux paires retenues au lieu de tester les n(n-1)/2 paires. Coût en O(n + m).
+def sparse_gnp_edges(n, p, rng, progress=None):
+    total = n * (n - 1) // 2
+    if total == 0 or p <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if p >= 1:
+        v, u = np.tril_indices(n, -1)
+        return u.astype(np.int64), v.astype(np.int64)
+
+    chunks = []
+    last = -1
+    while last < total:
+        batch = int(min(2 ** 22, max(1024, (total - last) * p * 1.05 + 64)))
+        k = last + np.cumsum(rng.geometric(p, size=batch), dtype=np.int64)
+        chunks.append(k[k < total])
+        last = int(k[-1])
+        if progress is not None:
+            progress(int(60 * min(last, total) / total))
+    k = np.concatenate(chunks)
+
+    # Indice linéaire k -> paire (j, i) avec j < i (triangle inférieur, ligne par ligne)
+    i = np.floor((1 + np.sqrt(1 + 8 * k.astype(float))) / 2).astype(np.int64)
+    i -= i * (i - 1) // 2 > k
+    i += (i + 1) * i // 2 <= k
+    j = k - i * (i - 1) // 2
+    return j, i
+
+
+# Graphe géométrique aléatoire: arête entre deux points à distance <= radius.
+# Les points sont rangés par cellule de taille radius; seules les cellules voisines
+# (demi-voisinage, chaque paire une seule fois) sont comparées, de façon vectorisée.
+def geometric_edges(xy, radius, progress=None):
+    n = len(xy)
+    if n < 2 or radius <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    cells = np.floor((xy - xy.min(axis=0)) / radius).astype(np.int64)
+    width = int(cells[:, 1].max()) + 3
+    keys = cells[:, 0] * width + cells[:, 1]
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    us, vs = [], []
+    offsets = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+    for step, (dx, dy) in enumerate(offsets):
+        target = (cells[:, 0] + dx) * width + (cells[:, 1] + dy)
+        lo = np.searchsorted(sorted_keys, target, side='left')
+        hi = np.searchsorted(sorted_keys, target, side='right')
+        counts = hi - lo
+        src = np.repeat(np.arange(n), counts)
+        starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        dst = order[starts + np.arange(counts.sum())]
+
+        keep = src < dst if (dx, dy) == (0, 0) else np.ones(len(src), dtype=bool)
+        delta = xy[src] - xy[dst]
+        keep &= np.einsum('ij,ij->i', delta, delta) <= radius * radius
+        us.append(np.minimum(src[keep], dst[keep]))
+        vs.append(np.maximum(src[keep], dst[keep]))
+        if progress is not None:
+            progress(int(60 * (step + 1) / len(offsets)))
+    return np.concatenate(us), np.concatenate(vs)
+
+
+# Attachement préférentiel (Barabási–Albert): chaque nouveau noeud se relie à m noeuds
+# choisis proportionnellement à leur degré (tirage dans la liste des extrémités)
+def barabasi_albert_edges(n, m, rng, progress=None):
+    m = max(1, min(m, n - 1))
+    if n < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    draw = random.Random(int(rng.integers(2 ** 32)))
+    u = np.empty(m + (n - m - 1) * m, dtype=np.int64)
+    v = np.empty_like(u)
+    # Étoile initiale de m + 1 noeuds (comme networkx)
+    u[:m] = 0
+    v[:m] = np.arange(1, m + 1)
+    repeated = [0] * m + list(range(1, m + 1))
+    k = m
+    report = max(1, n // 20)
+    for source in range(m + 1, n):
+        targets = set()
+        while len(targets) < m:
+            targets.add(repeated[int(draw.random() * len(repeated))])
+        for target in targets:
+            u[k], v[k] = target, source
+            k += 1
+        repeated.extend(targets)
+        repeated.extend([source] * m)
+        if progress is not None and source % report == 0:
+            progress(int(60 * source / n))
+    return u, v
+
+
+# Le graphe géométrique a déjà des positions significatives; les autres partent de points
+# aléatoires
+def needs_layout(generator, n):
+    return generator != 'geometric' and n > 1
+
+
+# Génère un graphe aléatoire pondéré (poids entiers tirés en un seul appel vectorisé).
+# density est la probabilité d'arête de G(n, p); pour les autres modèles elle fixe le
+# même degré moyen attendu, density * (n - 1). Même graine -> même graphe.
+def generate(generator, n, density, poids_min, poids_max, seed, progress=None):
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(-1, 1, size=(n, 2))
+    mean_degree = density * max(n - 1, 0)
+
+    if generator == 'gnp':
+        u, v = sparse_gnp_edges(n, density, rng, progress)
+    elif generator == 'geometric':
+        # Aire du carré [-1, 1]² = 4: degré moyen ~ n * pi * r² / 4
+        radius = math.sqrt(4 * mean_degree / (math.pi * max(n, 1)))
+        u, v = geometric_edges(xy, radius, progress)
+    elif generator == 'barabasi_albert':
+        u, v = barabasi_albert_edges(n, round(mean_degree / 2), rng, progress)
+    else:
+        raise ValueError(f"Générateur inconnu: {generator}")
+
+    weights = rng.integers(poids_min, poids_max + 1, size=len(u))
+    if progress is not None:
+        progress(70)
+
+    if needs_layout(generator, n) and n <= INLINE_LAYOUT_MAX_ORDER:
+        xy = ForceLayout(xy, u, v).run()
+    if progress is not None:
+        progress(90)
+
+    graphe = CompactGraph.from_arrays(np.arange(n), xy, u, v, weights)
+    if progress is not None:
+        progress(100)
+    return graphe
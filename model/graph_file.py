@@ -0,0 +1,97 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from model.compact_graph import CompactGraph
+
+# Format binaire des graphes (.graphe), lisible sans analyse:
+# - signature MAGIC (8 octets) puis longueur (uint32, petit-boutiste) d'un en-tête JSON
+# - en-tête: version du format, métadonnées (graine, générateur...) et, pour chaque tableau,
+#   son type, sa forme et son décalage depuis le début de la zone des données
+# - tableaux bruts petit-boutistes, chacun aligné sur ALIGNMENT octets: le CSR symétrique
+#   du CompactGraph (identifiants, positions N×2, indptr, indices, poids)
+# Au chargement, les tableaux sont projetés en mémoire (np.memmap en copie à l'écriture, vu
+# comme un ndarray ordinaire: l'accès élément par élément d'un memmap est lent): rien n'est
+# relu ni recalculé, les pages sont lues à la demande et le fichier n'est jamais modifié
+# par les éditions du graphe.
+MAGIC = b'GRAPHE\x00\x00'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+EXTENSION = '.graphe'
+
+_ARRAYS = (('ids', '<i8'), ('xy', '<f8'), ('indptr', '<i8'), ('indices', '<i4'), ('weights', '<f8'))
+_PREFIX = struct.Struct('<8sI')
+
+
+class GraphFileError(ValueError):
+    pass
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+# Écrit le graphe (CompactGraph, ou networkx avec ses positions) dans path. Le fichier est
+# écrit à côté puis renommé: un enregistrement interrompu ne laisse pas de fichier tronqué.
+def save_graph(path, graphe, pos=None, metadata=None):
+    if not isinstance(graphe, CompactGraph):
+        graphe = CompactGraph.from_networkx(graphe, pos)
+    arrays = [np.ascontiguousarray(array, dtype=dtype)
+              for array, (_, dtype) in zip(graphe.csr_arrays(), _ARRAYS)]
+
+    specs = {}
+    offset = 0
+    for (name, dtype), array in zip(_ARRAYS, arrays):
+        specs[name] = {'dtype': dtype, 'shape': list(array.shape), 'offset': offset}
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({'version': FORMAT_VERSION, 'metadata': metadata or {}, 'arrays': specs}).encode('utf-8')
+    start = _aligned(_PREFIX.size + len(header))
+
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        for (name, _), array in zip(_ARRAYS, arrays):
+            f.seek(start + specs[name]['offset'])
+            array.tofile(f)
+        f.truncate(start + offset)
+    os.replace(temporary, path)
+
+
+# Lit un fichier écrit par save_graph: (CompactGraph, métadonnées). Avec mmap, les tableaux
+# sont projetés en mémoire au lieu d'être lus.
+def load_graph(path, mmap=True):
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size or prefix[:len(MAGIC)] != MAGIC:
+            raise GraphFileError(f"{path}: ce n'est pas un fichier de graphe")
+        _, length = _PREFIX.unpack(prefix)
+        try:
+            header = json.loads(f.read(length).decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise GraphFileError(f"{path}: en-tête illisible ({e})") from e
+    if header.get('version') != FORMAT_VERSION:
+        raise GraphFileError(f"{path}: version de format non prise en charge ({header.get('version')})")
+
+    start = _aligned(_PREFIX.size + length)
+    size = os.path.getsize(path)
+    arrays = []
+    for name, dtype in _ARRAYS:
+        spec = header['arrays'][name]
+        shape = tuple(spec['shape'])
+        count = int(np.prod(shape))
+        offset = start + spec['offset']
+        if offset + count * np.dtype(dtype).itemsize > size:
+            raise GraphFileError(f"{path}: fichier tronqué ({name})")
+        if mmap and count:
+            arrays.append(np.memmap(path, dtype=dtype, mode='c', offset=offset, shape=shape).view(np.ndarray))
+        else:
+            arrays.append(np.fromfile(path, dtype=dtype, count=count, offset=offset).reshape(shape))
+
+    ids, xy, indptr, indices, weights = arrays
+    if len(indptr) != len(ids) + 1 or len(xy) != len(ids) or len(weights) != len(indices) or \
+            (len(indptr) and indptr[-1] != len(indices)):
+        raise GraphFileError(f"{path}: tableaux incohérents")
+    return CompactGraph.from_csr(ids, xy.reshape(-1, 2), indptr, indices, weights), header['metadata']
@@ -1,33 +1,116 @@
-import random
-import networkx as nx
-from PyQt6.QtCore import pyqtSignal, QObject
-from networkx import Graph
-
-
-class GrapheModel(QObject):
-    _graphe: Graph = nx.Graph()
+import threading
+import weakref
+from contextlib import contextmanager
+
+import numpy as np
+
+from instrumentation import instruments
+from model import generators, graph_file, layout, path_search, traversal
+from model.compact_graph import CompactGraph
+from model.connectivity import ConnectivityIndex
+from model.dynamic_path import DynamicShortestPathTree
+from model.path_cache import ShortestPathCache
+from model.signals import Signal
+from model.snapshot import GraphSnapshot
+from model.spatial_index import GridIndex, SegmentIndex
+
+
+# Le modèle ne dépend ni de Qt ni de matplotlib: le mode batch (graphe.py) l'utilise sans
+# interface graphique. Ses signaux ont l'interface de pyqtSignal (model/signals.py).
+class GrapheModel:
+    _graphe = None  # networkx.Graph ou CompactGraph selon le stockage
     _pos = None
+    _spatial_index = None  # Grille des positions pour la recherche de noeuds au clic
+    _edge_index = None  # Segments des arêtes pour la recherche d'arêtes au clic
+    _indexes_stale = False  # Positions déplacées en bloc: index reconstruits au prochain accès
     _selected_node = None
     _dragging_node = None
     _selected_edge = None
     _start_node = None  # Sommet de départ pour plus court chemin
     _end_node = None  # Sommet d'arrivée pour plus court chemin
     _shortest_path = []  # Stocker le plus court chemin
-    _visited_nodes = []  # Stocker les noeuds visités pendant le parcours
-
+    _traversal = None  # Chronologie du parcours affiché (Timeline)
+    _traversal_position = 0  # Sommets de la chronologie déjà visités à l'écran
+    _version = 0  # Incrémentée à chaque modification du graphe (structure ou poids)
+    _snapshot = None  # Instantané de l'état courant, refait après toute modification
+    _shared = None  # Référence faible au dernier instantané networkx (graphe et positions partagés)
+    _path_cache = None  # Arbres de plus courts chemins par source, pour la version courante
+    _landmarks = None  # (version, Landmarks) pour l'heuristique ALT de A*
+    _last_search = None  # (version, départ, arrivée, distance) de la dernière recherche
+    _last_search_expanded = 0  # Sommets développés par la dernière recherche
+    _last_search_heuristic = None  # 'euclidean' ou 'landmarks' pour A*
+    _path_tree = None  # Arbre complet du départ, réparé à chaque modification (chemin affiché)
+    _components = None  # Composantes connexes (ConnectivityIndex), recalculées après une suppression
+    _batch_depth = 0  # Transactions batch() ouvertes
+    _batch_changed = False  # Un grapheChanged a été retenu pendant la transaction
+
+    # Stockage du graphe: networkx (dictionnaires) ou compact (tableaux contigus, CSR)
+    BACKENDS = ('networkx', 'compact')
+    __backend = 'networkx'
+    __max_networkx_order = 5000  # Au-delà, un graphe généré reste en stockage compact
+
+    # Retouche locale de la disposition après add_node / add_edge / delete_node
+    __local_layout = True
+    __local_hops = 1  # Voisinage déplacé autour des noeuds touchés (le reste est épinglé)
+    __local_iterations = 15
+    __local_max_nodes = 500  # Borne du voisinage (cas d'un sommet de très haut degré)
+
+    __path_engine = 'dijkstra'
+
+    __generator = 'gnp'
+    __seed = None  # Graine du dernier graphe généré (reproductible)
     __proba = 0.5
     __default_graphe_order = 10
     __poids_min = 1
     __poids_max = 10
 
-    grapheChanged = pyqtSignal(dict)
-    pathFound = pyqtSignal(list)  # Signal quand le chemin est trouvé
-    nodeVisited = pyqtSignal(int)  # Signal quand un noeud est visité
-    traversalComplete = pyqtSignal()  # Signal quand le parcours est terminé
-
-    def __init__(self):
-        super().__init__()
-        self._pos = nx.spring_layout(self._graphe, seed=42)
+    grapheChanged = Signal(object)  # Positions: dict ou PositionMap selon le stockage
+    pathFound = Signal(list)  # Chemin affiché recalculé après une modification du graphe
+    nodeVisited = Signal(int)  # Signal quand un noeud est visité
+    traversalComplete = Signal()  # Signal quand le parcours est terminé
+
+    def __init__(self, backend='networkx'):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Stockage inconnu: {backend}")
+        self.__backend = backend
+        # Graphe vide en tableaux quel que soit le stockage: networkx n'est importé qu'au
+        # premier graphe installé ou à la première édition (voir __materialize)
+        self._graphe = CompactGraph()
+        self._pos = self._graphe.positions
+        self._spatial_index = GridIndex()
+        self._edge_index = SegmentIndex()
+        self.__rebuild_indexes()
+        self._path_cache = ShortestPathCache()
+        self.__path_lock = threading.Lock()  # Une seule recherche à la fois sur le cache
+        self._components = ConnectivityIndex()
+        self._components.version = self._version
+        self.__components_lock = threading.Lock()
+
+    # Transaction: les grapheChanged des modifications faites dans le bloc sont retenus et
+    # un seul est émis à la sortie (imbriquable, seul le bloc le plus externe émet)
+    @contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_changed:
+                self._batch_changed = False
+                self.__emit_changed()
+
+    def __changed(self):
+        if self._batch_depth > 0:
+            self._batch_changed = True
+            instruments.count('model.grapheChanged.deferred')
+        else:
+            self.__emit_changed()
+
+    # Émission comptée et chronométrée (fonctions connectées comprises)
+    def __emit_changed(self):
+        instruments.count('model.grapheChanged')
+        with instruments.timer('signal.grapheChanged'):
+            self.grapheChanged.emit(self._pos)
 
     def graphe_order(self):
         return self._graphe.number_of_nodes()
@@ -40,14 +123,155 @@ class GrapheModel(QObject):
     def default_graphe_order(self, value):
         self.__default_graphe_order = value
 
+    @property
+    def generator(self):
+        return self.__generator
+
+    @generator.setter
+    def generator(self, value):
+        if value not in generators.GENERATORS:
+            raise ValueError(f"Générateur inconnu: {value}")
+        self.__generator = value
+
+    @property
+    def proba(self):
+        return self.__proba
+
+    @proba.setter
+    def proba(self, value):
+        self.__proba = value
+
+    @property
+    def local_layout(self):
+        return self.__local_layout
+
+    @local_layout.setter
+    def local_layout(self, value):
+        self.__local_layout = bool(value)
+
+    @property
+    def path_engine(self):
+        return self.__path_engine
+
+    @path_engine.setter
+    def path_engine(self, value):
+        if value not in path_search.ENGINES:
+            raise ValueError(f"Moteur de chemin inconnu: {value}")
+        self.__path_engine = value
+
+    @property
+    def last_search_expanded(self):
+        return self._last_search_expanded
+
+    @property
+    def last_search_heuristic(self):
+        return self._last_search_heuristic
+
+    @property
+    def seed(self):
+        return self.__seed
+
+    @property
+    def backend(self):
+        return self.__backend
+
+    # Changer de stockage convertit le graphe courant
+    @backend.setter
+    def backend(self, value):
+        if value not in self.BACKENDS:
+            raise ValueError(f"Stockage inconnu: {value}")
+        if value != self.__backend:
+            self.__backend = value
+            self.set_graph(self._graphe, self._pos)
+
+    # Stockage du graphe courant (peut différer de backend pour un grand graphe)
+    @property
+    def storage(self):
+        return 'compact' if isinstance(self._graphe, CompactGraph) else 'networkx'
+
     @property
     def graphe(self):
         return self._graphe
 
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def path_cache(self):
+        return self._path_cache
+
+    # Instantané immuable (graphe, positions, version) pour les calculs hors du thread GUI,
+    # pris en O(1) avec copie à l'écriture. Stockage compact: tableaux partagés (copiés par
+    # CompactGraph); networkx: graphe et positions partagés, copiés par __unshare avant la
+    # prochaine écriture si un worker tient encore l'instantané. Deux appels sans
+    # modification entre eux renvoient le même objet.
+    def snapshot(self):
+        if self._snapshot is None:
+            if isinstance(self._graphe, CompactGraph):
+                frozen = self._graphe.snapshot()
+                self._snapshot = GraphSnapshot(self._version, frozen, frozen.positions)
+            else:
+                self._snapshot = GraphSnapshot(self._version, self._graphe, self._pos)
+                self._shared = weakref.ref(self._snapshot)
+        return self._snapshot
+
+    # Avant d'écrire dans le graphe ou les positions: l'instantané courant est périmé, et
+    # celui encore tenu par un worker garde les objets networkx qu'il partageait (le modèle
+    # continue sur une copie, O(N + E), bornée par __max_networkx_order pour un graphe généré)
+    def __unshare(self):
+        self._snapshot = None
+        shared = self._shared() if self._shared is not None else None
+        if shared is None:
+            self._shared = None
+            return
+        with instruments.timer('model.snapshot_copy'):
+            if shared.graphe is self._graphe:
+                self._graphe = self._graphe.copy()
+            if shared.pos is self._pos:
+                self._pos = dict(self._pos)
+        self._shared = None
+
+    # État courant sans copie, pour les calculs faits dans le thread GUI
+    def __live_view(self):
+        return GraphSnapshot(self._version, self._graphe, self._pos)
+
+    def __graph_changed(self):
+        self._version += 1
+        self._snapshot = None
+
     @property
     def pos(self):
         return self._pos
 
+    @property
+    def spatial_index(self):
+        self.__refresh_indexes()
+        return self._spatial_index
+
+    @property
+    def edge_index(self):
+        self.__refresh_indexes()
+        return self._edge_index
+
+    def __rebuild_indexes(self):
+        self._spatial_index.rebuild(self._pos)
+        self._edge_index.rebuild(self._graphe, self._pos)
+        self._indexes_stale = False
+
+    # À appeler avant toute mise à jour incrémentale des index
+    def __refresh_indexes(self):
+        if self._indexes_stale:
+            self.__rebuild_indexes()
+
+    # Noeuds et arêtes (extrémités) qui recoupent le rectangle, lus dans les index spatiaux.
+    # None si les positions ont bougé en bloc depuis leur construction (disposition en cours):
+    # reconstruire les index à chaque image coûterait plus que de relire tous les tableaux
+    def query_rect(self, x0, y0, x1, y1):
+        if self._indexes_stale:
+            return None
+        return self._spatial_index.query_rect(x0, y0, x1, y1), self._edge_index.query_rect(x0, y0, x1, y1)
+
     @property
     def selected_node(self):
         return self._selected_node
@@ -71,7 +295,7 @@ class GrapheModel(QObject):
     @start_node.setter
     def start_node(self, node):
         self._start_node = node
-        self.grapheChanged.emit(self._pos)
+        self.__changed()
 
     @property
     def end_node(self):
@@ -80,7 +304,7 @@ class GrapheModel(QObject):
     @end_node.setter
     def end_node(self, node):
         self._end_node = node
-        self.grapheChanged.emit(self._pos)
+        self.__changed()
 
     @property
     def shortest_path(self):
@@ -89,97 +313,320 @@ class GrapheModel(QObject):
     @shortest_path.setter
     def shortest_path(self, path):
         self._shortest_path = path
-        self.grapheChanged.emit(self._pos)
+        self.__changed()
 
     @property
     def visited_nodes(self):
-        return self._visited_nodes
+        if self._traversal is None:
+            return []
+        return self._traversal.order[:self._traversal_position].tolist()
+
+    @property
+    def traversal(self):
+        return self._traversal
 
-    @visited_nodes.setter
-    def visited_nodes(self, nodes):
-        self._visited_nodes = nodes
-        self.grapheChanged.emit(self._pos)
+    @traversal.setter
+    def traversal(self, timeline):
+        self._traversal = timeline
+        self._traversal_position = 0
+        self.__changed()
+
+    # Curseur de lecture dans la chronologie (nombre de sommets visités à l'écran)
+    @property
+    def traversal_position(self):
+        return self._traversal_position
+
+    @traversal_position.setter
+    def traversal_position(self, position):
+        if self._traversal is None:
+            return
+        position = max(0, min(int(position), len(self._traversal)))
+        if position != self._traversal_position:
+            self._traversal_position = position
+            self.__changed()
+
+    def is_visited(self, node):
+        return self._traversal is not None and self._traversal.visited(node, self._traversal_position)
+
+    # État d'affichage des sommets en masques booléens alignés sur nodes (tableau d'identifiants)
+    def node_masks(self, nodes):
+        nodes = np.asarray(nodes)
+        none = np.zeros(len(nodes), dtype=bool)
+
+        def equals(node):
+            return none if node is None else nodes == node
+
+        visited = none
+        if self._traversal is not None:
+            visited = self._traversal.visited_mask(nodes, self._traversal_position)
+        return {'start': equals(self._start_node), 'end': equals(self._end_node),
+                'visited': visited, 'selected': equals(self._selected_node)}
+
+    # Masque des arêtes du plus court chemin, aligné sur edges (tableau (E, 2) d'identifiants,
+    # dans un sens ou dans l'autre): chaque arête est codée par une clé entière unique
+    def path_edge_mask(self, edges):
+        edges = np.asarray(edges).reshape(-1, 2)
+        path = np.asarray(self._shortest_path)
+        if len(path) < 2 or len(edges) == 0:
+            return np.zeros(len(edges), dtype=bool)
+        base = int(max(edges.max(), path.max())) + 1
+        path_keys = np.minimum(path[:-1], path[1:]) * base + np.maximum(path[:-1], path[1:])
+        keys = edges.min(axis=1) * base + edges.max(axis=1)
+        return np.isin(keys, path_keys)
+
+    # Chronologie de parcours calculée en une passe sur un instantané (appelable depuis un worker)
+    @staticmethod
+    @instruments.timed('model.compute_traversal')
+    def compute_traversal(snapshot, kind, source, checkpoint=None):
+        neighbors = snapshot.weighted_neighbors
+        if checkpoint is not None:
+            def neighbors(node):
+                checkpoint()
+                return snapshot.weighted_neighbors(node)
+        return traversal.traverse(kind, source, snapshot.nodes(), neighbors)
 
     def edge_weight(self, edge):
         return self._graphe[edge[0]][edge[1]]['weight']
 
-    def generate_graph(self):
-        self._graphe = nx.gnp_random_graph(self.default_graphe_order, self.__proba, directed=False)
-        for u, v in self._graphe.edges():
-            self._graphe[u][v]['weight'] = random.randint(self.__poids_min, self.__poids_max)
-        self._pos = nx.spring_layout(self._graphe, seed=42)
-        self._selected_node = None
-        self._selected_edge = None
-        self._start_node = None
-        self._end_node = None
-        self._shortest_path = []
-        self._visited_nodes = []
-        self.grapheChanged.emit(self._pos)
+    @instruments.timed('model.generate_graph')
+    def generate_graph(self, seed=None):
+        if seed is None:
+            seed = generators.new_seed()
+        graphe = self.build_random_graph(self.default_graphe_order, self.__generator, self.__proba, seed)
+        self.set_graph(graphe, graphe.positions, seed)
+
+    # Construit un graphe aléatoire sans toucher à l'état du modèle (appelable hors du thread GUI)
+    def build_random_graph(self, order, generator, proba, seed, progress=None):
+        return generators.generate(generator, order, proba, self.__poids_min, self.__poids_max,
+                                   seed, progress)
+
+    # Enregistre le graphe courant (structure, poids, positions, graine) au format binaire
+    @instruments.timed('model.save_graph')
+    def save_graph(self, path):
+        if isinstance(self._graphe, CompactGraph):
+            # Le fichier chargé peut être celui qu'on remplace: ses tableaux sont recopiés
+            self._graphe.detach(path)
+            self._snapshot = None
+        graph_file.save_graph(path, self._graphe, self._pos, {'seed': self.__seed})
+
+    # Charge un graphe enregistré: tableaux projetés en mémoire, ni analyse ni disposition
+    @instruments.timed('model.load_graph')
+    def load_graph(self, path):
+        graphe, metadata = graph_file.load_graph(path)
+        self.set_graph(graphe, graphe.positions, metadata.get('seed'))
 
     def delete_graph(self):
-        self._graphe = nx.empty_graph()
-        self._pos = nx.spring_layout(self._graphe, seed=42)
+        self.set_graph(CompactGraph(), None)
+
+    # Installe un graphe (converti vers le stockage choisi) et réinitialise les sélections.
+    # Le stockage est choisi pour ce graphe seulement: un grand graphe compact le reste, le
+    # stockage configuré (backend) ne change pas et vaut de nouveau pour le graphe suivant
+    @instruments.timed('model.set_graph')
+    def set_graph(self, graphe, pos, seed=None):
+        backend = self.__backend
+        if isinstance(graphe, CompactGraph) and graphe.number_of_nodes() > self.__max_networkx_order:
+            backend = 'compact'
+
+        if backend == 'compact' and not isinstance(graphe, CompactGraph):
+            graphe = CompactGraph.from_networkx(graphe, pos)
+        elif backend == 'networkx' and isinstance(graphe, CompactGraph) and graphe.number_of_nodes():
+            graphe, pos = graphe.to_networkx()
+        if isinstance(graphe, CompactGraph):
+            pos = graphe.positions
+
+        self._graphe = graphe
+        self._pos = pos
+        self.__seed = seed
+        self.__graph_changed()
+        # Index reconstruits au premier clic ou à la première édition, pas au chargement
+        self._indexes_stale = True
         self._selected_node = None
         self._selected_edge = None
         self._start_node = None
         self._end_node = None
         self._shortest_path = []
-        self._visited_nodes = []
-        self.grapheChanged.emit(self._pos)
-
+        self._path_tree = None
+        self._traversal = None
+        self._traversal_position = 0
+        self.__changed()
+
+    # Graphe sous forme de tableaux pour le moteur de disposition: identifiants, positions
+    # N×2 et extrémités des arêtes en rangs dans l'ordre des identifiants
+    def layout_arrays(self):
+        if isinstance(self._graphe, CompactGraph):
+            return self._graphe.layout_arrays()
+        ids, u, v = self.__live_view().rank_arrays()
+        xy = np.array([self._pos[node] for node in ids.tolist()], dtype=float).reshape(-1, 2)
+        return ids, xy, u, v
+
+    # Nouvelles positions calculées par le moteur de disposition (noeuds disparus ignorés)
+    @instruments.timed('model.apply_positions')
+    def apply_positions(self, ids, xy):
+        self.__unshare()
+        if isinstance(self._graphe, CompactGraph):
+            self._graphe.set_positions(ids, xy)
+        else:
+            for node, position in zip(ids.tolist(), xy):
+                if node in self._pos:
+                    self._pos[node] = position
+        self._indexes_stale = True
+        self.__changed()
+
+    # Graphe vide gardé en tableaux (stockage networkx): converti avant la première édition
+    def __materialize(self):
+        if self.__backend == 'networkx' and isinstance(self._graphe, CompactGraph) and len(self._graphe) == 0:
+            self._graphe, self._pos = self._graphe.to_networkx()
+
+    @instruments.timed('model.add_node')
     def add_node(self, position):
+        self.__materialize()
+        self.__refresh_indexes()
+        self.__unshare()
         new_node_id = 0
         while new_node_id in self._graphe.nodes():
             new_node_id += 1
         self._graphe.add_node(new_node_id)
+        self.__graph_changed()
         self._pos[new_node_id] = position
-        self.grapheChanged.emit(self._pos)
-
+        self._spatial_index.insert(new_node_id, position)
+        self._edge_index.add_node(new_node_id)
+        self.__relax_around([new_node_id])
+        self.__update_components(lambda index: index.add_node(new_node_id))
+        self.__follow_path()  # Sommet isolé: inaccessible, arbre inchangé
+        self.__changed()
+
+    @instruments.timed('model.delete_node')
     def delete_node(self, node):
+        self.__refresh_indexes()
         if node in self._graphe.nodes():
+            neighbors = list(self._graphe.neighbors(node))
+            self.__unshare()
             self._graphe.remove_node(node)
+            self.__graph_changed()
             if node in self._pos:
                 del self._pos[node]
+            self._spatial_index.remove(node)
+            self._edge_index.remove_node(node)
             if self._selected_node == node:
                 self._selected_node = None
             if self._start_node == node:
                 self._start_node = None
             if self._end_node == node:
                 self._end_node = None
-            self.grapheChanged.emit(self._pos)
+            self.__relax_around(neighbors)
+            self.__follow_path(lambda tree: tree.remove_node(node), (node,))
+            self.__changed()
 
+    @instruments.timed('model.delete_edge')
     def delete_edge(self, edge):
+        self.__refresh_indexes()
         node1, node2 = edge
         if self._graphe.has_edge(node1, node2):
+            weight = self._graphe[node1][node2]['weight']
+            self.__unshare()
             self._graphe.remove_edge(node1, node2)
+            self.__graph_changed()
+            self._edge_index.remove_edge(node1, node2)
             if self._selected_edge == edge or self._selected_edge == (node2, node1):
                 self._selected_edge = None
-            self.grapheChanged.emit(self._pos)
+            self.__follow_path(lambda tree: tree.update_edge(node1, node2, weight, None), edge)
+            self.__changed()
 
+    @instruments.timed('model.move_node')
     def move_node(self, node, position):
+        self.__refresh_indexes()
         if node in self._graphe.nodes():
+            self.__unshare()
             self._pos[node] = position
-            self.grapheChanged.emit(self._pos)
+            self._spatial_index.move(node, position)
+            self._edge_index.move_node(node, position)
+            self.__changed()
 
+    @instruments.timed('model.add_edge')
     def add_edge(self, node1, node2, weight=1):
+        self.__refresh_indexes()
         if node1 in self._graphe.nodes() and node2 in self._graphe.nodes():
             if not self._graphe.has_edge(node1, node2):
+                self.__unshare()
                 self._graphe.add_edge(node1, node2, weight=weight)
-                self.grapheChanged.emit(self._pos)
+                self.__graph_changed()
+                self._edge_index.add_edge(node1, node2, self._pos[node1], self._pos[node2])
+                self.__relax_around([node1, node2])
+                self.__update_components(lambda index: index.add_edge(node1, node2))
+                self.__follow_path(lambda tree: tree.update_edge(node1, node2, None, weight), (node1, node2))
+                self.__changed()
                 return True
         return False
 
+    # Quelques itérations de forces sur le voisinage à __local_hops sauts des noeuds
+    # touchés; les voisins juste au-delà restent fixes et servent d'ancres, le reste du
+    # graphe n'est pas lu. Coût proportionnel à la taille du voisinage.
+    def __relax_around(self, nodes):
+        if not self.__local_layout:
+            return
+        free = self.__neighborhood(nodes)
+        rank = {node: i for i, node in enumerate(free)}
+        anchors = []
+        u, v = [], []
+        for node in free:
+            for neighbor in self._graphe.neighbors(node):
+                if neighbor not in rank:
+                    rank[neighbor] = len(free) + len(anchors)
+                    anchors.append(neighbor)
+                elif rank[neighbor] < len(free) and rank[neighbor] <= rank[node]:
+                    continue  # Arête entre deux noeuds libres, déjà vue depuis l'autre bout
+                u.append(rank[node])
+                v.append(rank[neighbor])
+        if not u:
+            return  # Noeud isolé: il garde la position du clic
+
+        subset = free + anchors
+        xy = np.array([self._pos[node] for node in subset], dtype=float).reshape(-1, 2)
+        u, v = np.array(u), np.array(v)
+        # Même échelle que la disposition globale: k = sqrt(aire / nombre de noeuds), l'aire
+        # lue dans les bornes tenues par l'index spatial (aucune lecture de tout le graphe)
+        x0, y0, x1, y1 = self._spatial_index.bounds
+        k = np.sqrt(max((x1 - x0) * (y1 - y0), 1e-6) / self._graphe.number_of_nodes())
+        fixed = np.arange(len(subset)) >= len(free)
+        xy = layout.relax(xy, u, v, fixed, k, self.__local_iterations)
+
+        self.__unshare()
+        for node, position in zip(free, xy):
+            self._pos[node] = position
+            self._spatial_index.move(node, position)
+            self._edge_index.move_node(node, position)
+
+    # Noeuds à au plus __local_hops sauts (parcours en largeur borné à __local_max_nodes)
+    def __neighborhood(self, nodes):
+        seen = {node: None for node in nodes if node in self._graphe}
+        frontier = list(seen)
+        for _ in range(self.__local_hops):
+            next_frontier = []
+            for node in frontier:
+                for neighbor in self._graphe.neighbors(node):
+                    if neighbor not in seen:
+                        if len(seen) >= self.__local_max_nodes:
+                            return list(seen)
+                        seen[neighbor] = None
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return list(seen)
+
+    @instruments.timed('model.set_edge_weight')
     def set_edge_weight(self, edge, weight):
         node1, node2 = edge
-        if self._graphe.has_edge(node1, node2):
-            self._graphe[node1][node2]['weight'] = weight
-            self.grapheChanged.emit(self._pos)
-            return True
-        elif self._graphe.has_edge(node2, node1):
-            self._graphe[node2][node1]['weight'] = weight
-            self.grapheChanged.emit(self._pos)
-            return True
-        return False
+        if not self._graphe.has_edge(node1, node2):
+            node1, node2 = node2, node1
+            if not self._graphe.has_edge(node1, node2):
+                return False
+        old = self._graphe[node1][node2]['weight']
+        self.__unshare()
+        self._graphe[node1][node2]['weight'] = weight
+        self.__graph_changed()
+        self.__update_components(lambda index: None)  # Poids: composantes inchangées
+        self.__follow_path(lambda tree: tree.update_edge(node1, node2, old, weight), (node1, node2))
+        self.__changed()
+        return True
 
     def get_edge_weight(self, edge):
         node1, node2 = edge
@@ -189,27 +636,193 @@ class GrapheModel(QObject):
             return self._graphe[node2][node1]['weight']
         return None
 
-    def find_shortest_path(self):
+    # Plus court chemin entre les sommets de départ et d'arrivée avec le moteur choisi:
+    # - dijkstra: arbres de plus courts chemins gardés par source tant que le graphe ne
+    #   change pas (une nouvelle requête depuis le même départ ne recalcule rien)
+    # - bidirectional: Dijkstra depuis les deux extrémités
+    # - astar: A* guidé par les positions, ou par des repères (ALT) si les poids ne suivent
+    #   pas les longueurs des arêtes
+    def find_shortest_path(self, checkpoint=None, follow=False):
         if self._start_node is None or self._end_node is None:
             return []
-
-        if self._start_node not in self._graphe.nodes() or self._end_node not in self._graphe.nodes():
+        return self.search_path(self.__live_view(), self._start_node, self._end_node, checkpoint, follow)
+
+    # Recherche sur un instantané (appelable depuis un worker). checkpoint, s'il est donné,
+    # est appelé avant chaque sommet développé et peut lever une exception pour annuler la
+    # recherche (le cache reste valide). follow: construit aussi l'arbre complet du départ,
+    # qui garde le chemin affiché à jour après les modifications (__follow_path).
+    @instruments.timed('model.search_path')
+    def search_path(self, snapshot, source, target, checkpoint=None, follow=False):
+        if not snapshot.has_node(source) or not snapshot.has_node(target):
             return []
 
-        try:
-            # Utiliser dijkstra pour tenir compte des poids
-            path = nx.shortest_path(self._graphe, source=self._start_node,
-                                    target=self._end_node, weight='weight')
-            return path
-        except nx.NetworkXNoPath:
-            return []
+        neighbors = snapshot.weighted_neighbors
+        if checkpoint is not None:
+            def neighbors(node):
+                checkpoint()
+                return snapshot.weighted_neighbors(node)
+
+        connected = self.__query_components(snapshot, lambda index: index.connected(source, target))
+        with self.__path_lock:
+            self._last_search_heuristic = None
+            tree = self._path_tree
+            if not connected:
+                # Composantes différentes: aucun chemin, sans exploration
+                path, distance, expanded = [], None, 0
+            elif tree is not None and tree.version == snapshot.version and tree.source == source:
+                # Arbre du chemin suivi, déjà exact pour cette version
+                path, distance, expanded = tree.path(target), tree.distance(target), 0
+            elif self.__path_engine == 'dijkstra':
+                # Arbres gardés en cache: voisins sans le checkpoint de cette tâche, lus sur
+                # une vue qui ne retient pas l'instantané (__unshare)
+                cache = self._path_cache
+                cached = GraphSnapshot(snapshot.version, snapshot.graphe, snapshot.pos).weighted_neighbors
+                path = cache.path(snapshot.version, source, target, cached, checkpoint)
+                expanded = cache.last_expanded
+                distance = cache.distance(snapshot.version, source, target, cached, checkpoint)
+            elif self.__path_engine == 'bidirectional':
+                path, distance, expanded = path_search.bidirectional_dijkstra(source, target, neighbors)
+            else:
+                path, distance, expanded = path_search.astar(source, target, neighbors,
+                                                             self.__astar_heuristic(snapshot, target, neighbors))
+            self._last_search = (snapshot.version, source, target, distance)
+            self._last_search_expanded = expanded
+        if follow:
+            self.__build_path_tree(snapshot, source, neighbors)
+        return path
+
+    # Arbre du départ construit dans le thread de la recherche, hors du verrou (les
+    # modifications du thread GUI n'attendent pas), puis installé s'il est encore exact: une
+    # modification faite pendant la construction le périme, et la recherche est relancée
+    # (version du résultat différente de celle du modèle)
+    def __build_path_tree(self, snapshot, source, neighbors):
+        tree = self._path_tree
+        if tree is not None and tree.version == snapshot.version and tree.source == source:
+            return
+        with instruments.timer('model.path_tree_build'):
+            tree = DynamicShortestPathTree(source, neighbors)
+        tree.version = snapshot.version
+        with self.__path_lock:
+            if snapshot.version == self._version:
+                tree.neighbors = self.__live_view().weighted_neighbors
+                self._path_tree = tree
+
+    # Longueur du plus court chemin (None si inaccessible): celle de la dernière recherche,
+    # sinon lue dans le cache
+    def path_distance(self, source, target):
+        if source not in self._graphe.nodes() or target not in self._graphe.nodes():
+            return None
+        if self._last_search is not None and self._last_search[:3] == (self._version, source, target):
+            return self._last_search[3]
+        view = self.__live_view()
+        with self.__path_lock:
+            return self._path_cache.distance(view.version, source, target, view.weighted_neighbors)
+
+    def __astar_heuristic(self, snapshot, target, neighbors):
+        scale = self.__euclidean_scale(snapshot)
+        if scale is not None:
+            self._last_search_heuristic = 'euclidean'
+            return path_search.euclidean_heuristic(snapshot.pos, target, scale)
+
+        if self._landmarks is None or self._landmarks[0] != snapshot.version:
+            self._landmarks = (snapshot.version, path_search.Landmarks(snapshot.nodes(), neighbors))
+        self._last_search_heuristic = 'landmarks'
+        return self._landmarks[1].heuristic(target)
+
+    # Plus grand facteur s tel que poids >= s * longueur pour toutes les arêtes, ou None si
+    # ce facteur est trop petit devant le rapport médian pour guider la recherche
+    @staticmethod
+    def __euclidean_scale(snapshot):
+        graphe, pos = snapshot.graphe, snapshot.pos
+        if isinstance(graphe, CompactGraph):
+            _, _, p0, p1 = graphe.edge_endpoints()
+            weights = graphe.edge_arrays()[2]
+        else:
+            edges = list(graphe.edges(data='weight', default=1))
+            p0 = np.array([pos[u] for u, _, _ in edges], dtype=float).reshape(-1, 2)
+            p1 = np.array([pos[v] for _, v, _ in edges], dtype=float).reshape(-1, 2)
+            weights = np.array([w for _, _, w in edges], dtype=float)
+        lengths = np.hypot(*(p1 - p0).T)
+        ratio = weights[lengths > 0] / lengths[lengths > 0]
+        if len(ratio) == 0:
+            return 0.0
+        scale = float(ratio.min())
+        return scale if scale >= path_search.EUCLIDEAN_MIN_RATIO * float(np.median(ratio)) else None
+
+    # Composantes connexes du graphe courant
+    def connected(self, source, target):
+        return self.__query_components(self.__live_view(), lambda index: index.connected(source, target))
+
+    def component(self, node):
+        return self.__query_components(self.__live_view(), lambda index: index.component(node))
+
+    # Étiquettes de composantes alignées sur nodes (coloration de la vue)
+    def component_labels(self, nodes):
+        return self.__query_components(self.__live_view(), lambda index: index.components(nodes))
+
+    def component_count(self):
+        return self.__query_components(self.__live_view(), lambda index: index.count)
+
+    # query(index) sur l'index des composantes exact pour la version de view, recalculé si
+    # besoin (appelable depuis un worker avec un instantané)
+    def __query_components(self, view, query):
+        with self.__components_lock:
+            index = self._components
+            if index.version != view.version:
+                with instruments.timer('model.components_rebuild'):
+                    index.rebuild(*view.rank_arrays())
+                index.version = view.version
+            return query(index)
+
+    # Ajout appliqué à l'index des composantes par update(index), s'il était à jour (appelée
+    # après __graph_changed). Les suppressions ne l'appellent pas: l'index, périmé, sera
+    # recalculé à la prochaine requête
+    def __update_components(self, update):
+        with self.__components_lock:
+            index = self._components
+            if index.version == self._version - 1:
+                update(index)
+                index.version = self._version
+
+    # Chemin affiché gardé à jour après une modification du graphe (appelée après
+    # __graph_changed): update(arbre) répare l'arbre du départ au lieu de relancer la
+    # recherche. nodes: sommets touchés; hors de l'arbre (autre composante, sommet isolé
+    # ajouté), la modification ne change aucune distance et l'arbre est seulement
+    # revalidé. L'arbre est construit par la recherche (search_path avec follow): absent ou
+    # périmé (recherche en cours), il n'est pas reconstruit ici; il est abandonné dès
+    # qu'aucun chemin n'est suivi.
+    def __follow_path(self, update=None, nodes=()):
+        start, end = self._start_node, self._end_node
+        if start is None or end is None or self._last_search is None or self._last_search[1:3] != (start, end):
+            self._path_tree = None
+            return
+        with self.__path_lock:
+            tree = self._path_tree
+            if tree is None or tree.source != start or tree.version != self._version - 1:
+                self._path_tree = None
+                return
+            tree.version = self._version
+            if not any(node in tree.dist for node in nodes):
+                self._last_search = (self._version,) + self._last_search[1:]
+                return
+            tree.neighbors = self.__live_view().weighted_neighbors
+            with instruments.timer('model.path_repair'):
+                update(tree)
+            path = tree.path(end)
+            self._shortest_path = path
+            self._last_search = (self._version, start, end, tree.distance(end))
+            self._last_search_expanded = tree.last_affected
+            self._last_search_heuristic = None
+        self.pathFound.emit(path)
 
     def reset_path(self):
         self._start_node = None
         self._end_node = None
         self._shortest_path = []
-        self.grapheChanged.emit(self._pos)
+        self._path_tree = None
+        self.__changed()
 
     def reset_traversal(self):
-        self._visited_nodes = []
-        self.grapheChanged.emit(self._pos)
\ No newline at end of file
+        self._traversal = None
+        self._traversal_position = 0
+        self.__changed()
\ No newline at end of file
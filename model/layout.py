@@ -0,0 +1,230 @@
+import numpy as np
+
+
+# Disposition par forces (Fruchterman–Reingold) à répulsion approximée sur grille.
+# - répulsion exacte entre noeuds des 3x3 cellules voisines
+# - répulsion lointaine: la masse de chaque cellule est convoluée (FFT) avec le noyau
+#   k²/r, ce qui donne la force de toutes les cellules éloignées en O(G² log G)
+# - attraction d²/k le long des arêtes
+# Chaque itération coûte O(n + m + G² log G) au lieu de O(n²).
+class ForceLayout:
+    __max_grid = 256
+
+    def __init__(self, xy, u, v, iterations=50, fixed=None):
+        self.xy = np.array(xy, dtype=float).reshape(-1, 2)
+        self.u = np.asarray(u, dtype=np.int64)
+        self.v = np.asarray(v, dtype=np.int64)
+        self.n = len(self.xy)
+        self.iterations = iterations
+        self.iteration = 0
+        self.fixed = np.zeros(self.n, dtype=bool) if fixed is None else np.asarray(fixed, dtype=bool)
+
+        # Distance idéale entre noeuds pour une aire de départ de 2 x 2
+        self.k = 2.0 / np.sqrt(max(self.n, 1))
+        span = np.ptp(self.xy, axis=0).max() if self.n > 1 else 1.0
+        self.temperature = 0.1 * max(span, 1e-3)
+        self.cooling = self.temperature / (iterations + 1)
+
+        self.grid = int(np.clip(np.sqrt(self.n / 2), 4, self.__max_grid))
+        self.__kernel = self.__unit_kernel(self.grid)
+
+    @property
+    def done(self):
+        return self.iteration >= self.iterations or self.n == 0
+
+    # Une itération; renvoie le déplacement moyen (0 quand tout est figé)
+    def step(self):
+        if self.done:
+            return 0.0
+
+        force = self.__repulsion() + self.__attraction()
+        length = np.hypot(force[:, 0], force[:, 1])
+        length = np.where(length < 1e-12, 1e-12, length)
+        displacement = force * (np.minimum(length, self.temperature) / length)[:, None]
+        displacement[self.fixed] = 0.0
+        self.xy += displacement
+
+        self.temperature -= self.cooling
+        self.iteration += 1
+        return float(np.abs(displacement).mean()) if self.n else 0.0
+
+    def run(self):
+        while not self.done:
+            self.step()
+        return self.positions()
+
+    # Positions centrées et ramenées dans [-1, 1] (comme networkx.rescale_layout)
+    def positions(self):
+        return rescale(self.xy)
+
+    def __repulsion(self):
+        n, k2 = self.n, self.k * self.k
+        force = np.zeros((n, 2))
+        if n < 2:
+            return force
+
+        # Grille d'environ deux noeuds par cellule sur la boîte des quantiles 0.5-99.5%:
+        # les noeuds isolés qui s'éloignent sont rangés dans les cellules du bord au lieu
+        # d'étirer la grille (ce qui entasserait le reste dans quelques cellules)
+        g = self.grid
+        origin = np.quantile(self.xy, 0.005, axis=0)
+        span = max((np.quantile(self.xy, 0.995, axis=0) - origin).max(), 1e-9)
+        h = span / g * (1 + 1e-9)
+        cells = np.clip(np.floor((self.xy - origin) / h).astype(np.int64), 0, g - 1)
+        kernel = self.__kernel
+
+        # Champ lointain: convolution de la grille de masses avec le noyau (cellules à
+        # distance >= 2), puis lecture du champ dans la cellule de chaque noeud
+        mass = np.bincount(cells[:, 0] * g + cells[:, 1], minlength=g * g).reshape(g, g).astype(float)
+        size = 3 * g
+        mass_hat = np.fft.rfft2(mass, s=(size, size))
+        field_x = np.fft.irfft2(mass_hat * kernel[0], s=(size, size))[g - 1:2 * g - 1, g - 1:2 * g - 1]
+        field_y = np.fft.irfft2(mass_hat * kernel[1], s=(size, size))[g - 1:2 * g - 1, g - 1:2 * g - 1]
+        force[:, 0] = field_x[cells[:, 0], cells[:, 1]] * k2 / h
+        force[:, 1] = field_y[cells[:, 0], cells[:, 1]] * k2 / h
+
+        # Champ proche: paires exactes dans les cellules voisines (chaque paire une fois)
+        # (clés décalées d'une cellule pour que les voisins du bord restent dans la table)
+        width = g + 2
+        keys = (cells[:, 0] + 1) * width + (cells[:, 1] + 1)
+        order = np.argsort(keys, kind='stable')
+        count = np.bincount(keys, minlength=width * width)
+        start = np.cumsum(count) - count
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            target = keys + (dx * width + dy)
+            lo = start[target]
+            counts = count[target]
+            src = np.repeat(np.arange(n), counts)
+            dst = order[np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())]
+            if (dx, dy) == (0, 0):
+                keep = src < dst
+                src, dst = src[keep], dst[keep]
+
+            delta = self.xy[src] - self.xy[dst]
+            dist2 = np.maximum(np.einsum('ij,ij->i', delta, delta), 1e-12)
+            push = delta * (k2 / dist2)[:, None]
+            for axis in (0, 1):
+                force[:, axis] += np.bincount(src, weights=push[:, axis], minlength=n)
+                force[:, axis] -= np.bincount(dst, weights=push[:, axis], minlength=n)
+        return force
+
+    def __attraction(self):
+        force = np.zeros((self.n, 2))
+        if len(self.u) == 0:
+            return force
+        delta = self.xy[self.u] - self.xy[self.v]
+        dist = np.hypot(delta[:, 0], delta[:, 1])
+        pull = delta * (dist / self.k)[:, None]
+        for axis in (0, 1):
+            force[:, axis] -= np.bincount(self.u, weights=pull[:, axis], minlength=self.n)
+            force[:, axis] += np.bincount(self.v, weights=pull[:, axis], minlength=self.n)
+        return force
+
+    # Noyau 1/r (vecteur d / |d|²) en unités de cellules, nul pour les 3x3 cellules proches
+    # qui sont traitées exactement; stocké sous forme de transformée de Fourier
+    @staticmethod
+    def __unit_kernel(g):
+        offsets = np.arange(-(g - 1), g)
+        dx, dy = np.meshgrid(offsets, offsets, indexing='ij')
+        r2 = (dx * dx + dy * dy).astype(float)
+        far = np.maximum(np.abs(dx), np.abs(dy)) > 1
+        kx = np.where(far, dx / np.where(far, r2, 1), 0.0)
+        ky = np.where(far, dy / np.where(far, r2, 1), 0.0)
+        size = 3 * g
+        return np.fft.rfft2(kx, s=(size, size)), np.fft.rfft2(ky, s=(size, size))
+
+
+# Retouche locale (variante « grille » de Fruchterman–Reingold): la répulsion est limitée
+# aux noeuds à moins de 2k, les noeuds fixed ne bougent pas et chaque pas est borné par k,
+# ce qui range un voisinage sans déformer le reste du dessin. Après chaque pas, deux noeuds
+# ne restent jamais à moins de MIN_SEPARATION * k l'un de l'autre (un clic ne pourrait plus
+# en sélectionner qu'un). Renvoie les positions.
+MIN_SEPARATION = 0.05
+
+
+def relax(xy, u, v, fixed, k, iterations=15):
+    xy = np.array(xy, dtype=float).reshape(-1, 2)
+    n = len(xy)
+    u, v = np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64)
+    fixed = np.asarray(fixed, dtype=bool)
+    free = np.flatnonzero(~fixed)
+    k2 = k * k
+    for i in range(iterations):
+        # Seuls les noeuds libres reçoivent une force: paires (libre, voisin proche)
+        src, dst = _close_to(xy, free, 2 * k)
+        delta = _offsets(xy, src, dst, 1e-3 * k)
+        dist2 = np.einsum('ij,ij->i', delta, delta)
+        push = delta * (k2 / dist2)[:, None]
+        delta = xy[u] - xy[v]
+        pull = delta * (np.hypot(delta[:, 0], delta[:, 1]) / k)[:, None]
+        force = np.zeros((n, 2))
+        for axis in (0, 1):
+            force[:, axis] += np.bincount(src, weights=push[:, axis], minlength=n)
+            force[:, axis] -= np.bincount(u, weights=pull[:, axis], minlength=n)
+            force[:, axis] += np.bincount(v, weights=pull[:, axis], minlength=n)
+
+        force = force[free]
+        temperature = k * (1 - i / iterations)
+        length = np.maximum(np.hypot(force[:, 0], force[:, 1]), 1e-12)
+        xy[free] += force * (np.minimum(length, temperature) / length)[:, None]
+        _separate(xy, free, fixed, MIN_SEPARATION * k)
+    return xy
+
+
+# Écarts xy[src] - xy[dst]. Deux noeuds confondus (écart < eps) reçoivent un écart de
+# longueur eps dans une direction tirée de leurs indices, opposée pour la paire inverse:
+# la répulsion peut les séparer, toujours de la même façon (pas d'aléa)
+def _offsets(xy, src, dst, eps):
+    delta = xy[src] - xy[dst]
+    same = np.einsum('ij,ij->i', delta, delta) < eps * eps
+    if same.any():
+        a, b = src[same], dst[same]
+        angle = 2 * np.pi * (np.minimum(a, b) * 0.618034 + np.maximum(a, b) * 0.414214)
+        sign = np.where(a < b, eps, -eps)
+        delta[same] = np.column_stack([np.cos(angle), np.sin(angle)]) * sign[:, None]
+    return delta
+
+
+# Écarte jusqu'à min_dist les paires (libre, voisin) trop proches: chacun fait la moitié du
+# chemin, un noeud libre le fait en entier face à un noeud fixe
+def _separate(xy, free, fixed, min_dist):
+    src, dst = _close_to(xy, free, min_dist)
+    if len(src) == 0:
+        return
+    delta = _offsets(xy, src, dst, 1e-3 * min_dist)
+    dist = np.hypot(delta[:, 0], delta[:, 1])
+    share = np.where(fixed[dst], 1.0, 0.5)
+    shift = delta * (np.maximum(min_dist - dist, 0) * share / dist)[:, None]
+    for axis in (0, 1):
+        xy[:, axis] += np.bincount(src, weights=shift[:, axis], minlength=len(xy))
+
+
+# Paires (s, j), s parmi sources et j != s à distance <= radius, par cellules de taille radius
+def _close_to(xy, sources, radius):
+    cells = np.floor((xy - xy.min(axis=0)) / radius).astype(np.int64)
+    width = int(cells[:, 1].max()) + 3
+    keys = cells[:, 0] * width + cells[:, 1]
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    srcs, dsts = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            target = keys[sources] + (dx * width + dy)
+            lo = np.searchsorted(sorted_keys, target, side='left')
+            counts = np.searchsorted(sorted_keys, target, side='right') - lo
+            src = np.repeat(sources, counts)
+            dst = order[np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())]
+            delta = xy[src] - xy[dst]
+            keep = (src != dst) & (np.einsum('ij,ij->i', delta, delta) <= radius * radius)
+            srcs.append(src[keep])
+            dsts.append(dst[keep])
+    return np.concatenate(srcs), np.concatenate(dsts)
+
+
+def rescale(xy):
+    xy = np.asarray(xy, dtype=float)
+    if len(xy) == 0:
+        return xy.copy()
+    centered = xy - xy.mean(axis=0)
+    extent = np.abs(centered).max()
+    return centered / extent if extent > 0 else centered
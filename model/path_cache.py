@@ -0,0 +1,131 @@
+import heapq
+import itertools
+from collections import OrderedDict
+
+
+# Arbre de plus courts chemins depuis une source, construit à la demande: Dijkstra s'arrête
+# dès que la cible demandée est fixée et reprend là où il en était à la requête suivante.
+# neighbors(noeud) renvoie des couples (voisin, poids). checkpoint, propre à chaque requête
+# (l'arbre survit à la tâche qui l'a commencé), est appelé avant chaque sommet développé.
+class ShortestPathTree:
+    def __init__(self, source, neighbors):
+        self.source = source
+        self.dist = {source: 0}
+        self.pred = {source: None}
+        self.__neighbors = neighbors
+        self.__settled = set()
+        self.__counter = itertools.count()  # Départage sans comparer les noeuds
+        self.__heap = [(0, next(self.__counter), source)]
+
+    # Nombre de sommets fixés jusqu'ici (travail réellement effectué)
+    @property
+    def expanded(self):
+        return len(self.__settled)
+
+    @property
+    def complete(self):
+        return not self.__heap
+
+    # Poursuit Dijkstra jusqu'à fixer target (ou épuiser la composante). Si neighbors lève
+    # une exception (annulation), l'arbre reste cohérent et pourra reprendre plus tard.
+    def settle(self, target, checkpoint=None):
+        if target in self.__settled:
+            return True
+        heap, dist, pred, settled = self.__heap, self.dist, self.pred, self.__settled
+        while heap:
+            d, _, node = heap[0]
+            if node in settled:
+                heapq.heappop(heap)
+                continue
+            if checkpoint is not None:
+                checkpoint()
+            edges = list(self.__neighbors(node))
+            heapq.heappop(heap)
+            settled.add(node)
+            for neighbor, weight in edges:
+                nd = d + weight
+                if neighbor not in settled and nd < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = nd
+                    pred[neighbor] = node
+                    heapq.heappush(heap, (nd, next(self.__counter), neighbor))
+            if node == target:
+                return True
+        return False
+
+    def distance(self, target, checkpoint=None):
+        return self.dist[target] if self.settle(target, checkpoint) else None
+
+    # Chemin source -> target, [] si target est inaccessible
+    def path(self, target, checkpoint=None):
+        if not self.settle(target, checkpoint):
+            return []
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = self.pred[node]
+        return path[::-1]
+
+
+# Cache LRU d'arbres de plus courts chemins par source, valable pour une version du graphe:
+# toute modification du graphe (nouvelle version) vide le cache.
+class ShortestPathCache:
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.last_expanded = 0  # Sommets fixés par la dernière requête (0 si déjà en cache)
+        self.__version = None
+        self.__trees = OrderedDict()
+
+    def __len__(self):
+        return len(self.__trees)
+
+    def clear(self):
+        self.__trees.clear()
+
+    # Arbre depuis source pour cette version du graphe (créé si besoin)
+    def tree(self, version, source, neighbors):
+        found = self.lookup(version, source)
+        if found is not None:
+            self.hits += 1
+            return found
+        self.misses += 1
+        tree = ShortestPathTree(source, neighbors)
+        self.__trees[source] = tree
+        if len(self.__trees) > self.maxsize:
+            self.__trees.popitem(last=False)
+        return tree
+
+    def lookup(self, version, source):
+        if version != self.__version:
+            self.__trees.clear()
+            self.__version = version
+        found = self.__trees.get(source)
+        if found is not None:
+            self.__trees.move_to_end(source)
+        return found
+
+    # Chemin source -> target; le graphe étant non orienté, un arbre déjà calculé depuis
+    # target sert aussi pour la paire inversée
+    def path(self, version, source, target, neighbors, checkpoint=None):
+        tree, reverse = self.__tree_for(version, source, target, neighbors)
+        before = tree.expanded
+        path = tree.path(source if reverse else target, checkpoint)
+        self.last_expanded = tree.expanded - before
+        return path[::-1] if reverse else path
+
+    def distance(self, version, source, target, neighbors, checkpoint=None):
+        tree, reverse = self.__tree_for(version, source, target, neighbors)
+        before = tree.expanded
+        distance = tree.distance(source if reverse else target, checkpoint)
+        self.last_expanded = tree.expanded - before
+        return distance
+
+    def __tree_for(self, version, source, target, neighbors):
+        if self.lookup(version, source) is None:
+            found = self.lookup(version, target)
+            if found is not None:
+                self.hits += 1
+                return found, True
+        return self.tree(version, source, neighbors), False
@@ -0,0 +1,145 @@
+import heapq
+import itertools
+import math
+
+from model.path_cache import ShortestPathTree
+
+# Moteurs de plus court chemin, dans l'ordre du pathEngineComboBox
+ENGINES = ('dijkstra', 'bidirectional', 'astar')
+
+# A* garde l'heuristique euclidienne si poids / longueur ne descend nulle part sous cette
+# fraction de sa médiane; sinon la borne serait trop faible et on passe aux repères (ALT)
+EUCLIDEAN_MIN_RATIO = 0.5
+
+
+# Les fonctions renvoient (chemin, distance, sommets développés); chemin [] et distance
+# None si la cible est inaccessible. neighbors(noeud) donne des couples (voisin, poids).
+
+# Dijkstra depuis les deux extrémités à la fois; on s'arrête quand la somme des deux
+# frontières dépasse le meilleur chemin déjà rencontré
+def bidirectional_dijkstra(source, target, neighbors):
+    if source == target:
+        return [source], 0, 0
+    counter = itertools.count()
+    dist = ({source: 0}, {target: 0})
+    pred = ({source: None}, {target: None})
+    settled = (set(), set())
+    heaps = ([(0, next(counter), source)], [(0, next(counter), target)])
+    best, meeting = math.inf, None
+    expanded = 0
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, _, node = heapq.heappop(heaps[side])
+        if node in settled[side]:
+            continue
+        settled[side].add(node)
+        expanded += 1
+        other = 1 - side
+        for neighbor, weight in neighbors(node):
+            nd = d + weight
+            if neighbor not in settled[side] and nd < dist[side].get(neighbor, math.inf):
+                dist[side][neighbor] = nd
+                pred[side][neighbor] = node
+                heapq.heappush(heaps[side], (nd, next(counter), neighbor))
+            if neighbor in dist[other] and nd + dist[other][neighbor] < best:
+                best, meeting = nd + dist[other][neighbor], (node, neighbor, side)
+
+    if meeting is None:
+        return [], None, expanded
+    node, neighbor, side = meeting
+    # node est du côté `side`, neighbor est atteint depuis l'autre côté
+    forward_end, backward_start = (node, neighbor) if side == 0 else (neighbor, node)
+    path = []
+    step = forward_end
+    while step is not None:
+        path.append(step)
+        step = pred[0][step]
+    path.reverse()
+    step = backward_start
+    while step is not None:
+        path.append(step)
+        step = pred[1][step]
+    return path, best, expanded
+
+
+# A* avec une heuristique admissible heuristic(noeud) <= distance(noeud, target)
+def astar(source, target, neighbors, heuristic):
+    counter = itertools.count()
+    dist = {source: 0}
+    pred = {source: None}
+    settled = set()
+    heap = [(heuristic(source), next(counter), source)]
+    while heap:
+        _, _, node = heapq.heappop(heap)
+        if node in settled:
+            continue
+        settled.add(node)
+        if node == target:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = pred[node]
+            return path[::-1], dist[target], len(settled)
+        d = dist[node]
+        for neighbor, weight in neighbors(node):
+            nd = d + weight
+            if nd < dist.get(neighbor, math.inf):
+                dist[neighbor] = nd
+                pred[neighbor] = node
+                # Un noeud fixé peut être rouvert si l'heuristique n'est pas cohérente
+                settled.discard(neighbor)
+                heapq.heappush(heap, (nd + heuristic(neighbor), next(counter), neighbor))
+    return [], None, len(settled)
+
+
+# Heuristique euclidienne: scale * |pos(noeud) - pos(target)|, admissible dès que chaque
+# arête vérifie poids >= scale * longueur
+def euclidean_heuristic(pos, target, scale):
+    tx, ty = float(pos[target][0]), float(pos[target][1])
+
+    def heuristic(node):
+        p = pos[node]
+        return scale * math.hypot(float(p[0]) - tx, float(p[1]) - ty)
+    return heuristic
+
+
+# Repères (ALT: A*, Landmarks, inégalité Triangulaire). Les distances depuis quelques
+# repères éloignés les uns des autres donnent la borne |d(L, t) - d(L, v)| <= d(v, t),
+# valable quels que soient les poids. Calculées une fois par version du graphe.
+class Landmarks:
+    def __init__(self, nodes, neighbors, count=4):
+        self.distances = []
+        nodes = list(nodes)
+        if not nodes:
+            return
+        # Sélection « le plus loin possible »: chaque repère maximise sa distance minimale
+        # aux repères précédents (dans la composante du premier)
+        closest = {}
+        landmark = nodes[0]
+        for _ in range(count):
+            tree = ShortestPathTree(landmark, neighbors)
+            tree.settle(None)
+            self.distances.append(tree.dist)
+            for node, d in tree.dist.items():
+                closest[node] = min(closest.get(node, math.inf), d)
+            landmark = max(closest, key=closest.get)
+            if closest[landmark] == 0:
+                break
+
+    def __len__(self):
+        return len(self.distances)
+
+    def heuristic(self, target):
+        to_target = [(dist, dist[target]) for dist in self.distances if target in dist]
+
+        def heuristic(node):
+            bound = 0
+            for dist, dt in to_target:
+                dv = dist.get(node)
+                if dv is not None:
+                    bound = max(bound, abs(dt - dv))
+            return bound
+        return heuristic
@@ -0,0 +1,55 @@
+import threading
+
+
+# Signaux du modèle sans dépendance à Qt (même interface que pyqtSignal: connect,
+# disconnect, emit), pour que le modèle s'importe et tourne sans PyQt6 (mode batch).
+# L'émission appelle les fonctions connectées tout de suite, dans le thread qui émet:
+# comme une connexion directe Qt. Le modèle n'émet que depuis le thread GUI; un objet Qt
+# connecté reçoit donc ses appels dans son propre thread.
+class Signal:
+    def __init__(self, *types):
+        self.types = types
+        self.__name = None
+
+    def __set_name__(self, owner, name):
+        self.__name = f"_signal_{name}"
+
+    # Un BoundSignal par instance, créé au premier accès
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        bound = instance.__dict__.get(self.__name)
+        if bound is None:
+            bound = instance.__dict__.setdefault(self.__name, BoundSignal())
+        return bound
+
+
+class BoundSignal:
+    __slots__ = ('__slots', '__lock')
+
+    def __init__(self):
+        self.__slots = []
+        self.__lock = threading.Lock()
+
+    def connect(self, slot):
+        with self.__lock:
+            self.__slots = self.__slots + [slot]
+
+    # Sans argument, déconnecte tout; sinon la première connexion de slot
+    def disconnect(self, slot=None):
+        with self.__lock:
+            if slot is None:
+                self.__slots = []
+                return
+            slots = list(self.__slots)
+            try:
+                slots.remove(slot)
+            except ValueError:
+                raise TypeError(f"{slot!r} n'est pas connecté") from None
+            self.__slots = slots
+
+    # La liste est remplacée (jamais modifiée) à chaque connexion: un slot peut connecter
+    # ou déconnecter pendant l'émission sans perturber la boucle
+    def emit(self, *args):
+        for slot in self.__slots:
+            slot(*args)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from model.compact_graph import CompactGraph
+
+
+# Vue figée du graphe à une version donnée, remise aux workers: le thread GUI peut continuer
+# à modifier le modèle pendant qu'ils calculent sur cet instantané. On ne le modifie pas.
+class GraphSnapshot:
+    __slots__ = ('version', 'graphe', 'pos', '__weakref__')
+
+    def __init__(self, version, graphe, pos):
+        self.version = version
+        self.graphe = graphe
+        self.pos = pos
+
+    def has_node(self, node):
+        return node in self.graphe
+
+    def nodes(self):
+        return self.graphe.nodes()
+
+    def number_of_nodes(self):
+        return self.graphe.number_of_nodes()
+
+    # Voisins d'un noeud avec le poids de l'arête (algorithmes de chemins)
+    def weighted_neighbors(self, node):
+        if isinstance(self.graphe, CompactGraph):
+            return self.graphe.weighted_neighbors(node)
+        return ((neighbor, data.get('weight', 1)) for neighbor, data in self.graphe.adj[node].items())
+
+    # Identifiants des sommets (tableau) et arêtes en rangs (u, v) dans cet ordre
+    def rank_arrays(self):
+        if isinstance(self.graphe, CompactGraph):
+            ids, _, u, v = self.graphe.layout_arrays()
+            return ids, u, v
+        ids = list(self.graphe.nodes())
+        rank = {node: i for i, node in enumerate(ids)}
+        edges = np.array([(rank[a], rank[b]) for a, b in self.graphe.edges()], dtype=np.int64).reshape(-1, 2)
+        return np.array(ids, dtype=np.int64), edges[:, 0], edges[:, 1]
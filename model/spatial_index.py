@@ -0,0 +1,424 @@
+import math
+
+import numpy as np
+
+
+# Index spatial des noeuds sur une grille uniforme.
+# Chaque cellule contient les noeuds dont la position y tombe: une recherche par rayon
+# ne regarde que les quelques cellules qui recouvrent le disque de recherche.
+class GridIndex:
+    __default_cell_size = 0.1
+    __min_cell_size = 0.005
+
+    def __init__(self, cell_size=None):
+        self._cell_size = cell_size if cell_size is not None else self.__default_cell_size
+        self._cells = {}
+        self._node_cell = {}
+        self._node_pos = {}
+        self._bounds = None
+
+    def __len__(self):
+        return len(self._node_pos)
+
+    def __contains__(self, node):
+        return node in self._node_pos
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    # Boîte (x0, y0, x1, y1) qui contient tous les noeuds (None si vide): étendue par les
+    # insertions et les déplacements, jamais réduite avant la prochaine reconstruction
+    @property
+    def bounds(self):
+        return self._bounds
+
+    def _cell_of(self, x, y):
+        return math.floor(x / self._cell_size), math.floor(y / self._cell_size)
+
+    # Reconstruit l'index au complet; la taille des cellules suit la densité des noeuds
+    def rebuild(self, pos):
+        self.clear()
+        if len(pos) > 0:
+            xs = [float(p[0]) for p in pos.values()]
+            ys = [float(p[1]) for p in pos.values()]
+            area = max(max(xs) - min(xs), 1e-9) * max(max(ys) - min(ys), 1e-9)
+            self._cell_size = min(self.__default_cell_size,
+                                  max(self.__min_cell_size, 2 * math.sqrt(area / len(pos))))
+        for node, position in pos.items():
+            self.insert(node, position)
+
+    def clear(self):
+        self._cells = {}
+        self._node_cell = {}
+        self._node_pos = {}
+        self._bounds = None
+
+    def insert(self, node, position):
+        x, y = float(position[0]), float(position[1])
+        self.__extend(x, y)
+        cell = self._cell_of(x, y)
+        self._cells.setdefault(cell, {})[node] = None
+        self._node_cell[node] = cell
+        self._node_pos[node] = (x, y)
+
+    def remove(self, node):
+        cell = self._node_cell.pop(node, None)
+        if cell is None:
+            return
+        del self._node_pos[node]
+        bucket = self._cells[cell]
+        del bucket[node]
+        if not bucket:
+            del self._cells[cell]
+
+    def move(self, node, position):
+        x, y = float(position[0]), float(position[1])
+        self.__extend(x, y)
+        cell = self._cell_of(x, y)
+        if self._node_cell.get(node) != cell:
+            self.remove(node)
+            self.insert(node, (x, y))
+        else:
+            self._node_pos[node] = (x, y)
+
+    def __extend(self, x, y):
+        if self._bounds is None:
+            self._bounds = (x, y, x, y)
+        else:
+            x0, y0, x1, y1 = self._bounds
+            if not (x0 <= x <= x1 and y0 <= y <= y1):
+                self._bounds = (min(x0, x), min(y0, y), max(x1, x), max(y1, y))
+
+    # Noeud le plus proche à une distance strictement inférieure au rayon (None sinon)
+    def nearest(self, position, radius):
+        x, y = float(position[0]), float(position[1])
+        cx_min, cy_min = self._cell_of(x - radius, y - radius)
+        cx_max, cy_max = self._cell_of(x + radius, y + radius)
+        # Rayon plus grand que la zone occupée: on parcourt les cellules remplies
+        if (cx_max - cx_min + 1) * (cy_max - cy_min + 1) > len(self._cells):
+            cells = [cell for cell in self._cells
+                     if cx_min <= cell[0] <= cx_max and cy_min <= cell[1] <= cy_max]
+        else:
+            cells = [(cx, cy) for cx in range(cx_min, cx_max + 1) for cy in range(cy_min, cy_max + 1)]
+
+        closest_node = None
+        min_distance = radius
+        for cell in cells:
+            for node in self._cells.get(cell, ()):
+                node_x, node_y = self._node_pos[node]
+                distance = math.hypot(node_x - x, node_y - y)
+                if distance < min_distance:
+                    min_distance = distance
+                    closest_node = node
+        return closest_node
+
+    # Noeuds dont la position tombe dans le rectangle [x0, x1] × [y0, y1]
+    def query_rect(self, x0, y0, x1, y1):
+        cx_min, cy_min = self._cell_of(x0, y0)
+        cx_max, cy_max = self._cell_of(x1, y1)
+        # Rectangle plus grand que la zone occupée: on parcourt les cellules remplies
+        if (cx_max - cx_min + 1) * (cy_max - cy_min + 1) > len(self._cells):
+            cells = [cell for cell in self._cells
+                     if cx_min <= cell[0] <= cx_max and cy_min <= cell[1] <= cy_max]
+        else:
+            cells = [(cx, cy) for cx in range(cx_min, cx_max + 1) for cy in range(cy_min, cy_max + 1)]
+
+        found = []
+        for cell in cells:
+            for node in self._cells.get(cell, ()):
+                node_x, node_y = self._node_pos[node]
+                if x0 <= node_x <= x1 and y0 <= node_y <= y1:
+                    found.append(node)
+        return found
+
+
+# Index des arêtes pour la sélection au clic.
+# Les extrémités sont rangées dans des tableaux contigus (un segment par case) et chaque
+# segment est inscrit dans les cellules d'une grille que couvre sa boîte englobante.
+# Un clic ne teste que les segments des cellules voisines, en une seule passe vectorisée.
+class SegmentIndex:
+    __default_cell_size = 0.1
+    __max_cells_per_segment = 16
+
+    def __init__(self, cell_size=None):
+        self._cell_size = cell_size if cell_size is not None else self.__default_cell_size
+        self.clear()
+
+    def __len__(self):
+        return len(self._slot)
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    def clear(self):
+        self._p0 = np.empty((0, 2))
+        self._p1 = np.empty((0, 2))
+        self._alive = np.empty(0, dtype=bool)
+        self._size = 0
+        self._edges = []
+        self._slot = {}
+        self._node_slots = {}
+        self._node_rank = {}
+        self._next_rank = 0
+        self._cells = {}
+        self._large = set()
+        self._stale = 0
+        self._entries = 0
+        self._dead = 0  # Cases d'arêtes supprimées, récupérées par __compact
+
+    def _cell_range(self, x_min, y_min, x_max, y_max):
+        c = self._cell_size
+        return math.floor(x_min / c), math.floor(y_min / c), math.floor(x_max / c), math.floor(y_max / c)
+
+    # Reconstruit l'index dans l'ordre de graphe.edges() (même ordre de parcours qu'avant)
+    def rebuild(self, graphe, pos):
+        self.clear()
+        nodes = list(graphe.nodes())
+        self._node_rank = dict(zip(nodes, range(len(nodes))))
+        self._next_rank = len(nodes)
+
+        if hasattr(graphe, 'edge_endpoints'):
+            # Stockage compact: extrémités et positions lues directement dans les tableaux
+            u, v, p0, p1 = graphe.edge_endpoints()
+        else:
+            edges = list(graphe.edges())
+            u = np.array([a for a, _ in edges], dtype=np.int64)
+            v = np.array([b for _, b in edges], dtype=np.int64)
+            p0 = np.array([pos[a] for a, _ in edges], dtype=float).reshape(-1, 2)
+            p1 = np.array([pos[b] for _, b in edges], dtype=float).reshape(-1, 2)
+
+        m = len(u)
+        if m == 0:
+            self._cell_size = self.__default_cell_size
+            return
+        extent = np.maximum(np.abs(p1 - p0).max(axis=1), 1e-9)
+        self._cell_size = float(np.clip(np.median(extent), 0.02, 0.5))
+
+        self.__reserve(m)
+        self._size = m
+        self._p0[:m] = p0
+        self._p1[:m] = p1
+        self._alive[:m] = True
+        u_list, v_list = u.tolist(), v.tolist()
+        self._edges = list(zip(u_list, v_list))
+        self._slot = dict(zip(zip(v_list, u_list), range(m)))
+        self._slot.update(zip(self._edges, range(m)))
+
+        # Cases incidentes à chaque noeud, regroupées par tri
+        ends = np.concatenate([u, v])
+        slots = np.tile(np.arange(m), 2)
+        order = np.argsort(ends, kind='stable')
+        keys, starts = np.unique(ends[order], return_index=True)
+        self._node_slots = {node: set(group.tolist())
+                            for node, group in zip(keys.tolist(), np.split(slots[order], starts[1:]))}
+
+        self.__bucket_all(np.arange(m))
+
+    # Rang d'insertion d'un noeud: donne l'orientation des arêtes de graphe.edges()
+    def add_node(self, node):
+        self._node_rank[node] = self._next_rank
+        self._next_rank += 1
+
+    def remove_node(self, node):
+        # Extrémités lues d'abord: une suppression peut renuméroter les cases (__compact)
+        for u, v in [self._edges[s] for s in self._node_slots.get(node, ())]:
+            self.remove_edge(u, v)
+        self._node_slots.pop(node, None)
+        self._node_rank.pop(node, None)
+
+    def add_edge(self, u, v, pos_u, pos_v):
+        if (u, v) in self._slot:
+            return
+        if self._node_rank.get(v, -1) < self._node_rank.get(u, -1):
+            u, v, pos_u, pos_v = v, u, pos_v, pos_u
+        self.__reserve(self._size + 1)
+        s = self.__append(u, v)
+        self._p0[s] = pos_u
+        self._p1[s] = pos_v
+        self.__bucket(s)
+
+    def remove_edge(self, u, v):
+        s = self._slot.pop((u, v), None)
+        if s is None:
+            return
+        self._slot.pop((v, u), None)
+        self._alive[s] = False
+        self._node_slots[u].discard(s)
+        self._node_slots[v].discard(s)
+        self._large.discard(s)
+        self._dead += 1
+        if self._dead > max(1024, self._size // 2):
+            self.__compact()
+
+    # Met à jour les segments incidents sur place et les inscrit dans leurs nouvelles cellules
+    def move_node(self, node, position):
+        for s in self._node_slots.get(node, ()):
+            u, _ = self._edges[s]
+            if u == node:
+                self._p0[s] = position
+            else:
+                self._p1[s] = position
+            self._stale += 1
+            self.__bucket(s)
+
+        # Les anciennes inscriptions sont filtrées par la distance exacte; on nettoie
+        # la grille quand elles deviennent trop nombreuses
+        if self._stale > max(1024, self._entries // 2):
+            self.__rebucket()
+
+    # Arête la plus proche à une distance strictement inférieure au rayon (None sinon)
+    def nearest(self, position, radius):
+        if not self._slot:
+            return None
+
+        x, y = float(position[0]), float(position[1])
+        cx_min, cy_min, cx_max, cy_max = self._cell_range(x - radius, y - radius, x + radius, y + radius)
+        candidates = list(self._large)
+        # Rayon plus grand que la zone occupée: on parcourt les cellules remplies
+        if (cx_max - cx_min + 1) * (cy_max - cy_min + 1) > len(self._cells):
+            for (cx, cy), slots in self._cells.items():
+                if cx_min <= cx <= cx_max and cy_min <= cy <= cy_max:
+                    candidates.extend(slots)
+        else:
+            for cx in range(cx_min, cx_max + 1):
+                for cy in range(cy_min, cy_max + 1):
+                    candidates.extend(self._cells.get((cx, cy), ()))
+        if not candidates:
+            return None
+
+        slots = np.unique(np.array(candidates, dtype=np.intp))
+        slots = slots[self._alive[slots]]
+        if len(slots) == 0:
+            return None
+
+        # Projection orthogonale du point sur chaque segment candidat (t borné à [0, 1])
+        point = np.array([x, y])
+        p0 = self._p0[slots]
+        seg_vec = self._p1[slots] - p0
+        seg_length_sq = np.einsum('ij,ij->i', seg_vec, seg_vec)
+        t = np.einsum('ij,ij->i', point - p0, seg_vec) / np.where(seg_length_sq == 0, 1, seg_length_sq)
+        t = np.clip(t, 0, 1)
+        distances = np.hypot(*(point - (p0 + t[:, None] * seg_vec)).T)
+
+        within = distances < radius
+        if not within.any():
+            return None
+        # À distance égale, la première arête dans l'ordre de graphe.edges() l'emporte
+        slots, distances = slots[within], distances[within]
+        best = np.flatnonzero(distances <= distances.min() + 1e-12)
+        ranks = [self._node_rank.get(self._edges[s][0], 0) for s in slots[best]]
+        return self._edges[slots[best[int(np.argmin(ranks))]]]
+
+    # Arêtes (tableau K×2 des extrémités) dont la boîte englobante recoupe le rectangle
+    def query_rect(self, x0, y0, x1, y1):
+        cx_min, cy_min, cx_max, cy_max = self._cell_range(x0, y0, x1, y1)
+        candidates = list(self._large)
+        if (cx_max - cx_min + 1) * (cy_max - cy_min + 1) > len(self._cells):
+            for (cx, cy), slots in self._cells.items():
+                if cx_min <= cx <= cx_max and cy_min <= cy <= cy_max:
+                    candidates.extend(slots)
+        else:
+            for cx in range(cx_min, cx_max + 1):
+                for cy in range(cy_min, cy_max + 1):
+                    candidates.extend(self._cells.get((cx, cy), ()))
+        if not candidates:
+            return np.empty((0, 2), dtype=np.int64)
+
+        slots = np.unique(np.array(candidates, dtype=np.intp))
+        slots = slots[self._alive[slots]]
+        p0, p1 = self._p0[slots], self._p1[slots]
+        lo, hi = np.minimum(p0, p1), np.maximum(p0, p1)
+        overlap = (lo[:, 0] <= x1) & (hi[:, 0] >= x0) & (lo[:, 1] <= y1) & (hi[:, 1] >= y0)
+        return np.array([self._edges[s] for s in slots[overlap].tolist()]).reshape(-1, 2)
+
+    def __reserve(self, capacity):
+        if capacity <= len(self._alive):
+            return
+        capacity = max(capacity, 2 * len(self._alive), 16)
+        grow = capacity - len(self._alive)
+        self._p0 = np.concatenate([self._p0, np.zeros((grow, 2))])
+        self._p1 = np.concatenate([self._p1, np.zeros((grow, 2))])
+        self._alive = np.concatenate([self._alive, np.zeros(grow, dtype=bool)])
+
+    def __append(self, u, v):
+        s = self._size
+        self._size += 1
+        self._edges.append((u, v))
+        self._alive[s] = True
+        self._slot[(u, v)] = s
+        self._slot[(v, u)] = s
+        self._node_slots.setdefault(u, set()).add(s)
+        self._node_slots.setdefault(v, set()).add(s)
+        return s
+
+    # Inscrit un segment dans les cellules de sa boîte englobante (ou dans la liste
+    # des grands segments s'il en couvre trop)
+    def __bucket(self, s):
+        (x0, y0), (x1, y1) = self._p0[s], self._p1[s]
+        cx_min, cy_min, cx_max, cy_max = self._cell_range(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+        cells = (cx_max - cx_min + 1) * (cy_max - cy_min + 1)
+        if cells > self.__max_cells_per_segment:
+            self._large.add(s)
+            return
+        self._large.discard(s)
+        for cx in range(cx_min, cx_max + 1):
+            for cy in range(cy_min, cy_max + 1):
+                self._cells.setdefault((cx, cy), []).append(s)
+        self._entries += cells
+
+    # Inscription vectorisée d'un lot de segments: chaque segment est répété sur les
+    # cellules de sa boîte englobante puis les paires (cellule, segment) sont groupées
+    def __bucket_all(self, slots):
+        c = self._cell_size
+        p0, p1 = self._p0[slots], self._p1[slots]
+        lo = np.floor(np.minimum(p0, p1) / c).astype(np.int64)
+        hi = np.floor(np.maximum(p0, p1) / c).astype(np.int64)
+        span = hi - lo + 1
+        cells = span[:, 0] * span[:, 1]
+
+        large = cells > self.__max_cells_per_segment
+        self._large.update(slots[large].tolist())
+        slots, lo, span, cells = slots[~large], lo[~large], span[~large], cells[~large]
+        if len(slots) == 0:
+            return
+
+        total = int(cells.sum())
+        local = np.arange(total) - np.repeat(np.cumsum(cells) - cells, cells)
+        height = np.repeat(span[:, 1], cells)
+        cx = np.repeat(lo[:, 0], cells) + local // height
+        cy = np.repeat(lo[:, 1], cells) + local % height
+        owners = np.repeat(slots, cells)
+
+        order = np.lexsort((owners, cy, cx))
+        cx, cy, owners = cx[order], cy[order], owners[order]
+        boundaries = np.flatnonzero((np.diff(cx) != 0) | (np.diff(cy) != 0)) + 1
+        starts = np.concatenate([[0], boundaries])
+        for key, group in zip(zip(cx[starts].tolist(), cy[starts].tolist()), np.split(owners, boundaries)):
+            self._cells.setdefault(key, []).extend(group.tolist())
+        self._entries += total
+
+    # Renumérote les segments vivants (cases mortes et leurs inscriptions abandonnées)
+    def __compact(self):
+        keep = np.flatnonzero(self._alive[:self._size])
+        self._p0, self._p1 = self._p0[keep], self._p1[keep]
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._size = len(keep)
+        self._edges = [self._edges[s] for s in keep.tolist()]
+        self._slot = {}
+        self._node_slots = {}
+        for s, (u, v) in enumerate(self._edges):
+            self._slot[(u, v)] = s
+            self._slot[(v, u)] = s
+            self._node_slots.setdefault(u, set()).add(s)
+            self._node_slots.setdefault(v, set()).add(s)
+        self._dead = 0
+        self.__rebucket()
+
+    def __rebucket(self):
+        self._cells = {}
+        self._large = set()
+        self._entries = 0
+        self._stale = 0
+        self.__bucket_all(np.flatnonzero(self._alive[:self._size]))
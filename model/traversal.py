@@ -0,0 +1,114 @@
+import heapq
+import itertools
+from collections import deque
+
+import numpy as np
+
+# Parcours disponibles, dans l'ordre du traversalComboBox
+TRAVERSALS = ('bfs', 'dfs', 'dijkstra')
+
+
+# Chronologie d'un parcours calculée en une passe: ordre de visite, parent de chaque sommet
+# (lui-même pour une racine) et niveau (profondeur, ou distance pour Dijkstra). La lecture
+# n'est qu'un curseur sur ces tableaux: « visité » veut dire rang < position.
+class Timeline:
+    __slots__ = ('kind', 'order', 'parents', 'levels', '__rank', '__sorter')
+
+    def __init__(self, kind, order, parents, levels):
+        self.kind = kind
+        self.order = np.asarray(order)
+        self.parents = np.asarray(parents)
+        self.levels = np.asarray(levels, dtype=float)
+        self.__rank = None
+        self.__sorter = None
+
+    def __len__(self):
+        return len(self.order)
+
+    # Rang de visite de node (len(self) s'il n'est pas dans le parcours)
+    def rank(self, node):
+        if self.__rank is None:
+            self.__rank = {node: i for i, node in enumerate(self.order.tolist())}
+        return self.__rank.get(node, len(self.order))
+
+    def visited(self, node, position):
+        return self.rank(node) < position
+
+    # Rangs d'un tableau de sommets (len(self) pour les absents), par recherche dichotomique
+    # dans l'ordre trié: un seul passage vectorisé au lieu d'un test par sommet
+    def ranks(self, nodes):
+        nodes = np.asarray(nodes)
+        if len(self.order) == 0 or len(nodes) == 0:
+            return np.full(len(nodes), len(self.order), dtype=np.int64)
+        if self.__sorter is None:
+            self.__sorter = np.argsort(self.order, kind='stable')
+        ordered = self.order[self.__sorter]
+        i = np.minimum(np.searchsorted(ordered, nodes), len(ordered) - 1)
+        return np.where(ordered[i] == nodes, self.__sorter[i], len(self.order))
+
+    def visited_mask(self, nodes, position):
+        return self.ranks(nodes) < position
+
+
+# Parcours depuis source, puis depuis le premier sommet non visité de chaque autre
+# composante (dans l'ordre de nodes). neighbors(noeud) renvoie des couples (voisin, poids).
+def traverse(kind, source, nodes, neighbors):
+    if kind not in TRAVERSALS:
+        raise ValueError(f"Parcours inconnu: {kind}")
+    visit = {'bfs': _bfs, 'dfs': _dfs, 'dijkstra': _dijkstra}[kind]
+    order, parents, levels = [], [], []
+    seen = set()
+    for root in itertools.chain((source,), nodes):
+        if root not in seen:
+            visit(root, neighbors, seen, order, parents, levels)
+    return Timeline(kind, order, parents, levels)
+
+
+def _bfs(root, neighbors, seen, order, parents, levels):
+    seen.add(root)
+    queue = deque([(root, root, 0)])
+    while queue:
+        node, parent, depth = queue.popleft()
+        order.append(node)
+        parents.append(parent)
+        levels.append(depth)
+        for neighbor, _ in neighbors(node):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append((neighbor, node, depth + 1))
+
+
+# Parcours en profondeur préfixe: les voisins sont empilés à l'envers pour être visités dans
+# l'ordre de la liste d'adjacence, comme la version récursive
+def _dfs(root, neighbors, seen, order, parents, levels):
+    stack = [(root, root, 0)]
+    while stack:
+        node, parent, depth = stack.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        order.append(node)
+        parents.append(parent)
+        levels.append(depth)
+        stack.extend((neighbor, node, depth + 1)
+                     for neighbor, _ in reversed(list(neighbors(node))) if neighbor not in seen)
+
+
+# Sommets dans l'ordre où Dijkstra les fixe (distance croissante depuis la racine)
+def _dijkstra(root, neighbors, seen, order, parents, levels):
+    counter = itertools.count()
+    dist = {root: 0}
+    heap = [(0, next(counter), root, root)]
+    while heap:
+        d, _, node, parent = heapq.heappop(heap)
+        if node in seen:
+            continue
+        seen.add(node)
+        order.append(node)
+        parents.append(parent)
+        levels.append(d)
+        for neighbor, weight in neighbors(node):
+            nd = d + weight
+            if neighbor not in seen and nd < dist.get(neighbor, float('inf')):
+                dist[neighbor] = nd
+                heapq.heappush(heap, (nd, next(counter), neighbor, node))
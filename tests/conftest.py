@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Les paquets du dépôt (model, view, controller) sont importés depuis la racine, comme
+# quand on lance main.py ou graphe.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
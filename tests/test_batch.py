@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+
+import graphe
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def write_edges(tmp_path):
+    path = tmp_path / 'edges.csv'
+    path.write_text("u,v,w\n0,1,1\n1,2,2\n2,3,1\n0,3,5\n3,4,1\n5,6,1\n")
+    return path
+
+
+# Vraie ligne de commande, sans Qt ni matplotlib importés: résumé JSON sur la sortie standard
+def test_command_line_json(tmp_path):
+    edges = write_edges(tmp_path)
+    code = ("import sys, graphe; status = graphe.main(sys.argv[1:]); "
+            "assert not {'PyQt6', 'matplotlib'} & set(sys.modules), 'interface importée'; sys.exit(status)")
+    result = subprocess.run([sys.executable, '-c', code, 'batch', '--import', str(edges), '--seed', '3',
+                             '--path', '0', '4', '--path', '0', '6', '--traversal', 'bfs', '0'],
+                            cwd=ROOT, capture_output=True, text=True, env={**os.environ, 'PYTHONPATH': str(ROOT)})
+    assert result.returncode == 0, result.stderr
+    results = json.loads(result.stdout)
+    assert results['graph']['nodes'] == 7 and results['graph']['edges'] == 6 and results['graph']['seed'] == 3
+    first, second = results['paths']
+    assert first['path'] == [0, 1, 2, 3, 4] and first['distance'] == 5
+    assert second['path'] == [] and second['distance'] is None
+    (bfs,) = results['traversals']
+    assert bfs['order'][0] == 0 and sorted(bfs['order']) == list(range(7))
+    assert dict(zip(bfs['order'], bfs['levels']))[4] == 2
+
+
+# Génération, disposition, enregistrement puis rechargement du même graphe; résultats .npz
+def test_generate_save_load_npz(tmp_path):
+    saved, output = tmp_path / 'g.graphe', tmp_path / 'r.npz'
+    assert graphe.main(['batch', '--generate', 'gnp', '--order', '80', '--proba', '0.08', '--seed', '4',
+                        '--layout', '5', '--save', str(saved), '-o', str(tmp_path / 'a.json')]) == 0
+    generated = json.loads((tmp_path / 'a.json').read_text())
+    assert generated['layout']['iterations'] == 5 and saved.exists()
+
+    assert graphe.main(['batch', '--load', str(saved), '--engine', 'astar', '--path', '0', '40',
+                        '--traversal', 'dijkstra', '0', '-o', str(output)]) == 0
+    with np.load(output) as data:
+        summary = json.loads(str(data['summary']))
+        path, order = data['paths/0'], data['traversals/0/order']
+        levels = data['traversals/0/levels']
+    assert summary['graph']['nodes'] == 80 and summary['graph']['edges'] == generated['graph']['edges']
+    assert summary['graph']['seed'] == 4 and summary['paths'][0]['engine'] == 'astar'
+
+    from model.graph_file import load_graph
+    reference, _ = load_graph(saved)
+    reference = reference.to_networkx()[0]
+    if nx.has_path(reference, 0, 40):
+        assert path[0] == 0 and path[-1] == 40
+        assert summary['paths'][0]['distance'] == nx.dijkstra_path_length(reference, 0, 40)
+    distances = nx.single_source_dijkstra_path_length(reference, 0)
+    assert all(level == distances[node] for node, level in zip(order.tolist(), levels.tolist()) if node in distances)
+
+
+def test_errors_are_reported(tmp_path, capsys):
+    edges = write_edges(tmp_path)
+    assert graphe.main(['batch', '--import', str(edges), '--traversal', 'largeur', '0']) == 1
+    assert graphe.main(['batch', '--import', str(edges), '--traversal', 'bfs', '99']) == 1
+    assert graphe.main(['batch', '--load', str(tmp_path / 'absent.graphe')]) == 1
+    assert capsys.readouterr().err.count('Erreur') == 3
@@ -0,0 +1,71 @@
+import random
+
+import networkx as nx
+
+from model.compact_graph import CompactGraph
+
+
+def reference_graph(order, proba, seed):
+    graphe = nx.gnp_random_graph(order, proba, seed=seed)
+    rnd = random.Random(seed)
+    for u, v in graphe.edges():
+        graphe[u][v]['weight'] = rnd.randint(1, 9)
+    return graphe
+
+
+def assert_same_graph(graph, ref):
+    assert sorted(graph.nodes()) == sorted(ref.nodes())
+    assert graph.number_of_nodes() == ref.number_of_nodes()
+    assert graph.number_of_edges() == ref.number_of_edges()
+    edges = {frozenset(edge): graph.weight(*edge) for edge in graph.edges()}
+    assert edges == {frozenset((u, v)): w for u, v, w in ref.edges(data='weight')}
+    for node in ref:
+        expected = sorted((neighbor, data['weight']) for neighbor, data in ref.adj[node].items())
+        assert sorted(graph.weighted_neighbors(node)) == expected
+
+
+# Ajouts et suppressions aléatoires (y compris d'arêtes déjà supprimées puis réactivées),
+# comparés à networkx; les instantanés restent figés et la compaction ne change rien
+def test_random_edits_match_networkx():
+    rnd = random.Random(3)
+    ref = reference_graph(60, 0.08, seed=3)
+    graph = CompactGraph.from_networkx(ref, {node: (rnd.random(), rnd.random()) for node in ref})
+    snapshots = []
+    for step in range(3000):
+        nodes = list(ref.nodes())
+        op = rnd.random()
+        if op < 0.35:
+            u, v = rnd.sample(nodes, 2)
+            weight = rnd.randint(1, 9)
+            graph.add_edge(u, v, weight)
+            ref.add_edge(u, v, weight=weight)
+        elif op < 0.6 and ref.number_of_edges():
+            u, v = rnd.choice(list(ref.edges()))
+            graph.remove_edge(u, v)
+            ref.remove_edge(u, v)
+        elif op < 0.75 and ref.number_of_edges():
+            u, v = rnd.choice(list(ref.edges()))
+            weight = rnd.randint(1, 9)
+            graph.set_weight(u, v, weight)
+            ref[u][v]['weight'] = weight
+        elif op < 0.85 or len(nodes) < 10:
+            node = max(nodes) + 1 if rnd.random() < 0.5 else rnd.randrange(200)
+            graph.add_node(node)
+            ref.add_node(node)
+        else:
+            node = rnd.choice(nodes)
+            graph.remove_node(node)
+            ref.remove_node(node)
+
+        if step % 250 == 0:
+            snapshots.append((graph.snapshot(), ref.copy()))
+        if step % 700 == 0:
+            graph.compact()
+        if step % 100 == 0:
+            assert_same_graph(graph, ref)
+
+    assert_same_graph(graph, ref)
+    for snapshot, frozen in snapshots:
+        assert_same_graph(snapshot, frozen)
+    graph.compact()
+    assert_same_graph(graph, ref)
@@ -0,0 +1,73 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from model.compact_graph import CompactGraph
+from model.connectivity import ConnectivityIndex
+from model.graphe_model import GrapheModel
+
+
+def assert_same_components(labels_of, connected, count, graphe):
+    nodes = list(graphe.nodes())
+    labels = labels_of(nodes)
+    expected = {node: k for k, component in enumerate(nx.connected_components(graphe)) for node in component}
+    # Même partition: deux sommets ont la même étiquette ssi ils sont dans la même composante
+    pairs = {}
+    for node, label in zip(nodes, labels.tolist()):
+        assert pairs.setdefault(label, expected[node]) == expected[node]
+    assert len(pairs) == count() == nx.number_connected_components(graphe)
+    for u, v in zip(nodes[::7], nodes[3::7]):
+        assert connected(u, v) == (expected[u] == expected[v])
+
+
+# Index construit d'un bloc puis tenu à jour par ajouts de sommets et d'arêtes
+def test_index_matches_networkx_after_additions():
+    rnd = random.Random(2)
+    graphe = nx.gnp_random_graph(200, 0.004, seed=2)
+    index = ConnectivityIndex()
+    ids = list(graphe.nodes())
+    rank = {node: i for i, node in enumerate(ids)}
+    edges = np.array([(rank[u], rank[v]) for u, v in graphe.edges()], dtype=np.int64).reshape(-1, 2)
+    index.rebuild(ids, edges[:, 0], edges[:, 1])
+    for step in range(400):
+        if rnd.random() < 0.2:
+            node = 1000 + step
+            graphe.add_node(node)
+            index.add_node(node)
+        else:
+            u, v = rnd.sample(list(graphe.nodes()), 2)
+            graphe.add_edge(u, v)
+            index.add_edge(u, v)
+        if step % 40 == 0:
+            assert_same_components(index.components, index.connected, lambda: index.count, graphe)
+    assert index.component(-1) is None and index.size(-1) == 0
+
+
+# Composantes lues par le modèle après des suppressions (index recalculé) mêlées d'ajouts
+# (index mis à jour), sur les deux stockages
+@pytest.mark.parametrize('backend', ['networkx', 'compact'])
+def test_model_components_after_deletions(backend):
+    rnd = random.Random(6)
+    model = GrapheModel(backend)
+    model.local_layout = False
+    model.generator = 'gnp'
+    model.default_graphe_order = 150
+    model.proba = 0.02
+    model.generate_graph(6)
+    for step in range(300):
+        nodes = list(model.graphe.nodes())
+        op = rnd.random()
+        if op < 0.4 and model.graphe.number_of_edges():
+            model.delete_edge(rnd.choice(list(model.graphe.edges())))
+        elif op < 0.5 and len(nodes) > 20:
+            model.delete_node(rnd.choice(nodes))
+        elif op < 0.9:
+            model.add_edge(*rnd.sample(nodes, 2))
+        else:
+            model.add_node((rnd.random(), rnd.random()))
+        if step % 10 == 0:
+            graphe = model.graphe
+            graphe = graphe.to_networkx()[0] if isinstance(graphe, CompactGraph) else graphe
+            assert_same_components(model.component_labels, model.connected, model.component_count, graphe)
@@ -0,0 +1,112 @@
+import random
+
+import networkx as nx
+import pytest
+
+from model.compact_graph import CompactGraph
+from model.dynamic_path import DynamicShortestPathTree
+from model.graphe_model import GrapheModel
+
+
+def generate(backend, seed):
+    model = GrapheModel(backend)
+    model.local_layout = False
+    model.generator = 'gnp'
+    model.default_graphe_order = 120
+    model.proba = 0.03
+    model.generate_graph(seed)
+    return model
+
+
+def reference(model):
+    graphe = model.graphe
+    return graphe.to_networkx()[0] if isinstance(graphe, CompactGraph) else graphe
+
+
+def path_length(graphe, path):
+    return sum(graphe[a][b]['weight'] for a, b in zip(path, path[1:]))
+
+
+# Arbre réparé après chaque modification, comparé aux distances de networkx depuis la source
+def test_dynamic_tree_matches_dijkstra_after_random_edits():
+    rnd = random.Random(4)
+    graphe = nx.gnp_random_graph(100, 0.04, seed=4)
+    for u, v in graphe.edges():
+        graphe[u][v]['weight'] = rnd.randint(0, 9)
+
+    def neighbors(node):
+        return ((neighbor, data['weight']) for neighbor, data in graphe.adj[node].items())
+    tree = DynamicShortestPathTree(0, neighbors)
+    for _ in range(1500):
+        nodes = list(graphe.nodes())
+        op = rnd.random()
+        if op < 0.4 and graphe.number_of_edges():
+            u, v = rnd.choice(list(graphe.edges()))
+            old, new = graphe[u][v]['weight'], rnd.randint(0, 9)
+            graphe[u][v]['weight'] = new
+            tree.update_edge(u, v, old, new)
+        elif op < 0.65:
+            u, v = rnd.sample(nodes, 2)
+            if not graphe.has_edge(u, v):
+                weight = rnd.randint(0, 9)
+                graphe.add_edge(u, v, weight=weight)
+                tree.update_edge(u, v, None, weight)
+        elif op < 0.9 and graphe.number_of_edges():
+            u, v = rnd.choice(list(graphe.edges()))
+            weight = graphe[u][v]['weight']
+            graphe.remove_edge(u, v)
+            tree.update_edge(u, v, weight, None)
+        elif len(nodes) > 20:
+            node = rnd.choice([node for node in nodes if node != 0])
+            graphe.remove_node(node)
+            tree.remove_node(node)
+
+        assert tree.dist == nx.single_source_dijkstra_path_length(graphe, 0)
+        target = rnd.choice(list(graphe.nodes()))
+        path = tree.path(target)
+        if target in tree.dist:
+            assert path[0] == 0 and path[-1] == target and path_length(graphe, path) == tree.dist[target]
+        else:
+            assert path == []
+
+
+# Chemin suivi par le modèle (arbre construit par la recherche): le chemin émis après chaque
+# modification est un plus court chemin du graphe courant
+@pytest.mark.parametrize('backend', ['networkx', 'compact'])
+def test_followed_path_after_random_edits(backend):
+    rnd = random.Random(8)
+    model = generate(backend, 8)
+    nodes = list(model.graphe.nodes())
+    model.start_node, model.end_node = nodes[0], nodes[-1]
+    model.shortest_path = model.find_shortest_path(follow=True)
+    for _ in range(300):
+        nodes = list(model.graphe.nodes())
+        op = rnd.random()
+        path = model.shortest_path
+        if op < 0.4 and model.graphe.number_of_edges():
+            edge = rnd.choice(list(model.graphe.edges()))
+            if len(path) > 1 and rnd.random() < 0.5:
+                k = rnd.randrange(len(path) - 1)
+                edge = (path[k], path[k + 1])
+            model.set_edge_weight(edge, rnd.randint(0, 10))
+        elif op < 0.65:
+            model.add_edge(*rnd.sample(nodes, 2), rnd.randint(1, 10))
+        elif op < 0.9 and model.graphe.number_of_edges():
+            edge = rnd.choice(list(model.graphe.edges()))
+            if len(path) > 1 and rnd.random() < 0.5:
+                k = rnd.randrange(len(path) - 1)
+                edge = (path[k], path[k + 1])
+            model.delete_edge(edge)
+        elif op < 0.95:
+            model.add_node((rnd.random(), rnd.random()))
+        else:
+            model.delete_node(rnd.choice([node for node in nodes if node not in (model.start_node, model.end_node)]))
+
+        graphe = reference(model)
+        assert model._path_tree.version == model.version
+        try:
+            expected = nx.dijkstra_path_length(graphe, model.start_node, model.end_node)
+        except nx.NetworkXNoPath:
+            assert model.shortest_path == []
+            continue
+        assert path_length(graphe, model.shortest_path) == expected
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from model import edge_list
+from model.edge_list import EdgeListError, read_edge_list
+
+
+def edge_weights(graphe):
+    return {frozenset(edge): graphe.weight(*edge) for edge in graphe.edges()}
+
+
+def write(tmp_path, text, name='edges.txt'):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+# En-tête CSV, commentaires, lignes vides, colonnes en trop; boucle retirée et, pour une
+# arête répétée (dans un sens ou dans l'autre), le dernier poids retenu
+def test_header_comments_duplicates_and_loops(tmp_path):
+    path = write(tmp_path, "source,target,weight,label\n"
+                           "# commentaire\n"
+                           "1,2,5,a\n"
+                           "\n"
+                           "% autre commentaire\n"
+                           "2,3,4,b\n"
+                           "7,7,1,boucle\n"
+                           "3,2,9,c\n"
+                           "1000000,1,2,d\n")
+    graphe = read_edge_list(path, seed=1)
+    assert sorted(graphe.nodes()) == [1, 2, 3, 1000000]
+    assert edge_weights(graphe) == {frozenset((1, 2)): 5, frozenset((2, 3)): 9, frozenset((1, 1000000)): 2}
+
+
+# Sans colonne de poids: poids par défaut; séparateurs tabulation et espaces
+@pytest.mark.parametrize('separator', ['\t', ' '])
+def test_unweighted(tmp_path, separator):
+    path = write(tmp_path, f"0{separator}1\n1{separator}2\n# fin\n")
+    graphe = read_edge_list(path)
+    assert edge_weights(graphe) == {frozenset((0, 1)): edge_list.DEFAULT_WEIGHT,
+                                    frozenset((1, 2)): edge_list.DEFAULT_WEIGHT}
+
+
+# Fichier lu en plusieurs blocs (coupés en fin de ligne): même graphe qu'en un seul bloc,
+# progression croissante jusqu'à 100
+def test_chunked_read_matches_reference(tmp_path, monkeypatch):
+    rnd = random.Random(5)
+    expected = {}
+    lines = ["u;v;w"]
+    for k in range(3000):
+        u, v = rnd.randrange(400), rnd.randrange(400)
+        weight = rnd.randint(1, 9)
+        lines.append(f"{u};{v};{weight}")
+        if k % 500 == 0:
+            lines.append("# repère")
+        if u != v:
+            expected[frozenset((u, v))] = weight
+    path = write(tmp_path, "\n".join(lines) + "\n")
+
+    monkeypatch.setattr(edge_list, 'CHUNK_BYTES', 1000)
+    steps = []
+    graphe = read_edge_list(path, seed=2, progress=steps.append)
+    assert edge_weights(graphe) == expected
+    assert steps == sorted(steps) and steps[-1] == 100 and len(steps) > 10
+
+
+def test_cancellation_between_blocks(tmp_path, monkeypatch):
+    path = write(tmp_path, "".join(f"{k} {k + 1}\n" for k in range(2000)))
+    monkeypatch.setattr(edge_list, 'CHUNK_BYTES', 500)
+    calls = []
+
+    def checkpoint():
+        calls.append(None)
+        if len(calls) == 3:
+            raise InterruptedError()
+    with pytest.raises(InterruptedError):
+        read_edge_list(path, checkpoint=checkpoint)
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize('text', ["", "# rien\n\n", "1\n2\n", "1 2\n3 x\n"])
+def test_invalid_files(tmp_path, text):
+    with pytest.raises(EdgeListError):
+        read_edge_list(write(tmp_path, text))
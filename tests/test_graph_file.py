@@ -0,0 +1,91 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from model.compact_graph import CompactGraph
+from model.graph_file import GraphFileError, load_graph, save_graph
+from model.graphe_model import GrapheModel
+
+
+def weighted_graph(seed):
+    graphe = nx.gnp_random_graph(120, 0.04, seed=seed)
+    graphe.add_node(500)  # Sommet isolé, identifiant hors de 0..n-1
+    rnd = random.Random(seed)
+    for u, v in graphe.edges():
+        graphe[u][v]['weight'] = rnd.randint(1, 9)
+    pos = {node: (rnd.uniform(-1, 1), rnd.uniform(-1, 1)) for node in graphe}
+    return graphe, pos
+
+
+def edge_weights(graphe):
+    return {frozenset(edge): graphe.weight(*edge) for edge in graphe.edges()}
+
+
+# Relecture identique (sommets, arêtes, poids, positions, métadonnées), projetée ou lue;
+# une édition du graphe chargé ne touche pas au fichier
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load_round_trip(tmp_path, mmap):
+    graphe, pos = weighted_graph(7)
+    path = tmp_path / 'g.graphe'
+    save_graph(path, graphe, pos, {'seed': 7, 'generator': 'gnp'})
+    data = path.read_bytes()
+
+    loaded, metadata = load_graph(path, mmap=mmap)
+    assert isinstance(loaded, CompactGraph) and metadata == {'seed': 7, 'generator': 'gnp'}
+    assert sorted(loaded.nodes()) == sorted(graphe.nodes())
+    assert edge_weights(loaded) == {frozenset((u, v)): w for u, v, w in graphe.edges(data='weight')}
+    for node, xy in pos.items():
+        assert tuple(loaded.positions[node]) == pytest.approx(xy)
+
+    loaded.add_edge(0, 500, 3)
+    loaded.positions[0] = (9.0, 9.0)
+    assert path.read_bytes() == data
+
+    # Graphe compact réenregistré tel quel
+    save_graph(tmp_path / 'h.graphe', loaded)
+    again, _ = load_graph(tmp_path / 'h.graphe', mmap=mmap)
+    assert edge_weights(again) == edge_weights(loaded) and tuple(again.positions[0]) == (9.0, 9.0)
+
+
+def test_empty_graph_round_trip(tmp_path):
+    save_graph(tmp_path / 'e.graphe', nx.Graph(), {})
+    loaded, metadata = load_graph(tmp_path / 'e.graphe')
+    assert loaded.number_of_nodes() == 0 and loaded.number_of_edges() == 0 and metadata == {}
+
+
+def test_invalid_files(tmp_path):
+    graphe, pos = weighted_graph(2)
+    path = tmp_path / 'g.graphe'
+    save_graph(path, graphe, pos)
+    data = path.read_bytes()
+
+    bad = tmp_path / 'bad.graphe'
+    for content in (b'', b'not a graph file', data[:len(data) // 2], data.replace(b'"version": 1', b'"version": 9')):
+        bad.write_bytes(content)
+        with pytest.raises(GraphFileError):
+            load_graph(bad)
+
+
+# Enregistrement et chargement par le modèle: graine conservée; un graphe compact chargé
+# peut être réenregistré sur son propre fichier
+@pytest.mark.parametrize('backend', ['networkx', 'compact'])
+def test_model_save_load(tmp_path, backend):
+    model = GrapheModel('networkx')
+    model.local_layout = False
+    model.default_graphe_order = 60
+    model.proba = 0.1
+    model.generate_graph(12)
+    expected = {frozenset((u, v)): model.get_edge_weight((u, v)) for u, v in model.graphe.edges()}
+    path = str(tmp_path / 'm.graphe')
+    model.save_graph(path)
+
+    other = GrapheModel(backend)
+    for _ in range(2):
+        other.load_graph(path)
+        assert other.seed == 12
+        assert {frozenset((u, v)): other.get_edge_weight((u, v)) for u, v in other.graphe.edges()} == expected
+        assert np.allclose([other.pos[node] for node in model.graphe.nodes()],
+                           [model.pos[node] for node in model.graphe.nodes()])
+        other.save_graph(path)
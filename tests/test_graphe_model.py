@@ -0,0 +1,134 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from model.compact_graph import CompactGraph
+from model.graphe_model import GrapheModel
+
+
+def generate(model, order, proba, seed=1):
+    model.default_graphe_order = order
+    model.proba = proba
+    model.generate_graph(seed)
+
+
+# Un grand graphe reste compact sans changer le stockage choisi pour les suivants
+def test_large_graph_does_not_switch_configured_backend():
+    model = GrapheModel('networkx')
+    generate(model, 6000, 0.0005)
+    assert isinstance(model.graphe, CompactGraph)
+    assert model.backend == 'networkx' and model.storage == 'compact'
+
+    generate(model, 50, 0.1)
+    assert not isinstance(model.graphe, CompactGraph)
+    assert model.storage == 'networkx'
+
+
+# Deux chemins 0-1-2-3 et 4-5: l'arbre du départ vient de la recherche, pas d'une modification
+def path_model():
+    graphe = nx.Graph()
+    graphe.add_weighted_edges_from([(0, 1, 1), (1, 2, 1), (2, 3, 1), (4, 5, 1)])
+    model = GrapheModel('networkx')
+    model.local_layout = False
+    model.set_graph(graphe, {node: (float(node), 0.0) for node in graphe})
+    model.start_node, model.end_node = 0, 3
+    return model
+
+
+def test_path_tree_is_built_by_the_search():
+    model = path_model()
+    model.shortest_path = model.find_shortest_path()
+    model.set_edge_weight((1, 2), 5)
+    assert model._path_tree is None  # Pas de construction dans le thread GUI
+
+    model.shortest_path = model.find_shortest_path(follow=True)
+    assert model._path_tree is not None and model._path_tree.version == model.version
+    emitted = []
+    model.pathFound.connect(emitted.append)
+    model.add_edge(0, 2, 1)
+    assert emitted == [[0, 2, 3]] and model.shortest_path == [0, 2, 3]
+
+
+def test_edits_outside_the_path_tree_skip_the_repair():
+    model = path_model()
+    model.shortest_path = model.find_shortest_path(follow=True)
+    emitted = []
+    model.pathFound.connect(emitted.append)
+    model.add_node((9.0, 9.0))
+    model.set_edge_weight((4, 5), 7)
+    model.delete_edge((4, 5))
+    assert emitted == []
+    assert model._path_tree.version == model.version
+    assert model.path_distance(0, 3) == 3
+
+    model.add_edge(3, 4, 1)
+    assert emitted == [[0, 1, 2, 3]] and 4 in model._path_tree.dist
+
+
+# Instantané networkx partagé: le modèle ne recopie le graphe que si l'instantané est
+# encore tenu au moment d'une écriture, et l'instantané ne voit pas les modifications
+@pytest.mark.parametrize('backend', ['networkx', 'compact'])
+def test_snapshot_is_shared_until_written(backend):
+    model = GrapheModel(backend)
+    model.local_layout = False
+    generate(model, 60, 0.1)
+    graphe = model.graphe
+    snapshot = model.snapshot()
+    assert model.snapshot() is snapshot
+    if backend == 'networkx':
+        assert snapshot.graphe is graphe and snapshot.pos is model.pos
+    edges, weights = snapshot.graphe.number_of_edges(), dict(nx_weights(snapshot.graphe))
+    positions = {node: tuple(p) for node, p in snapshot.pos.items()}
+
+    u, v = next(iter(model.graphe.edges()))
+    model.set_edge_weight((u, v), 99)
+    model.delete_edge((u, v))
+    model.add_node((0.5, 0.5))
+    model.move_node(0, (9.0, 9.0))
+    assert snapshot.graphe.number_of_edges() == edges and dict(nx_weights(snapshot.graphe)) == weights
+    assert {node: tuple(p) for node, p in snapshot.pos.items()} == positions
+    assert model.graphe.number_of_edges() == edges - 1
+
+    # Instantané relâché: écriture sur place
+    del snapshot
+    model.snapshot()
+    graphe = model.graphe
+    model.move_node(0, (1.0, 1.0))
+    model.add_edge(0, 1)
+    assert model.graphe is graphe
+
+
+def nx_weights(graphe):
+    return ((frozenset(edge), graphe[edge[0]][edge[1]]['weight']) for edge in graphe.edges())
+
+
+# Masques d'affichage comparés aux tests un par un: états des sommets (départ, arrivée,
+# sélection, visités à la position de lecture) et arêtes du chemin dans les deux sens
+def test_node_masks_and_path_edge_mask():
+    model = GrapheModel('networkx')
+    model.local_layout = False
+    generate(model, 80, 0.06, seed=3)
+    nodes = np.array(list(model.graphe.nodes()))
+    edges = np.array(list(model.graphe.edges()))
+    masks = model.node_masks(nodes)
+    assert not any(mask.any() for mask in masks.values())
+    assert not model.path_edge_mask(edges).any()
+
+    model.start_node, model.end_node, model.selected_node = nodes[0], nodes[-1], nodes[5]
+    model.traversal = model.compute_traversal(model.snapshot(), 'bfs', nodes[0])
+    model.traversal_position = 30
+    masks = model.node_masks(nodes)
+    for i, node in enumerate(nodes.tolist()):
+        assert masks['start'][i] == (node == model.start_node)
+        assert masks['end'][i] == (node == model.end_node)
+        assert masks['selected'][i] == (node == model.selected_node)
+        assert masks['visited'][i] == model.is_visited(node) == (node in model.visited_nodes)
+    assert np.count_nonzero(masks['visited']) == 30
+
+    path = nx.shortest_path(model.graphe, nodes[0], nodes[1])
+    model.shortest_path = path
+    on_path = {frozenset(pair) for pair in zip(path, path[1:])}
+    expected = [frozenset(edge) in on_path for edge in edges.tolist()]
+    assert model.path_edge_mask(edges).tolist() == expected
+    assert model.path_edge_mask(edges[:, ::-1]).tolist() == expected
+    assert model.path_edge_mask(np.empty((0, 2))).shape == (0,)
@@ -0,0 +1,98 @@
+import json
+import threading
+
+import networkx as nx
+import pytest
+
+from instrumentation import Instrumentation, instruments
+from model.graphe_model import GrapheModel
+
+
+# Désactivée: rien n'est compté ni mesuré; l'activation est lue à l'appel des fonctions décorées
+def test_disabled_records_nothing():
+    probe = Instrumentation()
+    double = probe.timed('double')(lambda x: 2 * x)
+    probe.count('calls')
+    with probe.timer('phase'):
+        pass
+    assert double(2) == 4
+    assert probe.summary()['counters'] == {} and probe.summary()['timers'] == {}
+
+    probe.enable()
+    assert double(3) == 6
+    assert probe.summary()['timers']['double']['count'] == 1
+
+
+# Compteurs et chronomètres tenus depuis plusieurs threads; une exception est mesurée puis propagée
+def test_counters_timers_and_frames():
+    probe = Instrumentation(enabled=True)
+
+    def work():
+        for _ in range(500):
+            probe.count('calls')
+            with probe.timer('phase'):
+                pass
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with pytest.raises(KeyError):
+        with probe.timer('failing'):
+            raise KeyError()
+    for _ in range(3):
+        with probe.frame('draw.frame'):
+            pass
+
+    summary = probe.summary()
+    assert summary['counters'] == {'calls': 2000}
+    assert summary['timers']['phase']['count'] == 2000 and summary['timers']['failing']['count'] == 1
+    stats = summary['timers']['draw.frame']
+    assert summary['frames'] == 3 and stats['count'] == 3 and summary['fps'] == 3
+    assert 0 <= stats['mean_ms'] <= stats['max_ms'] and stats['total_ms'] == pytest.approx(3 * stats['mean_ms'])
+
+    probe.reset()
+    assert probe.summary()['frames'] == 0 and probe.summary()['counters'] == {}
+
+
+def test_trace_dump(tmp_path):
+    probe = Instrumentation(enabled=True)
+    with probe.timer('model.add_edge'):
+        pass
+    probe.count('model.grapheChanged')
+    path = tmp_path / 'trace.json'
+    probe.dump(path)
+    trace = json.loads(path.read_text(encoding='utf-8'))
+    (event,) = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+    assert event['name'] == 'model.add_edge' and event['cat'] == 'model' and event['dur'] >= 0
+    assert any(event['ph'] == 'M' for event in trace['traceEvents'])
+    assert trace['otherData']['counters'] == {'model.grapheChanged': 1}
+
+
+@pytest.fixture
+def enabled_instruments():
+    enabled = instruments.enabled
+    instruments.reset()
+    instruments.enable()
+    yield instruments
+    instruments.enable(enabled)
+    instruments.reset()
+
+
+# Émissions de grapheChanged du modèle comptées, celles retenues par batch() à part
+def test_model_signal_counters(enabled_instruments):
+    graphe = nx.path_graph(5)
+    nx.set_edge_attributes(graphe, 1, 'weight')
+    model = GrapheModel('networkx')
+    model.local_layout = False
+    model.set_graph(graphe, {node: (float(node), 0.0) for node in graphe})
+    enabled_instruments.reset()
+
+    model.add_edge(0, 4, 1)
+    with model.batch():
+        model.add_edge(0, 2, 1)
+        model.delete_edge((1, 2))
+    summary = enabled_instruments.summary()
+    assert summary['counters']['model.grapheChanged'] == 2
+    assert summary['counters']['model.grapheChanged.deferred'] == 2
+    assert summary['timers']['signal.grapheChanged']['count'] == 2
@@ -0,0 +1,56 @@
+import numpy as np
+
+from model import layout
+from model.graphe_model import GrapheModel
+
+
+# Plus petite distance entre deux noeuds (paires entre noeuds fixes exclues)
+def pairwise_min_distance(xy, fixed=None):
+    delta = xy[:, None, :] - xy[None, :, :]
+    dist = np.hypot(delta[..., 0], delta[..., 1])
+    pairs = ~np.eye(len(xy), dtype=bool)
+    if fixed is not None:
+        pairs &= ~(fixed[:, None] & fixed[None, :])
+    return dist[pairs].min()
+
+
+# Deux extrémités attirées l'une vers l'autre finissaient au même point et ne se
+# séparaient plus: un clic ne pouvait plus sélectionner que l'une des deux
+def test_add_edge_does_not_collapse_endpoints():
+    model = GrapheModel()
+    for position in ((0.5, 0), (-0.5, 0), (0, 0.5), (0, -0.5)):
+        model.add_node(position)
+    model.add_edge(0, 1)
+
+    xy = np.array([model.pos[node] for node in range(4)], dtype=float)
+    k = np.sqrt(1.0 / 4)
+    assert pairwise_min_distance(xy) >= layout.MIN_SEPARATION * k * 0.999
+    for node in range(4):
+        assert model.spatial_index.nearest(model.pos[node], 1e-3) == node
+
+
+def test_relax_separates_coincident_nodes_deterministically():
+    xy = np.array([[0.0, 0.0], [0.0, 0.0], [0.0, 0.0], [1.0, 1.0]])
+    fixed = np.array([False, False, False, True])
+    u, v = np.array([0, 1]), np.array([1, 2])
+    first = layout.relax(xy, u, v, fixed, k=0.3)
+    second = layout.relax(xy, u, v, fixed, k=0.3)
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_array_equal(first[3], xy[3])
+    assert pairwise_min_distance(first) >= layout.MIN_SEPARATION * 0.3 * 0.999
+
+
+def test_relax_keeps_minimum_separation_on_random_edits():
+    rng = np.random.default_rng(8)
+    for _ in range(20):
+        n = int(rng.integers(3, 40))
+        xy = rng.uniform(-1, 1, (n, 2))
+        m = int(rng.integers(1, 3 * n))
+        u, v = rng.integers(0, n, m), rng.integers(0, n, m)
+        keep = u != v
+        fixed = rng.random(n) < 0.3
+        k = float(rng.uniform(0.05, 0.5))
+        out = layout.relax(xy, u[keep], v[keep], fixed, k)
+        np.testing.assert_array_equal(out[fixed], xy[fixed])
+        assert np.isfinite(out).all()
+        assert pairwise_min_distance(out, fixed) >= layout.MIN_SEPARATION * k * 0.5
@@ -0,0 +1,65 @@
+import networkx as nx
+import pytest
+
+from model.graphe_model import GrapheModel
+from model.path_cache import ShortestPathCache
+
+
+class Cancelled(Exception):
+    pass
+
+
+def grid_neighbors(graphe):
+    return lambda node: ((neighbor, data['weight']) for neighbor, data in graphe.adj[node].items())
+
+
+def cancel_after(calls):
+    count = iter(range(calls))
+
+    def checkpoint():
+        if next(count, None) is None:
+            raise Cancelled()
+    return checkpoint
+
+
+# Recherche annulée en cours de route, puis relancée depuis le même départ sans
+# modification: l'arbre en cache reprend sans le checkpoint de la tâche annulée
+def test_search_after_cancelled_search():
+    graphe = nx.path_graph(50)
+    nx.set_edge_attributes(graphe, 1, 'weight')
+    model = GrapheModel('networkx')
+    model.set_graph(graphe, {node: (float(node), 0.0) for node in graphe})
+    model.path_engine = 'dijkstra'
+    snapshot = model.snapshot()
+
+    with pytest.raises(Cancelled):
+        model.search_path(snapshot, 0, 49, checkpoint=cancel_after(10))
+    assert model.search_path(snapshot, 0, 49, checkpoint=lambda: None) == list(range(50))
+    assert model.path_distance(0, 49) == 49
+    assert model.search_path(snapshot, 0, 30, checkpoint=cancel_after(0)) == list(range(31))
+
+
+# Requête répétée ou inversée sur la même version: servie par l'arbre en cache, sans
+# nouveau sommet développé; une nouvelle version vide le cache
+def test_cache_hits_reversed_pairs_and_versions():
+    graphe = nx.grid_2d_graph(8, 8)
+    nx.set_edge_attributes(graphe, 1, 'weight')
+    neighbors = grid_neighbors(graphe)
+    cache = ShortestPathCache(maxsize=2)
+
+    path = cache.path(0, (0, 0), (7, 7), neighbors)
+    assert len(path) == 15 and path[0] == (0, 0) and path[-1] == (7, 7)
+    assert (cache.hits, cache.misses) == (0, 1) and cache.last_expanded > 0
+    assert cache.path(0, (0, 0), (7, 7), neighbors) == path and cache.last_expanded == 0
+    assert cache.path(0, (7, 7), (0, 0), neighbors) == path[::-1] and cache.last_expanded == 0
+    assert cache.distance(0, (7, 7), (0, 0), neighbors) == 14
+    assert (cache.hits, cache.misses, len(cache)) == (3, 1, 1)
+
+    # Au plus maxsize arbres, le moins récemment utilisé est retiré
+    cache.path(0, (1, 1), (2, 2), neighbors)
+    cache.path(0, (3, 3), (2, 2), neighbors)
+    assert len(cache) == 2 and cache.lookup(0, (0, 0)) is None
+
+    graphe.remove_edge((0, 0), (0, 1))
+    assert cache.distance(1, (3, 3), (0, 0), neighbors) == 6
+    assert len(cache) == 1 and cache.misses == 4
@@ -0,0 +1,64 @@
+import math
+import random
+
+import networkx as nx
+import pytest
+
+from model import path_search
+from model.compact_graph import CompactGraph
+from model.graphe_model import GrapheModel
+
+
+def generate(backend, seed):
+    model = GrapheModel(backend)
+    model.local_layout = False
+    model.generator = 'gnp'
+    model.default_graphe_order = 120
+    model.proba = 0.03
+    model.generate_graph(seed)
+    return model
+
+
+def reference(model):
+    graphe = model.graphe
+    return graphe.to_networkx()[0] if isinstance(graphe, CompactGraph) else graphe
+
+
+def path_length(graphe, path):
+    return sum(graphe[a][b]['weight'] for a, b in zip(path, path[1:]))
+
+
+# Chaque moteur donne la distance de Dijkstra (networkx) et un chemin de cette longueur,
+# sur des modifications aléatoires: poids quelconques (A* par repères) puis poids au moins
+# égaux aux longueurs (A* euclidien)
+@pytest.mark.parametrize('backend', ['networkx', 'compact'])
+@pytest.mark.parametrize('engine', path_search.ENGINES)
+def test_engines_match_dijkstra_after_random_edits(backend, engine):
+    rnd = random.Random(11)
+    model = generate(backend, 11)
+    model.path_engine = engine
+    for euclidean in (False, True):
+        if euclidean:
+            for u, v in list(model.graphe.edges()):
+                model.set_edge_weight((u, v), math.ceil(10 * math.dist(model.pos[u], model.pos[v])))
+        for _ in range(40):
+            nodes = list(model.graphe.nodes())
+            u, v = rnd.sample(nodes, 2)
+            if rnd.random() < 0.5:
+                model.add_edge(u, v, math.ceil(10 * math.dist(model.pos[u], model.pos[v])) + rnd.randint(0, 3))
+            elif model.graphe.number_of_edges():
+                model.delete_edge(rnd.choice(list(model.graphe.edges())))
+
+            model.start_node, model.end_node = rnd.sample(list(model.graphe.nodes()), 2)
+            path = model.find_shortest_path()
+            graphe = reference(model)
+            try:
+                expected = nx.dijkstra_path_length(graphe, model.start_node, model.end_node)
+            except nx.NetworkXNoPath:
+                assert path == [] and model.path_distance(model.start_node, model.end_node) is None
+                continue
+            assert path[0] == model.start_node and path[-1] == model.end_node
+            assert path_length(graphe, path) == expected
+            assert model.path_distance(model.start_node, model.end_node) == expected
+        if engine == 'astar':
+            assert model.last_search_heuristic == ('euclidean' if euclidean else 'landmarks')
@@ -0,0 +1,70 @@
+import networkx as nx
+import pytest
+
+from model.graphe_model import GrapheModel
+from model.signals import Signal
+
+
+class Emitter:
+    changed = Signal(object)
+
+
+# Connexions propres à chaque instance; un slot peut se déconnecter pendant l'émission
+def test_signal_connect_disconnect():
+    first, second = Emitter(), Emitter()
+    received = []
+
+    def once(value):
+        received.append(('once', value))
+        first.changed.disconnect(once)
+    first.changed.connect(once)
+    first.changed.connect(lambda value: received.append(('always', value)))
+    first.changed.emit(1)
+    first.changed.emit(2)
+    second.changed.emit(3)
+    assert received == [('once', 1), ('always', 1), ('always', 2)]
+    with pytest.raises(TypeError):
+        first.changed.disconnect(once)
+    first.changed.disconnect()
+    first.changed.emit(4)
+    assert len(received) == 3
+
+
+def small_model():
+    graphe = nx.path_graph(6)
+    nx.set_edge_attributes(graphe, 1, 'weight')
+    model = GrapheModel('networkx')
+    model.local_layout = False
+    model.set_graph(graphe, {node: (float(node), 0.0) for node in graphe})
+    return model
+
+
+# Un seul grapheChanged pour toutes les modifications d'une transaction (imbriquée ou
+# interrompue par une exception), un par modification hors transaction
+def test_batch_coalesces_graphe_changed():
+    model = small_model()
+    emitted = []
+    model.grapheChanged.connect(emitted.append)
+
+    model.add_edge(0, 5, 2)
+    model.set_edge_weight((0, 1), 3)
+    assert len(emitted) == 2
+
+    with model.batch():
+        model.add_edge(1, 4, 1)
+        with model.batch():
+            model.delete_edge((2, 3))
+            model.start_node, model.end_node = 0, 3
+        model.move_node(2, (2.0, 1.0))
+        assert len(emitted) == 2
+    assert len(emitted) == 3 and emitted[-1] is model.pos
+
+    with pytest.raises(RuntimeError):
+        with model.batch():
+            model.add_edge(0, 3, 1)
+            raise RuntimeError()
+    assert len(emitted) == 4
+
+    with model.batch():
+        pass
+    assert len(emitted) == 4
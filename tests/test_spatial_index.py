@@ -0,0 +1,139 @@
+import math
+import random
+
+import networkx as nx
+import numpy as np
+
+from model.spatial_index import GridIndex, SegmentIndex
+
+
+def brute_nearest(pos, point, radius):
+    best, best_distance = None, radius
+    for node, (x, y) in pos.items():
+        distance = math.hypot(x - point[0], y - point[1])
+        if distance < best_distance:
+            best, best_distance = node, distance
+    return best
+
+
+def segment_distance(point, p0, p1):
+    p, a, b = np.asarray(point, dtype=float), np.asarray(p0, dtype=float), np.asarray(p1, dtype=float)
+    ab = b - a
+    length_sq = float(ab @ ab)
+    t = 0.0 if length_sq == 0 else min(max(float((p - a) @ ab) / length_sq, 0.0), 1.0)
+    return float(np.hypot(*(p - (a + t * ab))))
+
+
+# Après un fort dézoom, le rayon de sélection couvre des millions de cellules: seules les
+# cellules remplies sont parcourues, avec le même résultat
+def test_grid_nearest_with_huge_radius():
+    rng = np.random.default_rng(17)
+    pos = {node: tuple(p) for node, p in enumerate(rng.uniform(-1, 1, (500, 2)).tolist())}
+    index = GridIndex()
+    index.rebuild(pos)
+    for point in rng.uniform(-50, 50, (20, 2)).tolist():
+        assert index.nearest(point, 1e4) == brute_nearest(pos, point, 1e4)
+
+
+# Insertions, déplacements et suppressions aléatoires: même résultat que la recherche
+# exhaustive, à petit et grand rayon
+def test_grid_nearest_after_random_edits():
+    rnd = random.Random(5)
+    pos = {node: (rnd.uniform(-1, 1), rnd.uniform(-1, 1)) for node in range(300)}
+    index = GridIndex()
+    index.rebuild(pos)
+    next_node = len(pos)
+    for step in range(2000):
+        op = rnd.random()
+        if op < 0.3:
+            pos[next_node] = (rnd.uniform(-2, 2), rnd.uniform(-2, 2))
+            index.insert(next_node, pos[next_node])
+            next_node += 1
+        elif op < 0.8:
+            node = rnd.choice(list(pos))
+            pos[node] = (rnd.uniform(-2, 2), rnd.uniform(-2, 2))
+            index.move(node, pos[node])
+        elif len(pos) > 1:
+            node = rnd.choice(list(pos))
+            del pos[node]
+            index.remove(node)
+        if step % 20 == 0:
+            assert len(index) == len(pos)
+            for radius in (0.05, 0.3, 5.0):
+                point = (rnd.uniform(-2, 2), rnd.uniform(-2, 2))
+                assert index.nearest(point, radius) == brute_nearest(pos, point, radius)
+
+
+# Arêtes ajoutées, supprimées et déplacées avec leurs noeuds: la distance de l'arête
+# trouvée est la plus petite distance exhaustive (les égalités peuvent choisir l'une ou l'autre)
+def test_segment_nearest_after_random_edits():
+    rnd = random.Random(9)
+    graphe = nx.gnp_random_graph(80, 0.05, seed=9)
+    pos = {node: (rnd.uniform(-1, 1), rnd.uniform(-1, 1)) for node in graphe}
+    index = SegmentIndex()
+    index.rebuild(graphe, pos)
+    for step in range(1500):
+        nodes = list(graphe.nodes())
+        op = rnd.random()
+        if op < 0.35:
+            u, v = rnd.sample(nodes, 2)
+            if not graphe.has_edge(u, v):
+                graphe.add_edge(u, v)
+                index.add_edge(u, v, pos[u], pos[v])
+        elif op < 0.6 and graphe.number_of_edges():
+            u, v = rnd.choice(list(graphe.edges()))
+            graphe.remove_edge(u, v)
+            index.remove_edge(u, v)
+        elif op < 0.9:
+            node = rnd.choice(nodes)
+            pos[node] = (rnd.uniform(-1, 1), rnd.uniform(-1, 1))
+            index.move_node(node, pos[node])
+        elif op < 0.95:
+            node = max(nodes) + 1
+            graphe.add_node(node)
+            pos[node] = (rnd.uniform(-1, 1), rnd.uniform(-1, 1))
+            index.add_node(node)
+        elif len(nodes) > 10:
+            node = rnd.choice(nodes)
+            graphe.remove_node(node)
+            del pos[node]
+            index.remove_node(node)
+        if step % 15 == 0:
+            assert len(index) == 2 * graphe.number_of_edges()
+            for radius in (0.02, 0.2, 5.0):
+                point = (rnd.uniform(-1.2, 1.2), rnd.uniform(-1.2, 1.2))
+                distances = [segment_distance(point, pos[u], pos[v]) for u, v in graphe.edges()]
+                best = min((d for d in distances if d < radius), default=None)
+                found = index.nearest(point, radius)
+                if best is None:
+                    assert found is None
+                else:
+                    assert graphe.has_edge(*found)
+                    assert math.isclose(segment_distance(point, pos[found[0]], pos[found[1]]), best, abs_tol=1e-12)
+
+
+# Longue session d'ajouts et suppressions: les cases mortes sont récupérées, l'index ne
+# grossit pas au-delà d'un multiple du nombre d'arêtes vivantes
+def test_segment_index_reclaims_removed_edges():
+    rnd = random.Random(12)
+    pos = {node: (rnd.uniform(-1, 1), rnd.uniform(-1, 1)) for node in range(100)}
+    index = SegmentIndex()
+    index.rebuild(nx.empty_graph(100), pos)
+    edges = set()
+    for _ in range(20000):
+        u, v = rnd.sample(range(100), 2)
+        edge = (min(u, v), max(u, v))
+        if edge in edges:
+            edges.remove(edge)
+            index.remove_edge(*edge)
+        else:
+            edges.add(edge)
+            index.add_edge(*edge, pos[edge[0]], pos[edge[1]])
+    assert len(index) == 2 * len(edges)
+    assert len(index._edges) <= 2 * len(edges) + 1025
+    assert sum(map(len, index._cells.values())) <= 16 * len(index._edges)
+    for point in [(rnd.uniform(-1, 1), rnd.uniform(-1, 1)) for _ in range(30)]:
+        best = min(segment_distance(point, pos[u], pos[v]) for u, v in edges)
+        found = index.nearest(point, 5.0)
+        assert tuple(sorted(found)) in edges
+        assert math.isclose(segment_distance(point, pos[found[0]], pos[found[1]]), best, abs_tol=1e-12)
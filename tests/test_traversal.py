@@ -0,0 +1,68 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from model.traversal import TRAVERSALS, traverse
+
+
+def weighted_graph(seed):
+    graphe = nx.gnp_random_graph(150, 0.02, seed=seed)
+    rnd = random.Random(seed)
+    for u, v in graphe.edges():
+        graphe[u][v]['weight'] = rnd.randint(1, 9)
+    return graphe
+
+
+def neighbors_of(graphe):
+    return lambda node: ((neighbor, data['weight']) for neighbor, data in graphe.adj[node].items())
+
+
+# Chaque sommet visité une fois, composante de la source d'abord; niveaux comparés à
+# networkx (profondeur BFS, distance de Dijkstra, ordre préfixe du DFS)
+@pytest.mark.parametrize('kind', TRAVERSALS)
+def test_traversals_match_networkx(kind):
+    graphe = weighted_graph(4)
+    source = 5
+    timeline = traverse(kind, source, list(graphe.nodes()), neighbors_of(graphe))
+    order = timeline.order.tolist()
+    assert sorted(order) == sorted(graphe.nodes())
+    component = nx.node_connected_component(graphe, source)
+    assert set(order[:len(component)]) == component and order[0] == source
+
+    levels = dict(zip(order, timeline.levels.tolist()))
+    parents = dict(zip(order, timeline.parents.tolist()))
+    if kind == 'bfs':
+        expected = nx.single_source_shortest_path_length(graphe, source)
+    elif kind == 'dijkstra':
+        expected = nx.single_source_dijkstra_path_length(graphe, source)
+    else:
+        assert order[:len(component)] == list(nx.dfs_preorder_nodes(graphe, source))
+        expected = {}
+    for node, level in expected.items():
+        assert levels[node] == level
+    for node in component - {source}:
+        assert graphe.has_edge(node, parents[node])
+    assert parents[source] == source
+
+
+# Rangs vectorisés identiques aux rangs un par un, sommets absents compris, et masque des
+# visités pour chaque position de lecture
+def test_ranks_and_visited_mask():
+    graphe = weighted_graph(8)
+    timeline = traverse('bfs', 0, list(graphe.nodes()), neighbors_of(graphe))
+    nodes = np.array(list(graphe.nodes()) + [-1, 1000])
+    ranks = timeline.ranks(nodes)
+    assert ranks.tolist() == [timeline.rank(node) for node in nodes.tolist()]
+    assert ranks[-2:].tolist() == [len(timeline)] * 2
+    for position in (0, 1, 37, len(timeline)):
+        mask = timeline.visited_mask(nodes, position)
+        assert mask.tolist() == [timeline.visited(node, position) for node in nodes.tolist()]
+        assert np.count_nonzero(mask) == position
+    assert timeline.visited_mask([], 3).shape == (0,)
+
+
+def test_unknown_traversal():
+    with pytest.raises(ValueError):
+        traverse('astar', 0, [0], lambda node: ())
@@ -0,0 +1,64 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+
+from view import ui_cache
+
+FORM = Path(__file__).resolve().parents[1] / 'view' / 'ui' / 'main_window.ui'
+
+
+@pytest.fixture
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def object_names(widget):
+    return sorted(child.objectName() for child in widget.findChildren(QtWidgets.QWidget) if child.objectName())
+
+
+def cached_modules(directory):
+    return sorted(path.name for path in (directory / '__pycache__').glob('main_window_ui_*.py'))
+
+
+# Compilé une fois par contenu du .ui (un .ui modifié remplace l'ancien module), puis chargé
+# avec les mêmes objets nommés, en attributs de la fenêtre, que loadUi
+def test_compiled_form_matches_load_ui(tmp_path, app, monkeypatch):
+    form = tmp_path / 'main_window.ui'
+    shutil.copy(FORM, form)
+    window = QtWidgets.QMainWindow()
+    ui_cache.load_form(window, str(form))
+    (module,) = cached_modules(tmp_path)
+    compiled = (tmp_path / '__pycache__' / module).stat().st_mtime_ns
+
+    # Module repris tel quel: uic n'est plus nécessaire
+    monkeypatch.setattr('PyQt6.uic.compileUi', None)
+    again = QtWidgets.QMainWindow()
+    ui_cache.load_form(again, str(form))
+    monkeypatch.undo()
+    assert cached_modules(tmp_path) == [module] and (tmp_path / '__pycache__' / module).stat().st_mtime_ns == compiled
+
+    from PyQt6.uic import loadUi
+    reference = QtWidgets.QMainWindow()
+    loadUi(str(form), reference)
+    assert object_names(window) == object_names(again) == object_names(reference)
+    assert isinstance(window.grapheLayout, QtWidgets.QVBoxLayout)
+
+    form.write_text(form.read_text(encoding='utf-8').replace('</ui>', '<!-- modifié -->\n</ui>'), encoding='utf-8')
+    ui_cache.load_form(QtWidgets.QMainWindow(), str(form))
+    (updated,) = cached_modules(tmp_path)
+    assert updated != module
+
+
+# Cache impossible à écrire: formulaire chargé par loadUi
+def test_unwritable_cache_falls_back_to_load_ui(app, monkeypatch):
+    def unwritable(path):
+        raise PermissionError(path)
+    monkeypatch.setattr(ui_cache, '_compiled_form', unwritable)
+    window = QtWidgets.QMainWindow()
+    ui_cache.load_form(window, str(FORM))
+    assert isinstance(window.grapheLayout, QtWidgets.QVBoxLayout)
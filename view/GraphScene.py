@@ -0,0 +1,641 @@
+import numpy as np
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.image import AxesImage
+from matplotlib.path import Path
+from matplotlib.text import Text
+
+from instrumentation import instruments
+
+
+# Étiquette de poids dont l'angle suit l'arête à l'écran
+class EdgeLabel(Text):
+    data_angle = 0.0
+
+    def draw(self, renderer):
+        angle = self.axes.transData.transform_angles(np.array([self.data_angle]),
+                                                     np.array([self.get_position()]))[0]
+        # Texte gardé lisible (entre -90 et 90 degrés)
+        if angle > 90:
+            angle -= 180
+        elif angle < -90:
+            angle += 180
+        self.set_rotation(angle)
+        super().draw(renderer)
+
+
+# Couche de rendu persistante du graphe: découpage à la vue et niveau de détail
+class GraphScene:
+    NODE_SIZE = 800  # Taille maximale des noeuds (points²)
+    MIN_NODE_DIAMETER = 2.0  # points
+    FONT_SIZE = 10
+    EDGE_LABEL_BBOX = dict(boxstyle='round', ec=(1.0, 1.0, 1.0), fc=(1.0, 1.0, 1.0))
+
+    NODE_LABEL_SPACING = 40  # pixels
+    EDGE_LABEL_SPACING = 70  # pixels
+    LABEL_BUDGET = 60  # Étiquettes au plus par type: chacune coûte quelques ms à chaque rendu
+    EDGE_DENSITY_MIN = 20000
+    NODE_POINT_MIN = 3000
+    HIGHLIGHT_NODE_SIZE = 64  # points², noeuds mis en évidence en mode points
+    DENSITY_PIXEL = 2
+    DENSITY_MAX_SAMPLES = 500_000
+    DENSITY_COLOR = (0.0, 0.0, 0.0)
+    CULL_INDEX_FRACTION = 0.25  # Index spatiaux utilisés sous cette fraction de l'étendue du graphe
+
+    def __init__(self, ax):
+        self.ax = ax
+        self._version = None  # Version du graphe dont la structure est chargée
+        self._nodes = []
+        self._node_ids = np.empty(0)
+        self._node_index = {}
+        self._offsets = np.empty((0, 2))
+        self._edge_idx = np.empty((0, 2), dtype=np.intp)
+        self._edge_ids = np.empty((0, 2))
+        self._node_sorter = np.empty(0, dtype=np.intp)  # Recherche des indices par identifiant
+        self._edge_keys = np.empty(0, dtype=np.int64)  # Clés triées des paires d'indices
+        self._edge_sorter = np.empty(0, dtype=np.intp)
+
+        self._node_collection = None
+        self._edge_collection = None
+        self._highlight_collection = None  # Arêtes mises en évidence, dessinées par-dessus la couche statique
+        self._highlight_nodes = None  # Noeuds mis en évidence (et extrémités des arêtes mises en évidence)
+        self._density_image = None  # Arêtes agrégées
+        self._density_key = None  # (version, grille, positions) de l'image de densité affichée
+        self._node_image = None  # Noeuds en mode points
+        self._node_labels = {}
+        self._edge_labels = {}
+
+        # Niveau de détail du dernier rendu
+        self._node_size = self.NODE_SIZE
+        self._aggregated = False
+        self._points = False
+        self._grid = (1, 1, (0.0, 1.0, 0.0, 1.0))  # (lignes, colonnes, étendue) des images
+        self._point_nodes = np.empty(0, dtype=np.intp)
+        self._point_cells = np.empty(0, dtype=np.int64)
+        # Éléments chargés dans les collections et styles du dernier set_styles
+        self._visible_nodes = np.empty(0, dtype=np.intp)
+        self._visible_edges = np.empty(0, dtype=np.intp)
+        self._node_colors = np.empty((0, 4))
+        self._edge_colors = np.empty((0, 4))
+        self._edge_widths = np.empty(0)
+        self._emphasized = None  # Masques des arêtes et noeuds mis en évidence
+        self._emphasized_nodes = None
+        self._base = (self._node_colors, self._edge_colors, self._edge_widths)  # Styles de la couche statique
+        self._overlay_nodes = np.empty(0, dtype=np.intp)  # Indices dessinés par-dessus la couche statique
+        self._overlay_edges = np.empty(0, dtype=np.intp)
+        self._static_key = None  # (version, grille, positions, styles de base) du dernier set_styles
+        self._static_version = 0  # Avance à chaque changement de la couche statique
+
+        # État du déplacement en cours (mode blit)
+        self._drag_index = None
+        self._drag_edges = np.empty(0, dtype=np.intp)
+        self._drag_artists = []
+        self._drag_edge_artist = None
+        self._drag_node_artist = None
+        self._drag_edge_labels = []
+        self._drag_node_label = None
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def edges(self):
+        return [tuple(edge) for edge in self._edge_ids.tolist()]
+
+    # Identifiants dans l'ordre des tableaux de style
+    @property
+    def node_ids(self):
+        return self._node_ids
+
+    @property
+    def edge_ids(self):
+        return self._edge_ids
+
+    @property
+    def offsets(self):
+        return self._offsets
+
+    @property
+    def aggregated(self):
+        return self._aggregated
+
+    @property
+    def dragging(self):
+        return self._drag_index is not None
+
+    # Artistes animés à redessiner à chaque image du déplacement (ordre de dessin)
+    @property
+    def drag_artists(self):
+        return self._drag_artists
+
+    # Compteur de la couche statique: un fond capturé reste valable tant qu'il ne change pas
+    @property
+    def static_version(self):
+        return self._static_version
+
+    # Artistes à redessiner par-dessus la couche statique, étiquettes comprises (ordre de dessin)
+    @property
+    def overlay_artists(self):
+        if self._highlight_collection is None:
+            return []
+        edge_labels = [self._edge_labels.get(edge) for edge in map(tuple, self._edge_ids[self._overlay_edges].tolist())]
+        node_labels = [self._node_labels.get(self._nodes[i]) for i in self._overlay_nodes.tolist()]
+        artists = [self._highlight_collection] + edge_labels + [self._highlight_nodes] + node_labels
+        return [artist for artist in artists if artist is not None and artist.get_visible()]
+
+    # Masque la couche mise en évidence le temps de capturer le fond statique
+    def set_overlay_visible(self, visible):
+        if self._highlight_collection is not None:
+            self._highlight_collection.set_visible(visible and len(self._overlay_edges) > 0)
+            self._highlight_nodes.set_visible(visible and len(self._overlay_nodes) > 0)
+
+    # Synchronise les artistes avec le modèle (structure relue si version change)
+    def update(self, graphe, pos, version=None, index=None):
+        if self._node_collection is None or version is None or version != self._version:
+            self.__rebuild(graphe)
+            self._version = version
+
+        if hasattr(pos, 'array'):
+            offsets = pos.array()
+        else:
+            offsets = np.array([pos[n] for n in self._nodes], dtype=float)
+        self._offsets = offsets.reshape(-1, 2)
+
+        self.__apply_level_of_detail(graphe, index)
+        self._node_collection.set_offsets(self._offsets[self._visible_nodes])
+        # Les segments des arêtes sont posés par set_styles, qui suit toujours update
+
+    # Couleurs RGBA et largeurs alignées sur node_ids et edge_ids; base: styles (noeuds, arêtes,
+    # largeurs) de la couche statique, les éléments qui s'en écartent sont dessinés par-dessus
+    def set_styles(self, node_colors, edge_colors, edge_widths, emphasized=None, emphasized_nodes=None, base=None):
+        self._node_colors, self._edge_colors = np.asarray(node_colors), np.asarray(edge_colors)
+        self._edge_widths = np.asarray(edge_widths)
+        self._emphasized, self._emphasized_nodes = emphasized, emphasized_nodes
+        if base is None:
+            base = (self._node_colors, self._edge_colors, self._edge_widths)
+        self._base = tuple(np.asarray(styles) for styles in base)
+        self.__check_static()
+        self._node_collection.set_facecolor(self._base[0][self._visible_nodes])
+        if not self._aggregated:
+            self.__set_edge_paths(self._offsets)
+
+        if self._highlight_collection is None:
+            self._highlight_collection = LineCollection([], antialiaseds=(1,), linestyle='solid')
+            self._highlight_collection.set_zorder(2.5)
+            self.ax.add_collection(self._highlight_collection, autolim=False)
+            self._highlight_nodes = self.ax.scatter([], [], s=self.HIGHLIGHT_NODE_SIZE, marker='o')
+            self._highlight_nodes.set_zorder(3)
+        self.__set_highlights()
+        self.__paint_points()
+
+    # Nouvelle version de la couche statique si structure, vue, positions ou styles de base ont changé
+    def __check_static(self):
+        key = self._static_key
+        arrays = (self._offsets,) + self._base
+        if key is None or self._version is None or key[:2] != (self._version, self._grid) or \
+                not all(np.array_equal(old, new) for old, new in zip(key[2:], arrays)):
+            self._static_key = (self._version, self._grid) + tuple(array.copy() for array in arrays)
+            self._static_version += 1
+
+    # Éléments visibles qui s'écartent de la couche statique (et ceux mis en évidence sur les
+    # couches agrégées), sauf ceux déplacés
+    def __set_highlights(self, hidden_edges=None, hidden_node=None):
+        base_nodes, base_edges, base_widths = self._base
+        edges = self._visible_edges
+        if len(self._edge_colors) == len(base_edges) == len(self._edge_idx):
+            changed = (self._edge_colors[edges] != base_edges[edges]).any(axis=1) | \
+                      (self._edge_widths[edges] != base_widths[edges])
+            if self._aggregated and self._emphasized is not None:
+                changed |= self._emphasized[edges]
+            edges = edges[changed]
+            if hidden_edges is not None:
+                edges = np.setdiff1d(edges, hidden_edges, assume_unique=True)
+        else:
+            edges = np.empty(0, dtype=np.intp)
+        self._highlight_collection.set_segments(self._offsets[self._edge_idx[edges]])
+        self._highlight_collection.set_color(self._edge_colors[edges])
+        self._highlight_collection.set_linewidth(self._edge_widths[edges])
+        self._highlight_collection.set_visible(len(edges) > 0)
+
+        # Extrémités des arêtes mises en évidence redessinées par-dessus leur trait
+        nodes = self._visible_nodes
+        changed = (self._node_colors[nodes] != base_nodes[nodes]).any(axis=1)
+        emphasized = self._emphasized_nodes
+        if self._points and emphasized is not None:
+            changed |= emphasized[nodes]
+        nodes = np.union1d(nodes[changed], np.intersect1d(self._edge_idx[edges], self._visible_nodes))
+        if hidden_node is not None:
+            nodes = nodes[nodes != hidden_node]
+        sizes = np.full(len(nodes), self._node_size)
+        if self._points and emphasized is not None:
+            sizes[emphasized[nodes]] = max(self.HIGHLIGHT_NODE_SIZE, self._node_size)
+        self._highlight_nodes.set_offsets(self._offsets[nodes])
+        self._highlight_nodes.set_facecolor(self._node_colors[nodes])
+        self._highlight_nodes.set_sizes(sizes)
+        self._highlight_nodes.set_visible(len(nodes) > 0)
+        self._overlay_nodes, self._overlay_edges = nodes, edges
+
+    # Mode points: chaque case prend la couleur d'un de ses noeuds
+    def __paint_points(self, hidden_node=None):
+        if self._points:
+            rgba = np.zeros((self._grid[0] * self._grid[1], 4), dtype=np.uint8)
+            keep = self._point_cells >= 0
+            if hidden_node is not None:
+                keep &= self._point_nodes != hidden_node
+            rgba[self._point_cells[keep]] = np.round(self._base[0][self._point_nodes[keep]] * 255)
+            self._node_image = self.__show_image(self._node_image, rgba, zorder=2)
+        elif self._node_image is not None:
+            self._node_image.set_visible(False)
+
+    # Arêtes visibles dans leur style de base: un chemin composé par style
+    def __set_edge_paths(self, offsets):
+        edges = self._visible_edges
+        _, colors, widths = self._base
+        if len(edges) == 0 or len(colors) != len(self._edge_idx):
+            self._edge_collection.set_paths([])
+            return
+        styles = np.column_stack([colors[edges], widths[edges]])
+        unique, group = np.unique(styles, axis=0, return_inverse=True)
+        group = group.ravel()
+        paths = []
+        for g in range(len(unique)):
+            segments = offsets[self._edge_idx[edges[group == g]]].reshape(-1, 2)
+            codes = np.tile(np.array([Path.MOVETO, Path.LINETO], dtype=Path.code_type), len(segments) // 2)
+            paths.append(Path(segments, codes))
+        self._edge_collection.set_paths(paths)
+        self._edge_collection.set_edgecolor(unique[:, :4])
+        self._edge_collection.set_linewidth(unique[:, 4])
+
+    # Relit noeuds et arêtes (tableaux d'indices directement pour le stockage compact)
+    def __rebuild(self, graphe):
+        if hasattr(graphe, 'layout_arrays'):
+            ids, _, u, v = graphe.layout_arrays()
+            self._nodes = ids.tolist()
+            self._edge_idx = np.stack([u, v], axis=1).astype(np.intp).reshape(-1, 2)
+        else:
+            self._nodes = list(graphe.nodes())
+            index = {node: i for i, node in enumerate(self._nodes)}
+            self._edge_idx = np.array([(index[u], index[v]) for u, v in graphe.edges()],
+                                      dtype=np.intp).reshape(-1, 2)
+        self._node_ids = np.asarray(self._nodes)
+        self._node_index = {node: i for i, node in enumerate(self._nodes)}
+        self._edge_ids = self._node_ids[self._edge_idx] if len(self._edge_idx) else np.empty((0, 2))
+        self._node_sorter = np.argsort(self._node_ids, kind='stable')
+        keys = self.__edge_keys(self._edge_idx)
+        self._edge_sorter = np.argsort(keys, kind='stable')
+        self._edge_keys = keys[self._edge_sorter]
+
+        if self._node_collection is None:
+            self._node_collection = self.ax.scatter([], [], s=self.NODE_SIZE, marker='o')
+            self._node_collection.set_zorder(2)
+        if self._edge_collection is None:
+            # Chemins en coordonnées de données (sizes=None: pas de mise à l'échelle des marqueurs)
+            self._edge_collection = PathCollection([], sizes=None, facecolors='none', antialiaseds=(1,),
+                                                   linestyle='solid')
+            self._edge_collection.set_zorder(1)
+            self.ax.add_collection(self._edge_collection, autolim=False)
+
+    def __apply_level_of_detail(self, graphe, index=None):
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        width, height = self.ax.bbox.width, self.ax.bbox.height
+        area = max(width * height, 1.0)
+        # Grille de cases de DENSITY_PIXEL pixels sur la vue (couches agrégées)
+        self._grid = (max(1, int(height / self.DENSITY_PIXEL)), max(1, int(width / self.DENSITY_PIXEL)),
+                      (min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)))
+
+        offsets = self._offsets
+        visible_nodes, visible_edges = self.__cull(index)
+        self._visible_nodes, self._visible_edges = visible_nodes, visible_edges
+
+        # Diamètre: 60% de l'écart local entre noeuds visibles, borné par la taille normale
+        pixels = self.ax.transData.transform(offsets[visible_nodes]) if len(visible_nodes) else np.empty((0, 2))
+        spacing = self.__local_spacing(pixels, area)
+        diameter = float(np.clip(0.6 * spacing * 72 / self.ax.figure.dpi, self.MIN_NODE_DIAMETER,
+                                 np.sqrt(self.NODE_SIZE)))
+        self._node_size = diameter * diameter
+        self._node_collection.set_sizes([self._node_size])
+
+        # Noeuds très denses: un point par case, peint dans une image (voir set_styles)
+        self._points = len(visible_nodes) > self.NODE_POINT_MIN
+        self._node_collection.set_visible(not self._points)
+        if self._points:
+            # Disque de cases du diamètre choisi autour de chaque noeud
+            radius = diameter * self.ax.figure.dpi / 72 / 2 / self.DENSITY_PIXEL
+            r = int(radius)
+            dr, dc = np.mgrid[-r:r + 1, -r:r + 1]
+            disc = (dr * dr + dc * dc <= max(radius * radius, 0.25))
+            dr, dc = dr[disc], dc[disc]
+            rows, cols = self._grid[:2]
+            centers = self.__cells(offsets[visible_nodes])
+            row = (centers // cols)[:, None] + dr
+            col = (centers % cols)[:, None] + dc
+            valid = (centers >= 0)[:, None] & (row >= 0) & (row < rows) & (col >= 0) & (col < cols)
+            self._point_nodes = np.repeat(visible_nodes, len(dr))
+            self._point_cells = np.where(valid, row * cols + col, -1).ravel()
+
+        # Étiquettes seulement là où elles ont la place
+        if spacing >= self.NODE_LABEL_SPACING and len(visible_nodes) <= self.LABEL_BUDGET:
+            self.__sync_node_labels(visible_nodes)
+        else:
+            self.__sync_node_labels(visible_nodes[self.__spread(pixels, self.NODE_LABEL_SPACING)])
+
+        self._aggregated = len(visible_edges) > self.EDGE_DENSITY_MIN
+        self._edge_collection.set_visible(not self._aggregated)
+        if self._aggregated:
+            # Image reprise si structure, vue et positions sont inchangées
+            key = self._density_key
+            if key is None or key[:2] != (self._version, self._grid) or not np.array_equal(key[2], offsets):
+                self.__draw_density(visible_edges)
+                self._density_key = (self._version, self._grid, offsets.copy())
+            self._density_image.set_visible(True)
+        elif self._density_image is not None:
+            self._density_image.set_visible(False)
+
+        # Poids: arête seule dans sa case et assez longue à l'écran pour porter l'étiquette
+        labelled = np.empty(0, dtype=np.intp)
+        if 0 < len(visible_edges) <= 4 * area / self.EDGE_LABEL_SPACING ** 2:
+            ends = self.ax.transData.transform(offsets[self._edge_idx[visible_edges]].reshape(-1, 2)).reshape(-1, 2, 2)
+            midpoints = ends.mean(axis=1)
+            if self.__local_spacing(midpoints, area) >= self.EDGE_LABEL_SPACING and \
+                    len(visible_edges) <= self.LABEL_BUDGET:
+                labelled = visible_edges
+            else:
+                long_enough = np.hypot(*(ends[:, 1] - ends[:, 0]).T) >= self.EDGE_LABEL_SPACING / 2
+                labelled = visible_edges[long_enough]
+                labelled = labelled[self.__spread(midpoints[long_enough], self.EDGE_LABEL_SPACING)]
+        self.__sync_edge_labels(graphe, labelled)
+
+    # Noeuds dans la vue et arêtes dont la boîte englobante la recoupe (indices triés)
+    @instruments.timed('draw.cull')
+    def __cull(self, index):
+        x0, x1, y0, y1 = self._grid[2]
+        offsets = self._offsets
+        if index is not None and len(offsets):
+            extent = np.ptp(offsets, axis=0)
+            if (x1 - x0) * (y1 - y0) < self.CULL_INDEX_FRACTION * max(extent[0] * extent[1], 1e-12):
+                found = index.query_rect(x0, y0, x1, y1)
+                if found is not None:
+                    nodes = self.__node_positions(found[0])
+                    ends = np.asarray(found[1]).reshape(-1, 2)
+                    u, v = self.__node_positions(ends[:, 0], keep=False), self.__node_positions(ends[:, 1], keep=False)
+                    edges = self.__edge_positions(np.stack([u, v], axis=1)[(u >= 0) & (v >= 0)])
+                    # Filtre exact sur les positions affichées
+                    return nodes[self.__inside(offsets[nodes])], edges[self.__crossing(edges)]
+
+        nodes = np.flatnonzero(self.__inside(offsets))
+        edges = np.flatnonzero(self.__crossing(np.arange(len(self._edge_idx))))
+        return nodes, edges
+
+    def __inside(self, points):
+        x0, x1, y0, y1 = self._grid[2]
+        return (points[:, 0] >= x0) & (points[:, 0] <= x1) & (points[:, 1] >= y0) & (points[:, 1] <= y1)
+
+    def __crossing(self, edges):
+        x0, x1, y0, y1 = self._grid[2]
+        a, b = self._offsets[self._edge_idx[edges, 0]], self._offsets[self._edge_idx[edges, 1]]
+        lo, hi = np.minimum(a, b), np.maximum(a, b)
+        return (lo[:, 0] <= x1) & (hi[:, 0] >= x0) & (lo[:, 1] <= y1) & (hi[:, 1] >= y0)
+
+    # Indices (triés) des identifiants donnés; avec keep=False, -1 pour les inconnus, dans l'ordre
+    def __node_positions(self, ids, keep=True):
+        ids = np.asarray(ids)
+        if len(ids) == 0 or len(self._node_ids) == 0:
+            return np.empty(0, dtype=np.intp) if keep else np.full(len(ids), -1, dtype=np.intp)
+        ranks = np.clip(np.searchsorted(self._node_ids, ids, sorter=self._node_sorter), 0, len(self._node_ids) - 1)
+        positions = self._node_sorter[ranks]
+        known = self._node_ids[positions] == ids
+        if keep:
+            return np.sort(positions[known])
+        return np.where(known, positions, -1)
+
+    # Indices (triés) des arêtes données par paires d'indices de noeuds
+    def __edge_positions(self, pairs):
+        if len(pairs) == 0 or len(self._edge_keys) == 0:
+            return np.empty(0, dtype=np.intp)
+        keys = self.__edge_keys(pairs)
+        ranks = np.clip(np.searchsorted(self._edge_keys, keys), 0, len(self._edge_keys) - 1)
+        return np.unique(self._edge_sorter[ranks[self._edge_keys[ranks] == keys]])
+
+    # Clé d'une arête indépendante du sens: min * n + max sur les indices de noeuds
+    def __edge_keys(self, pairs):
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        return pairs.min(axis=1) * len(self._nodes) + pairs.max(axis=1)
+
+    # Écart local typique entre points (pixels)
+    def __local_spacing(self, pixels, area):
+        if len(pixels) < 2:
+            return np.inf
+        cell = np.sqrt(area / len(pixels))
+        occupied = np.count_nonzero(self.__cell_counts(pixels, cell)[0])
+        return cell / np.sqrt(len(pixels) / occupied)
+
+    # Points seuls dans leur case de size pixels, cases agrandies tant qu'ils dépassent le budget
+    def __spread(self, pixels, size):
+        alone = self.__alone(pixels, size)
+        while np.count_nonzero(alone) > self.LABEL_BUDGET:
+            size *= np.sqrt(2)
+            alone = self.__alone(pixels, size)
+        return alone
+
+    # Masque des points seuls dans leur case de size pixels
+    def __alone(self, pixels, size):
+        if len(pixels) == 0:
+            return np.zeros(0, dtype=bool)
+        counts, keys = self.__cell_counts(pixels, size)
+        return counts[keys] == 1
+
+    # Nombre de points par case de size pixels, et case de chaque point
+    def __cell_counts(self, pixels, size):
+        box = self.ax.bbox
+        cols = int(box.width // size) + 1
+        rows = int(box.height // size) + 1
+        col = np.clip(((pixels[:, 0] - box.x0) // size).astype(np.int64), 0, cols - 1)
+        row = np.clip(((pixels[:, 1] - box.y0) // size).astype(np.int64), 0, rows - 1)
+        keys = row * cols + col
+        return np.bincount(keys, minlength=rows * cols), keys
+
+    # Case de la grille (indice à plat, -1 hors de la vue) de chaque point
+    def __cells(self, points):
+        rows, cols, (x0, x1, y0, y1) = self._grid
+        col = np.floor((points[:, 0] - x0) / (x1 - x0) * cols).astype(np.int64)
+        row = np.floor((points[:, 1] - y0) / (y1 - y0) * rows).astype(np.int64)
+        inside = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+        return np.where(inside, row * cols + col, -1)
+
+    # Image de la taille de la grille, sans toucher aux limites de l'axe
+    def __show_image(self, image, rgba, zorder):
+        rows, cols, extent = self._grid
+        if image is None:
+            image = AxesImage(self.ax, origin='lower', interpolation='nearest', zorder=zorder)
+            self.ax.add_image(image)
+        image.set_data(rgba.reshape(rows, cols, 4))
+        image.set_extent(extent)
+        image.set_visible(True)
+        return image
+
+    # Étiquettes des noeuds shown (indices) créées ou déplacées, les autres retirées
+    @instruments.timed('draw.node_labels')
+    def __sync_node_labels(self, shown):
+        labels = {}
+        for i in np.asarray(shown, dtype=np.intp).tolist():
+            node = self._nodes[i]
+            text = self._node_labels.pop(node, None)
+            if text is None:
+                text = self.ax.text(self._offsets[i, 0], self._offsets[i, 1], str(node), size=self.FONT_SIZE,
+                                    color='k', horizontalalignment='center',
+                                    verticalalignment='center', clip_on=True)
+            else:
+                text.set_position(self._offsets[i])
+            labels[node] = text
+        for text in self._node_labels.values():
+            text.remove()
+        self._node_labels = labels
+
+    @instruments.timed('draw.edge_labels')
+    def __sync_edge_labels(self, graphe, shown):
+        shown = np.asarray(shown, dtype=np.intp)
+        segments = self._offsets[self._edge_idx[shown]]
+        midpoints = segments.mean(axis=1)
+        deltas = segments[:, 1] - segments[:, 0]
+        angles = np.degrees(np.arctan2(deltas[:, 1], deltas[:, 0]))
+
+        labels = {}
+        for k, edge in enumerate(map(tuple, self._edge_ids[shown].tolist())):
+            weight = graphe[edge[0]][edge[1]].get('weight')
+            text = self._edge_labels.pop(edge, None)
+            if text is None:
+                text = EdgeLabel(midpoints[k, 0], midpoints[k, 1], str(weight), size=self.FONT_SIZE,
+                                 color='k', horizontalalignment='center', verticalalignment='center',
+                                 rotation_mode='anchor', bbox=self.EDGE_LABEL_BBOX, zorder=1, clip_on=True)
+                self.ax.add_artist(text)
+            else:
+                text.set_position(midpoints[k])
+                if text.get_text() != str(weight):
+                    text.set_text(str(weight))
+            text.data_angle = angles[k]
+            labels[edge] = text
+        for text in self._edge_labels.values():
+            text.remove()
+        self._edge_labels = labels
+
+    # Image de densité des arêtes: échantillons le long des segments cumulés par case
+    @instruments.timed('draw.density')
+    def __draw_density(self, edges):
+        rows, cols, (x0, x1, y0, y1) = self._grid
+        segments = self._offsets[self._edge_idx[edges]]
+        delta = (segments[:, 1] - segments[:, 0]) * np.array([cols / (x1 - x0), rows / (y1 - y0)])
+        length = np.hypot(delta[:, 0], delta[:, 1])  # en cases
+
+        counts = np.clip(np.ceil(length), 1, 64).astype(np.int64)
+        if counts.sum() > self.DENSITY_MAX_SAMPLES:
+            counts = np.maximum(1, counts * self.DENSITY_MAX_SAMPLES // counts.sum())
+        owner = np.repeat(np.arange(len(segments)), counts)
+        t = (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 0.5) / counts[owner]
+        points = segments[owner, 0] + (segments[owner, 1] - segments[owner, 0]) * t[:, None]
+        cells = self.__cells(points)
+        keep = cells >= 0
+        ink = np.bincount(cells[keep], weights=(length / counts)[owner][keep], minlength=rows * cols)
+
+        # Couverture de la case, saturée en douceur
+        rgba = np.zeros((rows * cols, 4), dtype=np.uint8)
+        rgba[:, :3] = np.round(np.asarray(self.DENSITY_COLOR) * 255)
+        rgba[:, 3] = np.round(255 * (1 - np.exp(-ink)))
+        self._density_image = self.__show_image(self._density_image, rgba, zorder=1)
+
+    # Sort le noeud et ses arêtes de la couche statique (artistes animés)
+    def begin_drag(self, node):
+        if node not in self._node_index:
+            return False
+
+        i = self._node_index[node]
+        self._drag_index = i
+        self._static_key = None
+        self._static_version += 1
+        self._drag_edges = np.flatnonzero((self._edge_idx == i).any(axis=1))
+
+        color = self._node_colors[i] if i < len(self._node_colors) else self._node_collection.get_facecolor()[0]
+        node_artist = self.ax.scatter([self._offsets[i, 0]], [self._offsets[i, 1]], s=self._node_size,
+                                      marker='o', c=[color], animated=True)
+        node_artist.set_zorder(2)
+
+        # Toutes les arêtes incidentes, même hors de la vue: le déplacement peut les y amener
+        edge_artist = LineCollection([], antialiaseds=(1,), linestyle='solid', animated=True)
+        if len(self._drag_edges) and len(self._edge_colors) == len(self._edge_idx):
+            edge_artist.set_segments(self._offsets[self._edge_idx[self._drag_edges]])
+            edge_artist.set_color(self._edge_colors[self._drag_edges])
+            edge_artist.set_linewidth(self._edge_widths[self._drag_edges])
+        edge_artist.set_zorder(1)
+        self.ax.add_collection(edge_artist, autolim=False)
+
+        # Noeud et arêtes masqués dans les couches statiques et agrégées
+        hidden = self._offsets.copy()
+        hidden[i] = np.nan
+        self._node_collection.set_offsets(hidden[self._visible_nodes])
+        if not self._aggregated:
+            self.__set_edge_paths(hidden)
+        else:
+            self.__draw_density(np.setdiff1d(self._visible_edges, self._drag_edges, assume_unique=True))
+            self._density_key = None  # Image partielle: refaite au prochain update
+        if self._highlight_collection is not None:
+            self.__set_highlights(hidden_edges=self._drag_edges, hidden_node=i)
+            self.__paint_points(hidden_node=i)
+
+        # Étiquettes affichées seulement (niveau de détail): (indice d'arête, texte)
+        edge_labels = [(k, self._edge_labels[edge]) for k, edge in
+                       enumerate(map(tuple, self._edge_ids[self._drag_edges].tolist())) if edge in self._edge_labels]
+        node_label = self._node_labels.get(node)
+        texts = [text for _, text in edge_labels] + ([node_label] if node_label is not None else [])
+        for text in texts:
+            text.set_animated(True)
+
+        self._drag_edge_artist, self._drag_node_artist = edge_artist, node_artist
+        self._drag_edge_labels, self._drag_node_label = edge_labels, node_label
+        self._drag_artists = [edge_artist] + [text for _, text in edge_labels] + [node_artist] + \
+                             ([node_label] if node_label is not None else [])
+        return True
+
+    # Déplace uniquement les artistes animés (noeud, étiquette, arêtes incidentes)
+    def drag_to(self, position):
+        if self._drag_index is None:
+            return
+
+        offsets = self._offsets.copy()
+        offsets[self._drag_index] = position
+
+        self._drag_node_artist.set_offsets([position])
+        if self._drag_node_label is not None:
+            self._drag_node_label.set_position(position)
+
+        if len(self._drag_edges):
+            segments = offsets[self._edge_idx[self._drag_edges]]
+            self._drag_edge_artist.set_segments(segments)
+            midpoints = segments.mean(axis=1)
+            deltas = segments[:, 1] - segments[:, 0]
+            angles = np.degrees(np.arctan2(deltas[:, 1], deltas[:, 0]))
+            for k, text in self._drag_edge_labels:
+                text.set_position(midpoints[k])
+                text.data_angle = angles[k]
+
+    # Remet les artistes dans la couche statique; la position finale vient du modèle
+    def end_drag(self):
+        if self._drag_index is None:
+            return
+
+        self._drag_edge_artist.remove()
+        self._drag_node_artist.remove()
+        for text in self._drag_artists:
+            if isinstance(text, Text):
+                text.set_animated(False)
+
+        self._node_collection.set_offsets(self._offsets[self._visible_nodes])
+        if not self._aggregated:
+            self.__set_edge_paths(self._offsets)
+        if self._highlight_collection is not None:
+            self.__set_highlights()
+            self.__paint_points()
+
+        self._drag_index = None
+        self._drag_edges = np.empty(0, dtype=np.intp)
+        self._drag_artists = []
+        self._static_key = None
+        self._static_version += 1
@@ -1,11 +1,15 @@
-import networkx as nx
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 import numpy as np
-from matplotlib import pyplot as plt
+from matplotlib import colormaps
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
-from networkx import NetworkXError
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
 from typing import TYPE_CHECKING
 
+from instrumentation import instruments
+from view.GraphScene import GraphScene
+from view.ProfilerOverlay import ProfilerOverlay
+
 if TYPE_CHECKING:
     from controller.main_controller import MainController
 
@@ -15,11 +19,37 @@ class GraphCanvas(FigureCanvasQTAgg):
     _dragging_node = None
     _drag_start_pos = None
     _drag_threshold = 5
+    _drag_background = None
+    _static_background = None  # (version de la couche statique, fond capturé sans la mise en évidence)
     _selected_edge = None
+    _pan_start = None  # (pixel du clic, limites x, limites y) au début d'un déplacement de la vue
+    _component_colors = False  # Noeuds colorés par composante connexe
+    _isolate_component = False  # Hors de la composante du sommet sélectionné (ou du départ): estompé
+
+    FRAME_INTERVAL = 16  # ms: au plus un rendu par image (60 Hz)
+    DEFAULT_VIEW = (-1.2, 1.2)  # Limites x et y de la vue initiale
+    ZOOM_STEP = 1.25  # Facteur de zoom par cran de molette
+    ZOOM_RANGE = (1e-4, 20.0)  # Largeur de la vue permise, relative à la vue initiale
+    PICK_RADIUS = 0.05  # Rayon de sélection au clic dans la vue initiale (suit le zoom)
+
+    # Couleurs RGBA des états d'affichage
+    NODE_COLOR = to_rgba('skyblue')  # Bleu par défaut
+    NODE_STATE_COLORS = {
+        'start': to_rgba('#4CAF50'),  # Vert pour départ
+        'end': to_rgba('#F44336'),  # Rouge pour arrivée
+        'visited': to_rgba('#9C27B0'),  # Violet pour visités (parcours)
+        'selected': to_rgba('#FF9800'),  # Orange pour sélectionné
+    }
+    EDGE_COLOR = to_rgba('black')
+    PATH_COLOR = to_rgba('#4CAF50')  # Vert pour le chemin
+    SELECTED_EDGE_COLOR = to_rgba('#F44336')  # Rouge pour sélection
+    COMPONENT_COLORS = np.array([to_rgba(color) for color in colormaps['tab20'].colors])  # Cycle par composante
+    FADED_ALPHA = 0.12  # Opacité hors de la composante isolée
 
     def __init__(self):
-        # Création de la figure matplotlib
-        self.fig, self.ax = plt.subplots(figsize=(10, 10))
+        # Création de la figure matplotlib (sans pyplot: pas de gestionnaire de figures global)
+        self.fig = Figure(figsize=(10, 10))
+        self.ax = self.fig.add_subplot()
         super().__init__(self.fig)
 
         if TYPE_CHECKING:
@@ -32,6 +62,23 @@ class GraphCanvas(FigureCanvasQTAgg):
         # Ajuster les marges de la figure pour maximiser l'espace
         self.fig.tight_layout(pad=0.1)
 
+        # Zoom plus large pour remplir l'espace
+        self.ax.set_xlim(*self.DEFAULT_VIEW)
+        self.ax.set_ylim(*self.DEFAULT_VIEW)
+        self.ax.axis('off')  # Masquer les axes pour plus d'espace
+
+        # Artistes persistants, mis à jour sur place à chaque changement du modèle
+        self._scene = GraphScene(self.ax)
+
+        # Rendus demandés regroupés: un seul dessin à l'image suivante
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(self.FRAME_INTERVAL)
+        self._redraw_timer.timeout.connect(self.__render)
+
+        # Mesures de l'instrumentation en surimpression (menu Affichage)
+        self._overlay = ProfilerOverlay(self)
+
     def set_controller(self, controller):
         self.__controller = controller
 
@@ -40,163 +87,191 @@ class GraphCanvas(FigureCanvasQTAgg):
         x_fig, y_fig = self.mouseEventCoords(event)
         return self.ax.transData.inverted().transform((x_fig, y_fig))
 
-    # Cherche un noeud proche du clic
-    def _find_node_at_position(self, pos, radius=0.05):
+    # Rapport entre la largeur de la vue et celle de la vue initiale: les distances de
+    # sélection sont en unités de données, elles sont mises à l'échelle du zoom
+    def _view_scale(self):
+        x0, x1 = self.ax.get_xlim()
+        return abs(x1 - x0) / (self.DEFAULT_VIEW[1] - self.DEFAULT_VIEW[0])
+
+    # Cherche un noeud proche du clic (index spatial du modèle)
+    def _find_node_at_position(self, pos, radius=None):
         graphe = self.__controller.graphe()
         if graphe is None or len(graphe.nodes()) == 0:
             return None
 
-        min_distance = float('inf')
-        closest_node = None
-
-        for node in graphe.nodes():
-            if node in self._pos:
-                node_pos = np.array(self._pos[node])
-                click_pos = np.array(pos)
-                distance = np.linalg.norm(node_pos - click_pos)
-
-                # Si clic assez proche d'un noeud, la sélection se fait
-                if distance < min_distance and distance < radius:
-                    min_distance = distance
-                    closest_node = node
-
-        return closest_node
-
-    # Calcul de la distance d'un point à un segment (géométrie vectorielle)
-    def _distance_point_to_segment(self, point, seg_start, seg_end):
-        # Calcule la distance d'un point à un segment.
-        # Utilise la projection orthogonale du point sur la droite du segment.
-
-        point = np.array(point)
-        seg_start = np.array(seg_start)
-        seg_end = np.array(seg_end)
+        if radius is None:
+            radius = self.PICK_RADIUS * self._view_scale()
+        with instruments.timer('hit.node'):
+            return self.__controller._model.spatial_index.nearest(pos, radius)
 
-        # Vecteur du segment
-        seg_vec = seg_end - seg_start
-        seg_length_sq = np.dot(seg_vec, seg_vec)
-
-        # Si le segment est réduit à un point
-        if seg_length_sq == 0:
-            return np.linalg.norm(point - seg_start)
-
-        # Paramètre t de la projection du point sur la droite du segment
-        # t = 0 correspond à seg_start, t = 1 correspond à seg_end
-        t = max(0, min(1, np.dot(point - seg_start, seg_vec) / seg_length_sq))
-
-        # Point projeté sur le segment
-        projection = seg_start + t * seg_vec
-
-        # Distance du point à sa projection
-        return np.linalg.norm(point - projection)
-
-    # Cherche une arête proche du clic
-    def _find_edge_at_position(self, pos, radius=0.05):
+    # Cherche une arête proche du clic (index des segments du modèle)
+    def _find_edge_at_position(self, pos, radius=None):
         graphe = self.__controller.graphe()
         if graphe is None or len(graphe.edges()) == 0:
             return None
 
-        min_distance = float('inf')
-        closest_edge = None
-
-        for edge in graphe.edges():
-            node1, node2 = edge
-            if node1 in self._pos and node2 in self._pos:
-                seg_start = self._pos[node1]
-                seg_end = self._pos[node2]
-
-                distance = self._distance_point_to_segment(pos, seg_start, seg_end)
-
-                # Si clic assez proche d'une arête
-                if distance < min_distance and distance < radius:
-                    min_distance = distance
-                    closest_edge = edge
-
-        return closest_edge
-
-    # Redessine complètement le graphe
+        if radius is None:
+            radius = self.PICK_RADIUS * self._view_scale()
+        with instruments.timer('hit.edge'):
+            return self.__controller._model.edge_index.nearest(pos, radius)
+
+    def show_components(self, enabled):
+        self._component_colors = bool(enabled)
+        self.request_redraw()
+
+    def isolate_component(self, enabled):
+        self._isolate_component = bool(enabled)
+        self.request_redraw()
+
+    def show_instrumentation(self, visible):
+        self._overlay.setVisible(visible)
+        self._overlay.raise_()
+
+    # Vue initiale (touche Origine)
+    def reset_view(self):
+        self.ax.set_xlim(*self.DEFAULT_VIEW)
+        self.ax.set_ylim(*self.DEFAULT_VIEW)
+        self.request_redraw()
+
+    # Zoom de factor autour du point center (coordonnées de données), qui reste sous la souris;
+    # borné à ZOOM_RANGE (le rayon de sélection suit le zoom)
+    def zoom(self, factor, center):
+        scale = self._view_scale()
+        factor = min(max(factor, self.ZOOM_RANGE[0] / scale), self.ZOOM_RANGE[1] / scale)
+        if factor == 1:
+            return
+        cx, cy = center
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        self.ax.set_xlim(cx + (x0 - cx) * factor, cx + (x1 - cx) * factor)
+        self.ax.set_ylim(cy + (y0 - cy) * factor, cy + (y1 - cy) * factor)
+        self.request_redraw()
+
+    # Marque le canvas à redessiner; les demandes faites avant la prochaine image n'en
+    # donnent qu'une
+    def request_redraw(self):
+        if not self._redraw_timer.isActive():
+            self._redraw_timer.start()
+        else:
+            instruments.count('canvas.redraw_coalesced')
+
+    # Met à jour la scène puis redessine le canvas immédiatement: si seule la mise en évidence
+    # a changé, fond statique restauré et seuls les éléments mis en évidence sont redessinés
     def draw_graphe(self):
-        self.ax.clear()
-        self.__draw_graphe()
-        self.draw()
+        self._redraw_timer.stop()
+        with instruments.frame('draw.frame'):
+            self.__draw_graphe()
+            if self._static_background is not None and self._static_background[0] == self._scene.static_version:
+                with instruments.timer('draw.overlay'):
+                    self.restore_region(self._static_background[1])
+                    self.__draw_overlay()
+                    self.blit(self.fig.bbox)
+                return
+            with instruments.timer('draw.canvas'):
+                self._scene.set_overlay_visible(False)
+                self.draw()
+                self._scene.set_overlay_visible(True)
+                self._static_background = (self._scene.static_version, self.copy_from_bbox(self.fig.bbox))
+                self.__draw_overlay()
+
+    # Éléments mis en évidence et leurs étiquettes, par-dessus la couche statique
+    def __draw_overlay(self):
+        for artist in self._scene.overlay_artists:
+            self.ax.draw_artist(artist)
+
+    def __render(self):
+        # Pas de rendu complet pendant un déplacement (mode blit): move_node en redemande un
+        # au relâchement
+        if self._drag_background is None:
+            self.draw_graphe()
 
     # Dessin "privé" du graphe
     def __draw_graphe(self):
         if self.__controller.graphe() is None:
+            self._static_background = None
             return
 
         try:
             graphe = self.__controller.graphe()
             model = self.__controller._model
 
-            # Préparer les couleurs des nœuds
-            node_colors = []
-            for node in graphe.nodes():
-                if node == model.start_node:
-                    node_colors.append('#4CAF50')  # Vert pour départ
-                elif node == model.end_node:
-                    node_colors.append('#F44336')  # Rouge pour arrivée
-                elif node in model.visited_nodes:
-                    node_colors.append('#9C27B0')  # Violet pour visités (parcours)
-                elif node == model.selected_node:
-                    node_colors.append('#FF9800')  # Orange pour sélectionné
-                else:
-                    node_colors.append('skyblue')  # Bleu par défaut
-
-            # Dessin des noeuds et labels
-            nx.draw_networkx_nodes(graphe, self._pos, node_color=node_colors,
-                                   node_size=800, ax=self.ax)
-            nx.draw_networkx_labels(graphe, self._pos, font_size=10, ax=self.ax)
-
-            # Préparer les couleurs et largeurs des arêtes
-            edge_colors = []
-            edge_widths = []
-
-            # Créer une liste d'arêtes du plus court chemin pour comparaison
-            path_edges = []
-            if len(model.shortest_path) > 1:
-                for i in range(len(model.shortest_path) - 1):
-                    path_edges.append((model.shortest_path[i], model.shortest_path[i + 1]))
-                    path_edges.append((model.shortest_path[i + 1], model.shortest_path[i]))  # Les deux sens
-
-            for edge in graphe.edges():
-                # Arête fait partie du plus court chemin
-                if edge in path_edges:
-                    edge_colors.append('#4CAF50')  # Vert pour le chemin
-                    edge_widths.append(4)
-                # Arête sélectionnée
-                elif self._selected_edge is not None and (
-                        edge == self._selected_edge or edge == (self._selected_edge[1], self._selected_edge[0])):
-                    edge_colors.append('#F44336')  # Rouge pour sélection
-                    edge_widths.append(3)
+            # Mise à jour sur place des noeuds, arêtes et étiquettes (poids)
+            # Le modèle sert d'index pour le découpage à la vue (query_rect)
+            with instruments.timer('draw.scene'):
+                self._scene.update(graphe, self._pos, model.version, index=model)
+            nodes, edges = self._scene.node_ids, self._scene.edge_ids
+
+            # Couleurs des noeuds: masques du modèle appliqués par priorité croissante, sur la
+            # couleur de base ou celle de la composante
+            with instruments.timer('draw.nodes'):
+                masks = model.node_masks(nodes)
+                labels = None
+                if self._component_colors or self._isolate_component:
+                    labels = model.component_labels(nodes)
+                if self._component_colors:
+                    base_colors = self.COMPONENT_COLORS[labels % len(self.COMPONENT_COLORS)]
                 else:
-                    edge_colors.append('black')
-                    edge_widths.append(2)
-
-            nx.draw_networkx_edges(graphe, self._pos, ax=self.ax,
-                                   edge_color=edge_colors, width=edge_widths)
-
-            # Afficher les poids des arêtes
-            labels = nx.get_edge_attributes(graphe, "weight")
-            nx.draw_networkx_edge_labels(graphe, self._pos, edge_labels=labels, ax=self.ax)
-
-            # Zoom plus large pour remplir l'espace
-            self.ax.set_xlim(-1.2, 1.2)
-            self.ax.set_ylim(-1.2, 1.2)
-            self.ax.axis('off')  # Masquer les axes pour plus d'espace
-
-        except (NetworkXError, Exception) as e:
+                    base_colors = np.tile(self.NODE_COLOR, (len(nodes), 1))
+                node_colors = base_colors.copy()
+                for state in ('selected', 'visited', 'end', 'start'):
+                    node_colors[masks[state]] = self.NODE_STATE_COLORS[state]
+
+            # Couleurs et largeurs des arêtes: la sélection, puis le chemin par-dessus
+            with instruments.timer('draw.edges'):
+                base_edge_colors = np.tile(self.EDGE_COLOR, (len(edges), 1))
+                base_widths = np.full(len(edges), 2.0)
+                edge_colors, edge_widths = base_edge_colors.copy(), base_widths.copy()
+                selected = np.zeros(len(edges), dtype=bool)
+                if self._selected_edge is not None and len(edges):
+                    u, v = self._selected_edge
+                    selected = ((edges[:, 0] == u) & (edges[:, 1] == v)) | ((edges[:, 0] == v) & (edges[:, 1] == u))
+                    edge_colors[selected] = self.SELECTED_EDGE_COLOR
+                    edge_widths[selected] = 3
+                on_path = model.path_edge_mask(edges)
+                edge_colors[on_path] = self.PATH_COLOR
+                edge_widths[on_path] = 4
+
+            # Composante isolée: le reste est estompé (les deux extrémités d'une arête sont
+            # dans la même composante); un élément estompé ne peut pas être repeint par-dessus
+            # la couche statique, les styles y sont alors tous posés
+            base = (base_colors, base_edge_colors, base_widths)
+            focus = model.selected_node if model.selected_node is not None else model.start_node
+            if self._isolate_component and focus is not None:
+                component = model.component(focus)
+                node_colors[labels != component, 3] = self.FADED_ALPHA
+                if len(edges):
+                    edge_colors[model.component_labels(edges[:, 0]) != component, 3] = self.FADED_ALPHA
+                base = None
+
+            with instruments.timer('draw.styles'):
+                self._scene.set_styles(node_colors, edge_colors, edge_widths, emphasized=selected | on_path,
+                                      emphasized_nodes=masks['start'] | masks['end'] | masks['selected'],
+                                      base=base)
+
+        except Exception as e:
+            self._static_background = None
             print(f"Erreur draw: {e}")
 
     # Le modèle notifie que la position des noeuds a changé
     def on_graph_changed(self, position):
         self._pos = position
-        self.draw_graphe()
+        self.request_redraw()
+
+    # Molette: zoom centré sur le pointeur
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if steps == 0 or self._drag_background is not None:
+            return
+        self.zoom(self.ZOOM_STEP ** -steps, self._convert_pos(event))
 
     # Gestion clic souris
     def mousePressEvent(self, event):
         pos = self._convert_pos(event)
 
-        if event.button() == Qt.MouseButton.LeftButton:
+        if event.button() == Qt.MouseButton.MiddleButton:
+            # Début d'un déplacement de la vue
+            self._pan_start = (self.mouseEventCoords(event), self.ax.get_xlim(), self.ax.get_ylim())
+
+        elif event.button() == Qt.MouseButton.LeftButton:
             # Essaye d'abord de cliquer un noeud
             clicked_node = self._find_node_at_position(pos)
 
@@ -210,14 +285,14 @@ class GraphCanvas(FigureCanvasQTAgg):
                     self._dragging_node = clicked_node
                     self._drag_start_pos = pos
                     self.__controller.update_edge_ui(None)
-                    self.draw_graphe()
+                    self.request_redraw()
             else:
                 clicked_edge = self._find_edge_at_position(pos)
                 if clicked_edge is not None:
                     self._selected_edge = clicked_edge
                     self.__controller._model.selected_node = None
                     self._dragging_node = None
-                    self.draw_graphe()
+                    self.request_redraw()
                     self.__controller.update_edge_ui(clicked_edge)
                 else:
                     self._selected_edge = None
@@ -236,6 +311,9 @@ class GraphCanvas(FigureCanvasQTAgg):
 
     # Gestion déplacement souris (drag de noeud)
     def mouseMoveEvent(self, event):
+        if self._pan_start is not None:
+            self.__pan(event)
+            return
         if self._dragging_node is None:
             return
 
@@ -246,16 +324,63 @@ class GraphCanvas(FigureCanvasQTAgg):
                 movement = np.linalg.norm(np.array(pos) - np.array(self._drag_start_pos))
 
                 # Threshold pour éviter les micro-déplacements
-                if movement > self._drag_threshold / 100:
-                    self.__controller._model.move_node(self._dragging_node, pos)
+                if self._drag_background is None and movement > self._drag_threshold / 100 * self._view_scale():
+                    self.__begin_drag()
+
+            if self._drag_background is not None:
+                self.__drag_frame(pos)
+
+    # Déplacement de la vue: le point saisi suit la souris (calcul depuis les limites de départ)
+    def __pan(self, event):
+        (px, py), (x0, x1), (y0, y1) = self._pan_start
+        x, y = self.mouseEventCoords(event)
+        dx = (x - px) * (x1 - x0) / self.ax.bbox.width
+        dy = (y - py) * (y1 - y0) / self.ax.bbox.height
+        self.ax.set_xlim(x0 - dx, x1 - dx)
+        self.ax.set_ylim(y0 - dy, y1 - dy)
+        self.request_redraw()
+
+    # Capture le fond statique une seule fois au début du déplacement
+    def __begin_drag(self):
+        # Rendu en attente (sélection du clic): la scène doit être à jour avant la capture
+        if self._redraw_timer.isActive():
+            self._redraw_timer.stop()
+            self.__draw_graphe()
+        if not self._scene.begin_drag(self._dragging_node):
+            return
+        self.draw()
+        self._drag_background = self.copy_from_bbox(self.fig.bbox)
+
+    # Une image du déplacement: fond restauré puis seuls les artistes animés sont redessinés
+    def __drag_frame(self, pos):
+        with instruments.frame('draw.drag_frame'):
+            self._scene.drag_to(pos)
+            self.restore_region(self._drag_background)
+            for artist in self._scene.drag_artists:
+                self.ax.draw_artist(artist)
+            self.blit(self.fig.bbox)
 
     # Relâchement bouton souris
     def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.MiddleButton:
+            self._pan_start = None
+            return
         if self._dragging_node is None:
             return
 
         pos = self._convert_pos(event)
 
+        # Clic gauche relâché = fin du déplacement, une seule mise à jour du modèle
+        if event.button() == Qt.MouseButton.LeftButton:
+            node = self._dragging_node
+            self._dragging_node = None
+            self._drag_start_pos = None
+
+            if self._drag_background is not None:
+                self._drag_background = None
+                self._scene.end_drag()
+                self.__controller._model.move_node(node, pos)
+
         # Clic droit relâché = tentative de création d'arête
         if event.button() == Qt.MouseButton.RightButton:
             target_node = self._find_node_at_position(pos)
@@ -280,6 +405,9 @@ class GraphCanvas(FigureCanvasQTAgg):
             elif model.selected_node is not None:
                 model.delete_node(model.selected_node)
 
+        elif event.key() == Qt.Key.Key_Home:
+            self.reset_view()
+
         elif event.key() == Qt.Key.Key_P:
             # Lancer le parcours avec la touche P
             self.__controller.start_traversal()
\ No newline at end of file
@@ -1,8 +1,10 @@
-from PyQt6.QtWidgets import QPushButton, QMainWindow, QVBoxLayout, QSpinBox, QProgressBar, QLabel, QGroupBox, QHBoxLayout, QWidget
+from PyQt6.QtWidgets import QPushButton, QMainWindow, QVBoxLayout, QSpinBox, QProgressBar, QLabel, QGroupBox, QHBoxLayout, QWidget, QComboBox, QDoubleSpinBox, QSlider, QFileDialog
+from PyQt6.QtGui import QAction
 from PyQt6.QtCore import Qt
-from PyQt6.uic import loadUi
 from typing import TYPE_CHECKING
-import matplotlib
+import os
+
+from view.ui_cache import load_form
 
 if TYPE_CHECKING:
     from controller.main_controller import MainController
@@ -16,6 +18,11 @@ class MainWindow(QMainWindow):
     createButton: QPushButton
     deleteButton: QPushButton
     nbrNodes: QSpinBox
+    generatorComboBox: QComboBox
+    pathEngineComboBox: QComboBox
+    densitySpinBox: QDoubleSpinBox
+    generateProgressBar: QProgressBar
+    cancelImportButton: QPushButton
 
     # Gestion des arêtes
     edgeGroupBox: QGroupBox
@@ -33,20 +40,49 @@ class MainWindow(QMainWindow):
     # Parcours
     traversalGroupBox: QGroupBox
     traversalInfoLabel: QLabel
+    traversalComboBox: QComboBox
+    traversalPlayButton: QPushButton
+    traversalEndButton: QPushButton
+    traversalSlider: QSlider
+    traversalSpeedSpinBox: QSpinBox
     traversalStatusLabel: QLabel
     traversalProgressBar: QProgressBar
 
     # Légende
     legendGroupBox: QGroupBox
 
+    # Menu Fichier
+    openAction: QAction
+    saveAction: QAction
+    importAction: QAction
+
+    # Menu Affichage
+    instrumentationAction: QAction
+    traceAction: QAction
+    componentColorsAction: QAction
+    isolateComponentAction: QAction
+
+    GRAPH_FILE_FILTER = "Graphes (*.graphe)"
+    EDGE_LIST_FILTER = "Listes d'arêtes (*.txt *.csv *.tsv *.edges *.el);;Tous les fichiers (*)"
+    TRACE_FILTER = "Traces (*.json)"
+
+    # Chemins relatifs au module, pas au répertoire courant
+    VIEW_DIR = os.path.dirname(os.path.abspath(__file__))
+    UI_FILE = os.path.join(VIEW_DIR, "ui", "main_window.ui")
+    THEME_FILES = {True: os.path.join(VIEW_DIR, "styles", "dark_theme.qss"),
+                   False: os.path.join(VIEW_DIR, "styles", "light_theme.qss")}
+
     def __init__(self, app):
         super().__init__()
-        loadUi("view/ui/main_window.ui", self)
+        # Formulaire précompilé (view/ui_cache.py): ni analyse du .ui ni PyQt6.uic au lancement
+        load_form(self, self.UI_FILE)
         self.resize(1400, 900)
         self.setMinimumSize(1200, 800)
 
         self.__app = app
         self.__is_dark_mode = True
+        self.__canvas = None
+        self.__plot_colors = ('#2b2b2b', '#e0e0e0')  # (fond, texte) du thème courant
 
         if TYPE_CHECKING:
             self.__controller: MainController | None = None
@@ -80,13 +116,12 @@ class MainWindow(QMainWindow):
 
     def __apply_theme(self):
         # Applique le thème sélectioné
+        theme_file = self.THEME_FILES[self.__is_dark_mode]
         if self.__is_dark_mode:
-            theme_file = "view/styles/dark_theme.qss"
             self.__theme_toggle_button.setText("🌙")
             bg_color = '#2b2b2b'
             text_color = '#e0e0e0'
         else:
-            theme_file = "view/styles/light_theme.qss"
             self.__theme_toggle_button.setText("☀️")
             bg_color = '#f5f5f5'
             text_color = '#333333'
@@ -98,10 +133,15 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"Erreur lors du chargement du thème: {e}")
 
-        # Mettre à jour les couleurs matplotlib
-        self.__update_matplotlib_colors(bg_color, text_color)
+        # Mettre à jour les couleurs matplotlib (au plus tôt quand le canvas existe:
+        # matplotlib n'est importé qu'après l'affichage de la fenêtre)
+        self.__plot_colors = (bg_color, text_color)
+        if self.__canvas is not None:
+            self.__update_matplotlib_colors(bg_color, text_color)
 
     def __update_matplotlib_colors(self, bg_color, text_color):
+        import matplotlib
+
         # Met à jour les couleurs par défaut de matplotlib
         matplotlib.rcParams['figure.facecolor'] = bg_color
         matplotlib.rcParams['axes.facecolor'] = bg_color
@@ -115,24 +155,35 @@ class MainWindow(QMainWindow):
         matplotlib.rcParams['legend.edgecolor'] = text_color
         matplotlib.rcParams['savefig.facecolor'] = bg_color
 
-        # Redessiner le canvas si le controller est disponible
-        if hasattr(self, '_MainWindow__controller') and self.__controller:
-            canvas = self.__controller._MainController__canvas
-            if canvas and hasattr(canvas, 'draw_graphe'):
-                # Forcer la mise à jour des couleurs de la figure
-                canvas.fig.patch.set_facecolor(bg_color)
-                canvas.ax.set_facecolor(bg_color)
-                canvas.draw_graphe()
-
-        # Redessiner le canvas si le controller est disponible
-        if hasattr(self, '_MainWindow__controller') and self.__controller:
-            canvas = self.__controller._MainController__canvas
-            if canvas and hasattr(canvas, 'draw_graphe'):
-                canvas.draw_graphe()
+        # Forcer la mise à jour des couleurs de la figure
+        self.__canvas.fig.patch.set_facecolor(bg_color)
+        self.__canvas.ax.set_facecolor(bg_color)
+        self.__canvas.request_redraw()
+
+    # Chemins choisis dans les boîtes de dialogue (None si annulé)
+    def ask_open_path(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Ouvrir un graphe", "", self.GRAPH_FILE_FILTER)
+        return path or None
+
+    def ask_import_path(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Importer une liste d'arêtes", "", self.EDGE_LIST_FILTER)
+        return path or None
+
+    def ask_save_path(self, extension):
+        path, _ = QFileDialog.getSaveFileName(self, "Enregistrer le graphe", "", self.GRAPH_FILE_FILTER)
+        if path and not path.endswith(extension):
+            path += extension
+        return path or None
+
+    def ask_trace_path(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Enregistrer la trace", "trace.json", self.TRACE_FILTER)
+        return path or None
 
     def add_canvas(self, canvas):
         #Insère le canvas dans le layout
         self.grapheLayout.addWidget(canvas)
+        self.__canvas = canvas
+        self.__update_matplotlib_colors(*self.__plot_colors)
 
     def set_controller(self, controller):
         self.__controller = controller
\ No newline at end of file
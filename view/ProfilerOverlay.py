@@ -0,0 +1,60 @@
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import QLabel
+
+from instrumentation import instruments
+
+
+# Surimpression des mesures de l'instrumentation dans le coin du canvas: images par seconde,
+# durée de la dernière image, nombre de rendus et dernières durées des phases. Widget Qt
+# posé sur le canvas (pas un artiste matplotlib): il ne coûte rien au rendu mesuré et reste
+# visible pendant un déplacement en mode blit.
+class ProfilerOverlay(QLabel):
+    REFRESH_INTERVAL = 250  # ms
+    PHASES = (('scène', 'draw.scene'), ('noeuds', 'draw.nodes'), ('arêtes', 'draw.edges'),
+              ('styles', 'draw.styles'), ('dessin', 'draw.canvas'), ('surcouche', 'draw.overlay'))
+
+    def __init__(self, canvas):
+        super().__init__(canvas)
+        self.setObjectName("profilerOverlay")
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: #e0e0e0; "
+                           "font-family: monospace; font-size: 11px; padding: 4px;")
+        self.move(8, 8)
+
+        self.__timer = QTimer(self)
+        self.__timer.setInterval(self.REFRESH_INTERVAL)
+        self.__timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def setVisible(self, visible):
+        super().setVisible(visible)
+        if visible:
+            self.refresh()
+            self.__timer.start()
+        else:
+            self.__timer.stop()
+
+    def refresh(self):
+        # Copie faite sous verrou: les workers enregistrent leurs mesures en parallèle
+        summary = instruments.summary()
+        timers, counters = summary['timers'], summary['counters']
+
+        def last(name):
+            return f"{timers[name]['last_ms']:.1f}" if name in timers else "-"
+
+        def mean(name):
+            return f"{timers[name]['mean_ms']:.2f} ms" if name in timers else "-"
+
+        lines = [
+            f"{summary['fps']:4.0f} img/s  image {summary['last_frame_ms']:.1f} ms  rendus {summary['frames']}",
+            "  ".join(f"{label} {last(name)}" for label, name in self.PHASES) + " ms",
+            f"grapheChanged {counters.get('model.grapheChanged', 0)}  "
+            f"regroupés {counters.get('canvas.redraw_coalesced', 0)}  "
+            f"clic noeud {mean('hit.node')}  clic arête {mean('hit.edge')}",
+        ]
+        tasks = [f"{name[5:]} {stats['last_ms']:.0f} ms" for name, stats in timers.items()
+                 if name.startswith('task.') and name != 'task.layout_step']
+        if tasks:
+            lines.append("tâches: " + ", ".join(tasks))
+        self.setText("\n".join(lines))
+        self.adjustSize()
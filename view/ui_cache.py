@@ -0,0 +1,52 @@
+import hashlib
+import importlib.util
+import io
+import os
+
+# Formulaires Qt Designer (.ui) compilés une fois en module Python (comme pyuic6) et gardés
+# dans le __pycache__ voisin du .ui, sous un nom qui contient l'empreinte du fichier: un .ui
+# modifié est recompilé, et les lancements suivants importent le module (bytecode compris)
+# sans analyser le XML ni importer PyQt6.uic. Cache impossible à écrire: loadUi direct.
+
+
+# Construit le formulaire path dans widget; comme loadUi, les objets nommés du formulaire
+# deviennent des attributs de widget
+def load_form(widget, path):
+    try:
+        form = _compiled_form(path)
+    except OSError:
+        from PyQt6.uic import loadUi
+        loadUi(path, widget)
+        return
+    ui = form()
+    ui.setupUi(widget)
+    for name, value in vars(ui).items():
+        setattr(widget, name, value)
+
+
+# Classe Ui_* du module compilé pour path (compilé au premier appel pour ce contenu)
+def _compiled_form(path):
+    with open(path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:12]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), '__pycache__')
+    module_path = os.path.join(directory, f"{stem}_ui_{digest}.py")
+
+    if not os.path.exists(module_path):
+        from PyQt6 import uic
+        code = io.StringIO()
+        uic.compileUi(path, code)
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{module_path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(code.getvalue())
+        os.replace(temporary, module_path)
+        # Versions précédentes du même formulaire
+        for name in os.listdir(directory):
+            if name.startswith(f"{stem}_ui_") and name.endswith('.py') and name != os.path.basename(module_path):
+                os.remove(os.path.join(directory, name))
+
+    spec = importlib.util.spec_from_file_location(f"_ui_{stem}", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return next(value for name, value in vars(module).items() if name.startswith('Ui_'))
@@ -1,56 +1,215 @@
+import threading
 import time
-from PyQt6.QtCore import QThread, pyqtSignal
+import traceback
+from PyQt6.QtCore import QObject, QRunnable, QThread, QThreadPool, pyqtSignal
 
-# Aide de ClaudeAI pour l'implémentation
-class ShortestPathWorker(QThread):
-    pathFound = pyqtSignal(list)
-    finished = pyqtSignal()
+from instrumentation import instruments
+from model.edge_list import read_edge_list
+from model.layout import ForceLayout
 
-    def __init__(self, model):
-        super().__init__()
-        self.model = model
 
-    def run(self):
-        # Petit délai pour voir la progress bar
-        time.sleep(0.5)
+class TaskCancelled(Exception):
+    pass
 
-        # Calcul du plus court chemin
-        path = self.model.find_shortest_path()
 
-        # Émettre le résultat
-        self.pathFound.emit(path)
-        self.finished.emit()
+# Jeton d'annulation partagé entre le thread GUI (qui annule) et la tâche (qui vérifie)
+class CancellationToken:
+    def __init__(self):
+        self.__event = threading.Event()
+
+    def cancel(self):
+        self.__event.set()
 
+    @property
+    def cancelled(self):
+        return self.__event.is_set()
 
-class TraversalWorker(QThread):
-    nodeVisited = pyqtSignal(int)
+    # Point d'annulation: à appeler régulièrement dans les boucles longues
+    def check(self):
+        if self.__event.is_set():
+            raise TaskCancelled()
+
+    # Attente interrompue dès l'annulation
+    def sleep(self, seconds):
+        if self.__event.wait(seconds):
+            raise TaskCancelled()
+
+
+class TaskSignals(QObject):
+    resultReady = pyqtSignal(object)
+    partialResult = pyqtSignal(object)
     progressUpdated = pyqtSignal(int)
+    failed = pyqtSignal(object)  # Exception levée par la tâche
     finished = pyqtSignal()
 
-    def __init__(self, model):
+
+# Une tâche du pool: function(task) reçoit la tâche pour vérifier l'annulation
+# (task.check, task.sleep) et publier progression et résultats partiels. name (le canal)
+# nomme sa durée dans l'instrumentation: task.<name>.
+class Task(QRunnable):
+    def __init__(self, function, token, name='task'):
         super().__init__()
-        self.model = model
-        self._is_running = True
+        self.function = function
+        self.token = token
+        self.name = name
+        self.signals = TaskSignals()
+
+    def check(self):
+        self.token.check()
+
+    def sleep(self, seconds):
+        self.token.sleep(seconds)
+
+    def progress(self, value):
+        self.signals.progressUpdated.emit(value)
+
+    def partial(self, value):
+        self.signals.partialResult.emit(value)
 
     def run(self):
-        nodes = list(self.model.graphe.nodes())
-        total_nodes = len(nodes)
+        try:
+            self.token.check()
+            with instruments.timer(f'task.{self.name}'):
+                result = self.function(self)
+            self.token.check()
+            self.signals.resultReady.emit(result)
+        except TaskCancelled:
+            instruments.count(f'task.{self.name}.cancelled')
+        except Exception as e:
+            instruments.count(f'task.{self.name}.failed')
+            self.signals.failed.emit(e)
+        finally:
+            self.signals.finished.emit()
+
+
+# Exécuteur partagé (QThreadPool global) avec un canal par type de requête: soumettre une
+# tâche annule la précédente du même canal, et seuls les signaux de la tâche courante
+# atteignent les callbacks (la dernière demande gagne).
+class TaskExecutor:
+    def __init__(self, pool=None):
+        self.__pool = pool if pool is not None else QThreadPool.globalInstance()
+        self.__current = {}  # canal -> jeton de la tâche courante
+        self.__signals = {}  # jeton -> signaux, gardés en vie jusqu'à la fin de la tâche
+
+    def submit(self, channel, function, on_result=None, on_partial=None, on_progress=None, on_finished=None,
+               on_error=None):
+        self.cancel(channel)
+        token = CancellationToken()
+        task = Task(function, token, channel)
+        signals = task.signals
+
+        def current(callback):
+            def deliver(*args):
+                if self.__current.get(channel) is token:
+                    callback(*args)
+            return deliver
+
+        if on_result is not None:
+            signals.resultReady.connect(current(on_result))
+        if on_partial is not None:
+            signals.partialResult.connect(current(on_partial))
+        if on_progress is not None:
+            signals.progressUpdated.connect(current(on_progress))
+        # Sans gestionnaire, l'erreur est affichée comme une exception non rattrapée
+        signals.failed.connect(current(on_error) if on_error is not None else self.__report)
+        signals.finished.connect(lambda: self.__finished(channel, token, on_finished))
+
+        self.__current[channel] = token
+        self.__signals[token] = signals
+        self.__pool.start(task)
+        return token
 
-        for i, node in enumerate(nodes):
-            if not self._is_running:
-                break
+    def cancel(self, channel):
+        token = self.__current.pop(channel, None)
+        if token is not None:
+            token.cancel()
 
-            # Émettre le nœud visité
-            self.nodeVisited.emit(node)
+    def is_running(self, channel):
+        return channel in self.__current
 
-            # Mettre à jour la progress bar
-            progress = int((i + 1) / total_nodes * 100)
-            self.progressUpdated.emit(progress)
+    @staticmethod
+    def __report(error):
+        traceback.print_exception(type(error), error, error.__traceback__)
 
-            # Pause d'une seconde entre chaque noeud
-            time.sleep(1)
+    def __finished(self, channel, token, on_finished):
+        self.__signals.pop(token, None)
+        if self.__current.get(channel) is token:
+            del self.__current[channel]
+            if on_finished is not None:
+                on_finished()
 
+
+# Tâches du pool
+# Les tâches travaillent sur un instantané pris dans le thread GUI au moment de la soumission:
+# le modèle peut être modifié pendant le calcul, le résultat porte la version de l'instantané
+# et l'appelant l'ignore s'il est périmé.
+def shortest_path_task(model):
+    snapshot = model.snapshot()
+    source, target = model.start_node, model.end_node
+
+    def search(task):
+        if source is None or target is None:
+            return snapshot.version, []
+        return snapshot.version, model.search_path(snapshot, source, target, checkpoint=task.check, follow=True)
+    return search
+
+
+def traversal_task(model, kind, source):
+    snapshot = model.snapshot()
+    return lambda task: (snapshot.version,
+                         model.compute_traversal(snapshot, kind, source, checkpoint=task.check))
+
+
+# Import d'une liste d'arêtes: lecture par blocs, annulable entre deux blocs
+def import_task(path, seed):
+    return lambda task: read_edge_list(path, seed, progress=task.progress, checkpoint=task.check)
+
+
+# Génération hors du thread GUI: (graphe, graine), le modèle l'installe à la réception
+def generation_task(model, order, generator, proba, seed):
+    return lambda task: (model.build_random_graph(order, generator, proba, seed, progress=task.progress), seed)
+
+
+class LayoutWorker(QThread):
+    positionsReady = pyqtSignal()  # Une image est prête: la lire avec take_positions()
+    progressUpdated = pyqtSignal(int)
+    finished = pyqtSignal()
+
+    __frame_interval = 1 / 15  # Au plus ~15 images par seconde vers le canvas
+
+    def __init__(self, ids, xy, u, v, iterations=50):
+        super().__init__()
+        self.ids = ids
+        self.layout = ForceLayout(xy, u, v, iterations)
+        self._is_running = True
+        self.__lock = threading.Lock()
+        self.__frame = None
+
+    def run(self):
+        last_frame = 0.0
+        while self._is_running and not self.layout.done:
+            with instruments.timer('task.layout_step'):
+                self.layout.step()
+            self.progressUpdated.emit(int(100 * self.layout.iteration / self.layout.iterations))
+            now = time.perf_counter()
+            if self.layout.done or now - last_frame >= self.__frame_interval:
+                last_frame = now
+                self.__publish(self.layout.positions())
         self.finished.emit()
 
+    # Seule la dernière image est gardée: si le thread GUI est en retard, les images
+    # intermédiaires sont remplacées au lieu de s'accumuler dans la file d'événements
+    def __publish(self, xy):
+        with self.__lock:
+            pending = self.__frame is not None
+            self.__frame = xy
+        if not pending:
+            self.positionsReady.emit()
+
+    def take_positions(self):
+        with self.__lock:
+            frame, self.__frame = self.__frame, None
+        return self.ids, frame
+
     def stop(self):
-        self._is_running = False
\ No newline at end of file
+        self._is_running = False